@@ -1,8 +1,9 @@
 """Utility package for ChEMBL post-processing pipelines."""
 
-from . import chembl_client, config, io, throttling, transforms, validators
+from . import cache, chembl_client, config, io, throttling, transforms, validators
 
 __all__ = [
+    "cache",
     "chembl_client",
     "config",
     "io",
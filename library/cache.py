@@ -0,0 +1,213 @@
+"""SQLite-backed response cache for the ChEMBL client.
+
+Responses are keyed on the endpoint plus its normalized query parameters and
+stored zlib-compressed. Entries expire after an optional TTL and the least
+recently used ones are evicted once the cache exceeds its size budget. In
+offline mode a miss raises :class:`CacheMissError` instead of reaching the
+network, so acquisitions can be replayed without any connectivity.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key TEXT PRIMARY KEY,
+    endpoint TEXT NOT NULL,
+    params TEXT NOT NULL,
+    body BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed);
+"""
+
+
+class CacheMissError(LookupError):
+    """Raised in offline mode when a response is not cached."""
+
+
+def normalize_params(params: Mapping[str, object]) -> str:
+    """Return a canonical JSON encoding of query *params*.
+
+    Keys are sorted and values rendered as strings, so ``{"limit": 10}`` and
+    ``{"limit": "10"}`` share one cache entry.
+    """
+
+    normalized: Dict[str, Any] = {}
+    for key in sorted(params):
+        value = params[key]
+        if isinstance(value, (list, tuple)):
+            normalized[str(key)] = [str(item) for item in value]
+        elif value is not None:
+            normalized[str(key)] = str(value)
+    return json.dumps(normalized, sort_keys=True, separators=(",", ":"))
+
+
+def cache_key(endpoint: str, params: Mapping[str, object]) -> str:
+    """Return the SHA-256 key for *endpoint* queried with *params*."""
+
+    raw = f"{endpoint.strip('/')}?{normalize_params(params)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Persistent cache of decoded JSON pages stored in one SQLite file.
+
+    *ttl* is the lifetime of an entry in seconds (``None`` keeps entries
+    forever) and *max_bytes* bounds the total compressed size, evicting the
+    least recently read entries first. With *offline* set, :meth:`get` raises
+    :class:`CacheMissError` for anything not cached.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        ttl: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        offline: bool = False,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        # Running total of body sizes, so writes need not scan the table.
+        self._total = self._scan_total()
+
+    def get(
+        self, endpoint: str, params: Mapping[str, object]
+    ) -> Optional[Dict[str, Any]]:
+        """Return the cached payload or ``None`` (raising when offline)."""
+
+        key = cache_key(endpoint, params)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, created, size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self.ttl is not None and now - row[1] > self.ttl:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._total -= row[2]
+                row = None
+            if row is not None:
+                self._conn.execute(
+                    "UPDATE responses SET accessed = ? WHERE key = ?", (now, key)
+                )
+                self.stats["hits"] += 1
+            else:
+                self.stats["misses"] += 1
+        if row is None:
+            if self.offline:
+                raise CacheMissError(
+                    f"No cached response for {endpoint} {normalize_params(params)}"
+                )
+            return None
+        return json.loads(zlib.decompress(row[0]))
+
+    def put(
+        self,
+        endpoint: str,
+        params: Mapping[str, object],
+        payload: Mapping[str, Any],
+    ) -> None:
+        """Store *payload* and evict old entries beyond ``max_bytes``."""
+
+        body = zlib.compress(json.dumps(payload, separators=(",", ":")).encode())
+        key = cache_key(endpoint, params)
+        now = time.time()
+        with self._lock:
+            replaced = self._conn.execute(
+                "SELECT size FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, endpoint, params, body, size, created, accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    endpoint,
+                    normalize_params(params),
+                    body,
+                    len(body),
+                    now,
+                    now,
+                ),
+            )
+            self._total += len(body) - (replaced[0] if replaced else 0)
+            if self.max_bytes is not None and self._total > self.max_bytes:
+                self._evict(self.max_bytes)
+
+    def size(self) -> int:
+        """Return the total compressed size of the cached bodies in bytes."""
+
+        with self._lock:
+            return self._scan_total()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._total = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self) -> "ResponseCache":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _scan_total(self) -> int:
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()
+        return int(total)
+
+    def _evict(self, budget: int) -> None:
+        # Resynchronize first: other processes may share the file.
+        total = self._scan_total()
+        if total > budget:
+            doomed = []
+            rows = self._conn.execute(
+                "SELECT key, size FROM responses ORDER BY accessed ASC"
+            )
+            for key, size in rows:
+                if total <= budget:
+                    break
+                doomed.append((key,))
+                total -= size
+            rows.close()
+            self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+            self.stats["evictions"] += len(doomed)
+            logger.debug("Evicted cached responses", extra={"count": len(doomed)})
+        self._total = total
+
+
+__all__ = [
+    "CacheMissError",
+    "ResponseCache",
+    "cache_key",
+    "normalize_params",
+]
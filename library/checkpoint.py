@@ -0,0 +1,114 @@
+"""Resumable pagination checkpoints for long ChEMBL crawls.
+
+A checkpoint is a small JSON file describing how far a paginated crawl got:
+the endpoint, a hash of its query, the offset (or ``next`` cursor) of the
+first page not yet consumed and the number of records handed out so far.
+It is rewritten atomically after every consumed page, so a crawl killed at
+any point resumes at the first page whose records were not fully processed.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Mapping, Optional
+
+from .cache import cache_key
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Checkpoint:
+    """Progress of one paginated crawl."""
+
+    endpoint: str
+    params_hash: str
+    offset: int = 0
+    next: Optional[str] = None
+    records: int = 0
+    complete: bool = False
+    updated: float = field(default_factory=time.time)
+
+
+class CheckpointStore:
+    """Persist a :class:`Checkpoint` for *endpoint* queried with *params*.
+
+    An existing file for a different endpoint or query is ignored (with a
+    warning) and replaced on the first save, so changing filters never
+    resumes from an unrelated position.
+    """
+
+    def __init__(
+        self, path: str | Path, endpoint: str, params: Mapping[str, object]
+    ) -> None:
+        self.path = Path(path)
+        query = {key: value for key, value in params.items() if key != "offset"}
+        self.state = Checkpoint(
+            endpoint=endpoint, params_hash=cache_key(endpoint, query)
+        )
+        loaded = self._load()
+        if loaded is not None:
+            self.state = loaded
+            logger.info(
+                "Resuming paginated crawl",
+                extra={
+                    "endpoint": endpoint,
+                    "offset": loaded.offset,
+                    "records": loaded.records,
+                },
+            )
+
+    def advance(
+        self, offset: int, records: int, next_url: Optional[str] = None
+    ) -> None:
+        """Record that all pages before *offset* (or *next_url*) were consumed."""
+
+        self.state.offset = offset
+        self.state.next = next_url
+        self.state.records += records
+        self.save()
+
+    def finish(self) -> None:
+        self.state.complete = True
+        self.state.next = None
+        self.save()
+
+    def save(self) -> None:
+        self.state.updated = time.time()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_name(f"{self.path.name}.tmp")
+        with temporary.open("w", encoding="utf-8") as handle:
+            json.dump(asdict(self.state), handle, sort_keys=True)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, self.path)
+
+    def _load(self) -> Optional[Checkpoint]:
+        try:
+            raw = json.loads(self.path.read_text(encoding="utf-8"))
+            loaded = Checkpoint(**raw)
+        except FileNotFoundError:
+            return None
+        except (OSError, TypeError, ValueError):
+            logger.warning(
+                "Ignoring unreadable checkpoint", extra={"path": str(self.path)}
+            )
+            return None
+        if (loaded.endpoint, loaded.params_hash) != (
+            self.state.endpoint,
+            self.state.params_hash,
+        ):
+            logger.warning(
+                "Ignoring checkpoint for a different query",
+                extra={"path": str(self.path), "endpoint": loaded.endpoint},
+            )
+            return None
+        return loaded
+
+
+__all__ = ["Checkpoint", "CheckpointStore"]
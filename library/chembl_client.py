@@ -2,15 +2,615 @@
 
 from __future__ import annotations
 
+import json
+import logging
+import threading
 import time
-from typing import Dict, Iterator
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+from urllib.parse import parse_qsl, quote, urlencode, urljoin, urlsplit
+
+from .cache import ResponseCache
+from .checkpoint import CheckpointStore
+from .json_stream import iter_json_items
+from .throttling import (
+    HedgePolicy,
+    Limiter,
+    RateLimiter,
+    RetryPolicy,
+    retry_request,
+)
 
 try:  # pragma: no cover - imported lazily for optional dependency
     import requests  # type: ignore[import-not-found]
+    from requests.adapters import HTTPAdapter  # type: ignore[import-not-found]
 except ImportError:  # pragma: no cover - fallback for optional dependency
     requests = None  # type: ignore[assignment]
+    HTTPAdapter = None  # type: ignore[assignment,misc]
+
+try:  # pragma: no cover - optional dependency
+    import pyarrow as pa  # type: ignore[import-not-found]
+    import pyarrow.parquet as pq  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None  # type: ignore[assignment]
+    pq = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
 
 BASE_URL = "https://www.ebi.ac.uk/chembl/api/data"
+MAX_PAGE_SIZE = 1000
+MAX_URL_LENGTH = 4000
+STREAM_CHUNK_SIZE = 64 * 1024
+
+T = TypeVar("T")
+PageProgress = Callable[[int, int, Optional[str]], None]
+
+
+class PaginationDriftError(RuntimeError):
+    """Raised when ``page_meta.total_count`` changes during a crawl."""
+
+
+DEFAULT_HEADERS: Dict[str, str] = {
+    "Accept": "application/json",
+    "Accept-Encoding": "gzip, deflate",
+    "Connection": "keep-alive",
+}
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+class ChemblClient:
+    """ChEMBL REST client backed by one pooled keep-alive :class:`Session`.
+
+    The session mounts an adapter holding up to *pool_size* connections per
+    host and blocks when the pool is exhausted instead of opening throwaway
+    connections, so a single client may be shared by many threads. Point
+    *base_url* at a local stand-in to run without the EBI service.
+
+    Every request goes through :func:`library.throttling.retry_request` with
+    *retry_policy* (pass ``None`` to disable retries) and waits for
+    *rate_limiter*, or a fixed :class:`RateLimiter` built from
+    *requests_per_second*. Share one :class:`~library.throttling.TokenBucket`
+    between clients, threads or processes to respect a common server limit.
+    With a *hedge_policy* each attempt that runs past the policy's latency
+    percentile is duplicated and the first answer wins; retries still apply
+    to that answer.
+
+    A *cache* answers repeated page requests from disk; when it is offline,
+    uncached pages raise :class:`~library.cache.CacheMissError`.
+    """
+
+    def __init__(
+        self,
+        base_url: str = BASE_URL,
+        *,
+        pool_size: int = 10,
+        timeout: float = 60.0,
+        headers: Mapping[str, str] | None = None,
+        session: Any | None = None,
+        retry_policy: RetryPolicy | None = DEFAULT_RETRY_POLICY,
+        rate_limiter: Limiter | None = None,
+        requests_per_second: float | None = None,
+        hedge_policy: HedgePolicy | None = None,
+        cache: ResponseCache | None = None,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.pool_size = max(int(pool_size), 1)
+        self.timeout = timeout
+        self.headers = {**DEFAULT_HEADERS, **(headers or {})}
+        self.retry_policy = retry_policy or RetryPolicy(retries=0)
+        if rate_limiter is None and requests_per_second:
+            rate_limiter = RateLimiter(requests_per_second)
+        self.rate_limiter = rate_limiter
+        self.hedge_policy = hedge_policy
+        self.cache = cache
+        self.stats: Dict[str, int] = {
+            "requests": 0,
+            "retries": 0,
+            "hedged": 0,
+            "cache_hits": 0,
+            "drift": 0,
+        }
+        self._session = session
+        self._owns_session = session is None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> Any:
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._build_session()
+        return self._session
+
+    def _build_session(self) -> Any:
+        if requests is None:  # pragma: no cover - runtime guard
+            raise RuntimeError(
+                "The 'requests' package is required to use the ChEMBL client"
+            )
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_size,
+            pool_maxsize=self.pool_size,
+            pool_block=True,
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update(self.headers)
+        return session
+
+    def url(self, endpoint: str) -> str:
+        return f"{self.base_url}/{endpoint}.json"
+
+    def get_page(self, endpoint: str, params: Mapping[str, object]) -> Dict[str, Any]:
+        """Fetch one page of *endpoint* and return the decoded JSON payload."""
+
+        query = dict(params)
+        if self.cache is not None:
+            cached = self.cache.get(endpoint, query)
+            if cached is not None:
+                self._count("cache_hits")
+                return cached
+
+        payload = self._request(endpoint, query).json()
+        if self.cache is not None:
+            self.cache.put(endpoint, query, payload)
+        return payload
+
+    def iter_page(
+        self,
+        endpoint: str,
+        params: Mapping[str, object],
+        meta: Dict[str, Any] | None = None,
+    ) -> Iterator[dict]:
+        """Yield the records of one page while its body is still downloading.
+
+        The top-level members other than the record list (``page_meta``) are
+        stored in *meta* once the records are exhausted. With a cache the
+        page is read whole so that it can be stored. Failures after the
+        first byte are not retried.
+        """
+
+        if self.cache is not None:
+            payload = self.get_page(endpoint, params)
+            items = _extract_items(payload, endpoint)
+            if meta is not None:
+                meta.update(
+                    (key, value) for key, value in payload.items() if value is not items
+                )
+            yield from items
+            return
+
+        response = self._request(endpoint, dict(params), stream=True)
+        with closing(response):
+            yield from iter_json_items(
+                response.iter_content(chunk_size=STREAM_CHUNK_SIZE), None, meta
+            )
+
+    def _request(
+        self, endpoint: str, query: Dict[str, object], *, stream: bool = False
+    ) -> Any:
+        url = self.url(endpoint)
+        options: Dict[str, Any] = {"params": query, "timeout": self.timeout}
+        if stream:
+            options["stream"] = True
+
+        def fetch() -> Any:
+            self._count("requests")
+            return self.session.get(url, **options)
+
+        def send() -> Any:
+            if self.hedge_policy is None:
+                return fetch()
+            return self.hedge_policy.run(fetch, on_hedge=lambda: self._count("hedged"))
+
+        return retry_request(
+            send,
+            policy=self.retry_policy,
+            limiter=self.rate_limiter,
+            on_retry=lambda *_: self._count("retries"),
+        )
+
+    def _count(self, key: str, amount: int = 1) -> None:
+        with self._lock:
+            self.stats[key] = self.stats.get(key, 0) + amount
+
+    def paged(
+        self,
+        endpoint: str,
+        params: Dict[str, object] | None = None,
+        limit: int = 1000,
+        sleep: float = 0.0,
+        *,
+        concurrency: int = 1,
+        max_pending: int | None = None,
+        only: Sequence[str] | None = None,
+        stream: bool = False,
+        checkpoint: str | Path | None = None,
+        on_drift: str = "warn",
+    ) -> Iterator[dict]:
+        """Yield dictionaries from *endpoint* handling pagination.
+
+        Sequential crawls follow the ``page_meta.next`` link returned by the
+        API and fall back to computed offsets when a page has none. Every
+        page's ``total_count`` is compared with the first one; a change means
+        records were added or removed mid-crawl, and is logged and counted in
+        ``stats["drift"]`` (*on_drift* ``"warn"``) or raises
+        :class:`PaginationDriftError` (``"raise"``).
+
+        *only* asks the API to return just the listed fields of each record.
+        With *stream* set, sequential pages are parsed incrementally and
+        records are yielded while the page is still downloading.
+
+        With a *checkpoint* path the position after every fully consumed page
+        is saved atomically, and a later call with the same endpoint and
+        query resumes there; a finished crawl yields nothing until the file
+        is removed. Pair it with an append-only sink so that no page is
+        written twice.
+
+        With ``concurrency > 1`` the first page is fetched alone to read
+        ``page_meta.total_count``; the remaining offsets are then requested by
+        a pool of *concurrency* threads. At most *max_pending* pages (twice
+        the concurrency by default) are in flight or buffered at any time, and
+        items are yielded in offset order, so a slow consumer throttles the
+        fetchers.
+        """
+
+        query: Dict[str, object] = dict(params or {})
+        query["limit"] = min(max(int(limit), 1), MAX_PAGE_SIZE)
+        if only:
+            query["only"] = ",".join(only)
+
+        store = (
+            CheckpointStore(checkpoint, endpoint, query)
+            if checkpoint is not None
+            else None
+        )
+        if store is not None and store.state.complete:
+            return
+        start = store.state.offset if store is not None else 0
+        progress = store.advance if store is not None else None
+        totals = _TotalTracker(self, endpoint, on_drift)
+
+        if concurrency > 1:
+            yield from self._paged_concurrent(
+                endpoint,
+                query,
+                sleep,
+                concurrency,
+                max_pending or 2 * concurrency,
+                start=start,
+                progress=progress,
+                totals=totals,
+            )
+        else:
+            cursor = store.state.next if store is not None else None
+            yield from self._paged_sequential(
+                endpoint,
+                query,
+                start,
+                sleep,
+                stream=stream,
+                progress=progress,
+                cursor=self._cursor_query(endpoint, cursor),
+                totals=totals,
+            )
+        if store is not None:
+            store.finish()
+
+    def fetch_by_ids(
+        self,
+        endpoint: str,
+        id_field: str,
+        ids: Iterable[object],
+        params: Mapping[str, object] | None = None,
+        *,
+        batch_size: int = MAX_PAGE_SIZE,
+        max_url_length: int = MAX_URL_LENGTH,
+        concurrency: int = 4,
+        only: Sequence[str] | None = None,
+    ) -> Iterator[dict]:
+        """Yield the records of *endpoint* whose *id_field* is in *ids*.
+
+        Blank and repeated identifiers are dropped (first occurrence wins) and
+        the rest are split into ``{id_field}__in`` filters of at most
+        *batch_size* values whose request URL stays under *max_url_length*.
+        Batches are fetched by *concurrency* threads and yielded in input
+        order; a batch matching more than one page is paginated.
+        """
+
+        base: Dict[str, object] = dict(params or {})
+        if only:
+            base["only"] = ",".join(only)
+        batches = _batch_ids(
+            self.url(endpoint),
+            f"{id_field}__in",
+            _unique_ids(ids),
+            base,
+            batch_size=min(max(int(batch_size), 1), MAX_PAGE_SIZE),
+            max_url_length=max_url_length,
+        )
+
+        def fetch(batch: List[str]) -> List[dict]:
+            query = {
+                **base,
+                f"{id_field}__in": ",".join(batch),
+                "limit": MAX_PAGE_SIZE,
+            }
+            payload = self.get_page(endpoint, {**query, "offset": 0})
+            items = _extract_items(payload, endpoint)
+            total = (payload.get("page_meta") or {}).get("total_count")
+            if total is not None:
+                complete = len(items) >= int(total)
+            else:
+                complete = len(items) < MAX_PAGE_SIZE
+            if items and not complete:
+                items.extend(self._paged_sequential(endpoint, query, len(items), 0.0))
+            return items
+
+        for items in self._ordered(fetch, batches, concurrency, 2 * concurrency):
+            yield from items
+
+    def close(self) -> None:
+        with self._lock:
+            if self._session is not None and self._owns_session:
+                self._session.close()
+            self._session = None
+
+    def __enter__(self) -> "ChemblClient":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _paged_concurrent(
+        self,
+        endpoint: str,
+        query: Dict[str, object],
+        sleep: float,
+        concurrency: int,
+        max_pending: int,
+        *,
+        start: int = 0,
+        progress: PageProgress | None = None,
+        totals: _TotalTracker | None = None,
+    ) -> Iterator[dict]:
+        first_payload = self.get_page(endpoint, {**query, "offset": start})
+        first_items = _extract_items(first_payload, endpoint)
+        yield from first_items
+        if not first_items:
+            return
+        offset = start + len(first_items)
+        if progress is not None:
+            progress(offset, len(first_items), None)
+
+        page_meta = first_payload.get("page_meta") or {}
+        if totals is not None:
+            totals.check(page_meta)
+        total_count = page_meta.get("total_count")
+        if total_count is None:
+            # Without a total the offsets cannot be planned; continue sequentially.
+            yield from self._paged_sequential(
+                endpoint,
+                query,
+                offset,
+                sleep,
+                progress=progress,
+                cursor=self._cursor_query(endpoint, page_meta.get("next")),
+                totals=totals,
+            )
+            return
+
+        # The server may cap the requested limit, so plan from the served page.
+        page_size = len(first_items)
+        planned_total = int(total_count)
+        offsets = range(offset, planned_total, page_size)
+
+        def fetch(page_offset: int) -> tuple[int, List[dict], Any]:
+            if sleep:
+                time.sleep(sleep)
+            payload = self.get_page(endpoint, {**query, "offset": page_offset})
+            meta = payload.get("page_meta") or {}
+            if totals is not None:
+                totals.check(meta)
+            items = _extract_items(payload, endpoint)
+            return page_offset, items, meta.get("total_count")
+
+        pages = self._ordered(fetch, offsets, concurrency, max_pending)
+        try:
+            for page_offset, items, page_total in pages:
+                yield from items
+                if progress is not None:
+                    progress(page_offset + len(items), len(items), None)
+                expected = min(page_size, planned_total - page_offset)
+                drifted = page_total is not None and int(page_total) != planned_total
+                if len(items) == expected and not drifted:
+                    continue
+                # Planned offsets no longer line up with the records; finish
+                # the crawl one page at a time from the next unread record.
+                logger.warning(
+                    "Page did not match planned offsets; continuing sequentially",
+                    extra={
+                        "endpoint": endpoint,
+                        "offset": page_offset,
+                        "expected": expected,
+                        "received": len(items),
+                    },
+                )
+                pages.close()
+                if items:
+                    yield from self._paged_sequential(
+                        endpoint,
+                        query,
+                        page_offset + len(items),
+                        sleep,
+                        progress=progress,
+                        totals=totals,
+                    )
+                return
+        finally:
+            pages.close()
+
+    @staticmethod
+    def _ordered(
+        fn: Callable[[Any], T],
+        args: Iterable[Any],
+        concurrency: int,
+        max_pending: int,
+    ) -> Iterator[T]:
+        """Map *fn* over *args* on a thread pool, yielding results in order.
+
+        At most *max_pending* calls are in flight or buffered at once.
+        """
+
+        remaining = iter(args)
+        pending: Deque[Future[T]] = deque()
+        executor = ThreadPoolExecutor(
+            max_workers=max(concurrency, 1), thread_name_prefix="chembl-paged"
+        )
+        try:
+            for arg in remaining:
+                pending.append(executor.submit(fn, arg))
+                if len(pending) >= max(max_pending, 1):
+                    break
+            while pending:
+                result = pending.popleft().result()
+                for arg in remaining:
+                    pending.append(executor.submit(fn, arg))
+                    break
+                yield result
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _paged_sequential(
+        self,
+        endpoint: str,
+        query: Dict[str, object],
+        offset: int,
+        sleep: float,
+        *,
+        stream: bool = False,
+        progress: PageProgress | None = None,
+        cursor: Dict[str, object] | None = None,
+        totals: _TotalTracker | None = None,
+    ) -> Iterator[dict]:
+        page_query = cursor if cursor is not None else {**query, "offset": offset}
+        while True:
+            if stream:
+                meta: Dict[str, Any] = {}
+                count = 0
+                for item in self.iter_page(endpoint, page_query, meta):
+                    count += 1
+                    yield item
+            else:
+                meta = self.get_page(endpoint, page_query)
+                items = _extract_items(meta, endpoint)
+                count = len(items)
+                yield from items
+            if not count:
+                break
+            page_meta = meta.get("page_meta") or {}
+            if totals is not None:
+                totals.check(page_meta)
+            offset = int(page_query.get("offset", offset)) + count
+            next_link = page_meta.get("next")
+            next_query = self._cursor_query(endpoint, next_link)
+            if progress is not None:
+                progress(offset, count, next_link if next_query else None)
+            if next_query is not None:
+                page_query = next_query
+            elif "next" in page_meta and next_link is None:
+                break  # the API reports this as the last page
+            else:
+                page_query = {**query, "offset": offset}
+            if sleep:
+                time.sleep(sleep)
+
+    def _cursor_query(
+        self, endpoint: str, link: object | None
+    ) -> Dict[str, object] | None:
+        """Return the query encoded in a ``page_meta.next`` *link*.
+
+        Links are resolved against :attr:`base_url`; one that does not point
+        at *endpoint* is ignored so that pagination falls back to offsets.
+        """
+
+        if not link:
+            return None
+        parts = urlsplit(urljoin(self.base_url + "/", str(link)))
+        path = parts.path.rstrip("/")
+        if not (path.endswith(f"/{endpoint}.json") or path.endswith(f"/{endpoint}")):
+            logger.warning(
+                "Ignoring next link for another endpoint",
+                extra={"endpoint": endpoint, "next": str(link)},
+            )
+            return None
+        return dict(parse_qsl(parts.query, keep_blank_values=True))
+
+
+class _TotalTracker:
+    """Compare ``total_count`` across the pages of one crawl."""
+
+    def __init__(self, client: ChemblClient, endpoint: str, on_drift: str) -> None:
+        if on_drift not in {"warn", "raise"}:
+            raise ValueError("on_drift must be 'warn' or 'raise'")
+        self.client = client
+        self.endpoint = endpoint
+        self.on_drift = on_drift
+        self.expected: int | None = None
+        self._lock = threading.Lock()
+
+    def check(self, page_meta: Mapping[str, Any]) -> None:
+        total = page_meta.get("total_count")
+        if total is None:
+            return
+        with self._lock:
+            if self.expected is None:
+                self.expected = int(total)
+                return
+            expected = self.expected
+            if int(total) == expected:
+                return
+            self.expected = int(total)
+        self.client._count("drift")
+        message = (
+            f"total_count of '{self.endpoint}' changed from {expected} to {total} "
+            "during pagination; records may be missing or repeated"
+        )
+        if self.on_drift == "raise":
+            raise PaginationDriftError(message)
+        logger.warning(message)
+
+
+_DEFAULT_CLIENT: ChemblClient | None = None
+_DEFAULT_LOCK = threading.Lock()
+
+
+def get_default_client() -> ChemblClient:
+    """Return the shared client used by :func:`paged` for ``BASE_URL``."""
+
+    global _DEFAULT_CLIENT
+    with _DEFAULT_LOCK:
+        if _DEFAULT_CLIENT is None or _DEFAULT_CLIENT.base_url != BASE_URL.rstrip("/"):
+            _DEFAULT_CLIENT = ChemblClient(BASE_URL)
+        return _DEFAULT_CLIENT
 
 
 def paged(
@@ -18,31 +618,253 @@ def paged(
     params: Dict[str, object] | None = None,
     limit: int = 1000,
     sleep: float = 0.0,
+    *,
+    concurrency: int = 1,
+    max_pending: int | None = None,
+    only: Sequence[str] | None = None,
+    stream: bool = False,
+    checkpoint: str | Path | None = None,
+    on_drift: str = "warn",
 ) -> Iterator[dict]:
-    """Yield dictionaries from the ChEMBL API handling pagination."""
+    """Yield dictionaries from the ChEMBL API handling pagination.
+
+    Thin wrapper over :meth:`ChemblClient.paged` using the shared default
+    client, so consecutive calls reuse pooled connections.
+    """
 
     if requests is None:  # pragma: no cover - runtime guard
-        raise RuntimeError("The 'requests' package is required to use the ChEMBL client")
+        raise RuntimeError(
+            "The 'requests' package is required to use the ChEMBL client"
+        )
 
-    query: Dict[str, object] = dict(params or {})
-    query["limit"] = min(max(int(limit), 1), 1000)
-    offset = 0
+    return get_default_client().paged(
+        endpoint,
+        params,
+        limit,
+        sleep,
+        concurrency=concurrency,
+        max_pending=max_pending,
+        only=only,
+        stream=stream,
+        checkpoint=checkpoint,
+        on_drift=on_drift,
+    )
 
-    while True:
-        query["offset"] = offset
-        response = requests.get(
-            f"{BASE_URL}/{endpoint}.json", params=query, timeout=60
-        )
-        response.raise_for_status()
-        payload = response.json()
-        items = payload.get(endpoint) or payload.get("items") or []
-        if not items:
+
+def write_parquet(
+    records: Iterable[Mapping[str, Any]],
+    path: str | Path,
+    *,
+    schema: Any | None = None,
+    overrides: Mapping[str, Any] | None = None,
+    infer_rows: int = 1000,
+    batch_rows: int = 5000,
+    rows_per_file: int = 1_000_000,
+    compression: str = "snappy",
+) -> Dict[str, Any]:
+    """Stream *records* (e.g. from :meth:`ChemblClient.paged`) into Parquet.
+
+    Nested objects are flattened into dotted columns and lists are stored as
+    JSON text, matching the layout of the pipeline input CSVs. Unless an
+    explicit pyarrow *schema* is given it is inferred from the first
+    *infer_rows* records; *overrides* maps column names to pyarrow types or
+    type aliases (``"string"``, ``"float64"`` ...) and wins over inference.
+    Columns absent from the schema are dropped with a warning, and values
+    that cannot be converted raise :class:`ValueError`.
+
+    Rows are written in batches of *batch_rows* to ``part-NNNNN.parquet``
+    files under the *path* directory, starting a new part every
+    *rows_per_file* rows, so memory stays bounded by one batch. Returns the
+    schema, the number of rows and the written files.
+    """
+
+    if pa is None or pq is None:  # pragma: no cover - runtime guard
+        raise RuntimeError("The 'pyarrow' package is required for write_parquet")
+
+    target = Path(path)
+    target.mkdir(parents=True, exist_ok=True)
+    rows = (_flatten_record(record) for record in records)
+    pending: List[Dict[str, Any]] = []
+    for row in rows:
+        pending.append(row)
+        if schema is None and len(pending) >= max(infer_rows, 1):
             break
-        for item in items:
-            yield item
-        offset += len(items)
-        if sleep:
-            time.sleep(sleep)
+    if schema is None:
+        schema = _infer_schema(pending, overrides or {})
+    elif overrides:
+        schema = _apply_overrides(schema, overrides)
+
+    files: List[str] = []
+    total = 0
+    writer: Any = None
+    file_rows = 0
+    dropped: set[str] = set()
+    names = set(schema.names)
+
+    def flush(batch: List[Dict[str, Any]]) -> None:
+        nonlocal writer, file_rows, total
+        extra = {key for row in batch for key in row} - names - dropped
+        if extra:
+            logger.warning(
+                "Dropping columns missing from the Parquet schema",
+                extra={"columns": sorted(extra)},
+            )
+            dropped.update(extra)
+        while batch:
+            if writer is None:
+                part = target / f"part-{len(files):05d}.parquet"
+                writer = pq.ParquetWriter(str(part), schema, compression=compression)
+                files.append(str(part))
+                file_rows = 0
+            take = min(len(batch), max(rows_per_file - file_rows, 1))
+            writer.write_batch(_to_record_batch(batch[:take], schema))
+            batch = batch[take:]
+            file_rows += take
+            total += take
+            if file_rows >= rows_per_file:
+                writer.close()
+                writer = None
+
+    try:
+        for row in rows:
+            if len(pending) >= batch_rows:
+                flush(pending)
+                pending = []
+            pending.append(row)
+        if pending or not files:
+            flush(pending)
+    finally:
+        if writer is not None:
+            writer.close()
+    return {"schema": schema, "rows": total, "files": files}
+
+
+def _flatten_record(
+    record: Mapping[str, Any], prefix: str = "", out: Dict[str, Any] | None = None
+) -> Dict[str, Any]:
+    flat: Dict[str, Any] = {} if out is None else out
+    for key, value in record.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, Mapping):
+            _flatten_record(value, f"{name}.", flat)
+        elif isinstance(value, (list, tuple)):
+            flat[name] = json.dumps(value, ensure_ascii=False)
+        else:
+            flat[name] = value
+    return flat
+
+
+def _infer_schema(sample: List[Dict[str, Any]], overrides: Mapping[str, Any]) -> Any:
+    columns: Dict[str, None] = {}
+    for row in sample:
+        columns.update(dict.fromkeys(row))
+    for name in overrides:
+        columns.setdefault(name, None)
+    fields = []
+    for name in columns:
+        if name in overrides:
+            dtype = _arrow_type(overrides[name])
+        else:
+            dtype = pa.array([row.get(name) for row in sample]).type
+            if pa.types.is_null(dtype):
+                dtype = pa.string()
+        fields.append(pa.field(name, dtype))
+    return pa.schema(fields)
+
+
+def _apply_overrides(schema: Any, overrides: Mapping[str, Any]) -> Any:
+    fields = [
+        pa.field(field.name, _arrow_type(overrides[field.name]))
+        if field.name in overrides
+        else field
+        for field in schema
+    ]
+    known = set(schema.names)
+    fields.extend(
+        pa.field(name, _arrow_type(dtype))
+        for name, dtype in overrides.items()
+        if name not in known
+    )
+    return pa.schema(fields)
+
+
+def _arrow_type(value: Any) -> Any:
+    return pa.type_for_alias(value) if isinstance(value, str) else value
+
+
+def _to_record_batch(batch: List[Dict[str, Any]], schema: Any) -> Any:
+    arrays = []
+    for field in schema:
+        values = [row.get(field.name) for row in batch]
+        try:
+            arrays.append(pa.array(values, type=field.type))
+        except (pa.ArrowInvalid, pa.ArrowTypeError) as exc:
+            raise ValueError(
+                f"Column '{field.name}' does not fit type {field.type}; "
+                "pass an override to write_parquet"
+            ) from exc
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _unique_ids(ids: Iterable[object]) -> List[str]:
+    unique: Dict[str, None] = {}
+    for value in ids:
+        if value is None or value != value:  # None or NaN
+            continue
+        text = str(value).strip()
+        if text:
+            unique.setdefault(text, None)
+    return list(unique)
+
+
+def _batch_ids(
+    url: str,
+    filter_name: str,
+    ids: List[str],
+    params: Mapping[str, object],
+    *,
+    batch_size: int,
+    max_url_length: int,
+) -> Iterator[List[str]]:
+    # Reserve room for the fixed query parameters, including limit/offset.
+    fixed = urlencode(
+        {**params, filter_name: "", "limit": MAX_PAGE_SIZE, "offset": 0}, doseq=True
+    )
+    budget = max_url_length - len(url) - len(fixed) - 1
+    separator = len(quote(","))
+    batch: List[str] = []
+    used = 0
+    for value in ids:
+        size = len(quote(value, safe="")) + (separator if batch else 0)
+        if batch and (len(batch) >= batch_size or used + size > budget):
+            yield batch
+            batch, used = [], 0
+            size -= separator
+        batch.append(value)
+        used += size
+    if batch:
+        yield batch
+
+
+def _extract_items(payload: Dict[str, Any], endpoint: str) -> List[dict]:
+    items = payload.get(endpoint) or payload.get("items")
+    if items:
+        return items
+    # ChEMBL names the collection in the plural (``molecule`` -> ``molecules``).
+    for key, value in payload.items():
+        if key != "page_meta" and isinstance(value, list):
+            return value
+    return []
 
 
-__all__ = ["paged", "BASE_URL"]
+__all__ = [
+    "BASE_URL",
+    "ChemblClient",
+    "DEFAULT_RETRY_POLICY",
+    "MAX_PAGE_SIZE",
+    "MAX_URL_LENGTH",
+    "PaginationDriftError",
+    "get_default_client",
+    "paged",
+    "write_parquet",
+]
@@ -1,14 +1,27 @@
 from __future__ import annotations
 
+import csv
+import hashlib
+import json
 import logging
 import re
+import threading
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Dict, Mapping
 
 import yaml
 
+from .validators import SchemaPlan, resolve_type_map
+
+if TYPE_CHECKING:  # pragma: no cover - imported for annotations only
+    from .transforms.common import PipeRules
+
 LOGGER = logging.getLogger(__name__)
 
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
 _BACKSLASH_KEYS_PASSTHROUGH = {"line_terminator"}
 _BACKSLASH_PATTERN = re.compile(
     r"(?m)^(?P<indent>\s*)(?P<key>[^:\n]+):\s*\"(?P<value>[^\"\n]*\\[^\"\n]*)\""
@@ -80,5 +93,167 @@ def _should_escape_value(value: str) -> bool:
     return False
 
 
-__all__ = ["load_config"]
+@dataclass(frozen=True)
+class PipelineSchema:
+    """Resolved dtypes and output column order of one pipeline.
+
+    :attr:`plan` adds every ``column_order`` and ``type_map`` column, converts
+    the ``type_map`` columns and, with ``select=True``, keeps ``column_order``.
+    """
+
+    type_map: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+    column_order: tuple[str, ...] = ()
+    plan: SchemaPlan = field(default_factory=SchemaPlan)
+
+
+@dataclass(frozen=True)
+class CompiledConfig:
+    """Normalized lookup tables derived once from a configuration mapping."""
+
+    sort_pipes: bool = True
+    pipe_rules: Mapping[str, tuple[tuple[str, PipeRules], ...]] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    schemas: Mapping[str, PipelineSchema] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    lookups: Mapping[str, PipeRules] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+
+    def schema(self, pipeline: str) -> PipelineSchema:
+        return self.schemas.get(pipeline, _EMPTY_SCHEMA)
+
+    def rules(self, pipeline: str) -> tuple[tuple[str, PipeRules], ...]:
+        """Return ``(column, rules)`` pairs in ``classification_rules`` order."""
+
+        return self.pipe_rules.get(pipeline, ())
+
+    def lookup(self, name: str) -> PipeRules | None:
+        """Return the compiled ``cleaning`` alias/drop lookup called *name*."""
+
+        return self.lookups.get(name)
+
+
+_EMPTY_SCHEMA = PipelineSchema()
+_COMPILED_CACHE: Dict[str, CompiledConfig] = {}
+_COMPILED_CACHE_SIZE = 16
+_COMPILED_LOCK = threading.Lock()
+# The only configuration sections read by :func:`_build_compiled`.
+_COMPILED_SECTIONS = ("cleaning", "pipeline")
+
+
+def compile_config(config: Mapping[str, Any]) -> CompiledConfig:
+    """Return the :class:`CompiledConfig` for *config*, building it at most once.
+
+    Results are cached per process and keyed on a SHA-256 fingerprint of the
+    ``cleaning`` and ``pipeline`` sections, so every transform receiving the
+    same settings shares one set of alias/drop tables and dtype plans, while
+    editing those sections in place yields a fresh compilation.
+    """
+
+    key = _fingerprint(config)
+    with _COMPILED_LOCK:
+        cached = _COMPILED_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    compiled = _build_compiled(config)
+    with _COMPILED_LOCK:
+        if len(_COMPILED_CACHE) >= _COMPILED_CACHE_SIZE:
+            _COMPILED_CACHE.pop(next(iter(_COMPILED_CACHE)))
+        _COMPILED_CACHE[key] = compiled
+    return compiled
+
+
+def _fingerprint(config: Mapping[str, Any]) -> str:
+    sections = {name: config.get(name) for name in _COMPILED_SECTIONS}
+    try:
+        raw = json.dumps(sections, sort_keys=True, default=repr)
+    except TypeError:
+        # Mixed key types cannot be sorted; insertion order is still stable.
+        raw = json.dumps(sections, default=repr)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _build_compiled(config: Mapping[str, Any]) -> CompiledConfig:
+    # Imported lazily: the transforms package itself depends on this module.
+    from .transforms.common import compile_pipe_rules
+
+    cleaning_cfg = config.get("cleaning") or {}
+    pipeline_cfg = config.get("pipeline") or {}
+
+    pipe_rules: Dict[str, tuple[tuple[str, PipeRules], ...]] = {}
+    schemas: Dict[str, PipelineSchema] = {}
+    for name, section in pipeline_cfg.items():
+        if not isinstance(section, Mapping):
+            continue
+        pipe_rules[name] = tuple(
+            (rule["column"], compile_pipe_rules(rule.get("alias"), rule.get("drop")))
+            for rule in section.get("classification_rules") or []
+            if rule.get("column") is not None
+        )
+
+        type_map = resolve_type_map(dict(section.get("type_map") or {}))
+        column_order = section.get("column_order") or section.get("output_columns")
+        column_order = tuple(column_order or ())
+        schemas[name] = PipelineSchema(
+            type_map=MappingProxyType(type_map),
+            column_order=column_order,
+            plan=SchemaPlan.compile(
+                type_map, (*column_order, *type_map), order=column_order
+            ),
+        )
+
+    alias_files = cleaning_cfg.get("alias_maps") or {}
+    drop_files = cleaning_cfg.get("drop_lists") or {}
+    lookups: Dict[str, PipeRules] = {}
+    for name in sorted(set(alias_files) | set(drop_files)):
+        alias_map = _read_alias_file(alias_files.get(name))
+        drop_list = _read_drop_file(drop_files.get(name))
+        lookups[name] = compile_pipe_rules(alias_map, drop_list)
+
+    return CompiledConfig(
+        sort_pipes=bool(cleaning_cfg.get("sort_pipes", True)),
+        pipe_rules=MappingProxyType(pipe_rules),
+        schemas=MappingProxyType(schemas),
+        lookups=MappingProxyType(lookups),
+    )
+
+
+def _resolve_dictionary_path(raw: Any) -> Path | None:
+    if not raw:
+        return None
+    path = Path(str(raw))
+    if path.is_absolute() or path.exists():
+        return path
+    candidate = _PROJECT_ROOT / path
+    if candidate.exists():
+        return candidate
+    LOGGER.warning("Cleaning dictionary not found", extra={"path": str(raw)})
+    return None
+
+
+def _read_dictionary_rows(raw: Any) -> list[list[str]]:
+    path = _resolve_dictionary_path(raw)
+    if path is None:
+        return []
+    with path.open("r", encoding="utf-8-sig", newline="") as handle:
+        rows = [row for row in csv.reader(handle) if row and row[0].strip()]
+    # The first row is a header naming the columns.
+    return rows[1:]
+
+
+def _read_alias_file(raw: Any) -> Dict[str, str | None]:
+    alias_map: Dict[str, str | None] = {}
+    for row in _read_dictionary_rows(raw):
+        target = row[1].strip() if len(row) > 1 else ""
+        alias_map[row[0]] = target or None
+    return alias_map
+
+
+def _read_drop_file(raw: Any) -> list[str]:
+    return [row[0] for row in _read_dictionary_rows(raw)]
+
 
+__all__ = ["CompiledConfig", "PipelineSchema", "compile_config", "load_config"]
@@ -0,0 +1,244 @@
+"""Crawl a document set and its related ChEMBL entities.
+
+Starting from document identifiers, :func:`crawl_documents` fetches the
+documents and their activities, then the assays, molecules and targets the
+activities reference. Every layer is requested with batched ``__in`` filters
+over de-duplicated identifiers, and downstream batches are submitted as soon
+as enough new identifiers have been seen, so all layers download
+concurrently. :func:`write_crawl` stores the result under the five input file
+keys of the ``get_*_data`` pipelines.
+
+The activity, assay and testitem files carry the input columns of their
+pipelines and can be processed as written. The document and target files
+only hold the ChEMBL layer: the PubMed, Crossref, OpenAlex, UniProt and IUPHAR
+columns those pipelines expect come from other sources and are not fetched.
+"""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import pandas as pd
+
+from .chembl_client import ChemblClient, get_default_client
+from .io import write_csv
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Layer:
+    """One related entity: its endpoint, identifier field and output key."""
+
+    name: str
+    endpoint: str
+    id_field: str
+    files_key: str
+
+
+DOCUMENT_LAYER = Layer("document", "document", "document_chembl_id", "document_csv")
+ACTIVITY_LAYER = Layer("activity", "activity", "document_chembl_id", "activity_csv")
+RELATED_LAYERS: tuple[Layer, ...] = (
+    Layer("assay", "assay", "assay_chembl_id", "assay_csv"),
+    Layer("testitem", "molecule", "molecule_chembl_id", "testitem_csv"),
+    Layer("target", "target", "target_chembl_id", "target_csv"),
+)
+LAYERS: tuple[Layer, ...] = (DOCUMENT_LAYER, ACTIVITY_LAYER, *RELATED_LAYERS)
+
+# Column conventions of the pipeline inputs that differ from the API fields.
+DOCUMENT_PREFIX = "ChEMBL."
+COLUMN_RENAMES: Dict[str, Dict[str, str]] = {
+    "activity": {"activity_id": "activity_chembl_id"},
+    "testitem": {"molecule_structures.standard_inchi_key": "standard_inchi_key"},
+}
+# Input columns of the pipelines fed by ChEMBL alone. They lead each frame and
+# are added empty when the API omits them (``is_citation`` is curated
+# locally); the remaining API fields follow.
+INPUT_COLUMNS: Dict[str, tuple[str, ...]] = {
+    "activity": (
+        "activity_chembl_id",
+        "assay_chembl_id",
+        "molecule_chembl_id",
+        "document_chembl_id",
+        "is_citation",
+    ),
+    "assay": (
+        "assay_chembl_id",
+        "document_chembl_id",
+        "target_chembl_id",
+        "assay_category",
+        "assay_group",
+        "assay_type",
+        "assay_type_description",
+        "assay_organism",
+        "assay_test_type",
+        "assay_cell_type",
+        "assay_tissue",
+        "assay_tax_id",
+        "assay_with_same_target",
+        "confidence_score",
+        "confidence_description",
+        "relationship_type",
+        "relationship_description",
+        "bao_format",
+        "bao_label",
+        "aidx",
+        "assay_classifications",
+        "assay_parameters",
+        "assay_subcellular_fraction",
+        "cell_chembl_id",
+        "description",
+        "src_assay_id",
+        "src_id",
+        "tissue_chembl_id",
+        "variant_sequence",
+    ),
+    "testitem": (
+        "molecule_chembl_id",
+        "pref_name",
+        "all_names",
+        "molecule_structures.canonical_smiles",
+        "molecule_type",
+        "structure_type",
+        "is_radical",
+        "standard_inchi_key",
+        "nstereo",
+        "document_chembl_id",
+    ),
+}
+
+
+def crawl_documents(
+    document_ids: Iterable[object],
+    client: Optional[ChemblClient] = None,
+    *,
+    batch_size: int = 200,
+    concurrency: int = 4,
+) -> Dict[str, pd.DataFrame]:
+    """Return document, activity, assay, testitem and target frames.
+
+    Activities are streamed while documents download in the background; each
+    time *batch_size* new assay, molecule or target identifiers have been
+    seen, a lookup for them is queued on a pool of *concurrency* workers.
+    Nested fields are flattened into dotted columns.
+
+    The activity, assay and testitem frames lead with the pipeline input
+    columns (see :data:`INPUT_COLUMNS`); columns ChEMBL does not provide, such
+    as ``is_citation`` or ``all_names``, are left empty. The document and
+    target frames hold the ChEMBL records only and must still be joined with
+    the PubMed/Crossref/OpenAlex and UniProt/IUPHAR exports before
+    ``get_document_data`` or ``get_target_data`` can run on them.
+    """
+
+    api = client or get_default_client()
+    ids = list(document_ids)
+    executor = ThreadPoolExecutor(
+        max_workers=max(concurrency, 2), thread_name_prefix="chembl-crawl"
+    )
+    batches: Dict[str, List[Future[List[dict]]]] = {
+        layer.name: [] for layer in RELATED_LAYERS
+    }
+    seen: Dict[str, set[str]] = {layer.name: set() for layer in RELATED_LAYERS}
+    waiting: Dict[str, List[str]] = {layer.name: [] for layer in RELATED_LAYERS}
+
+    def lookup(layer: Layer, values: List[str]) -> List[dict]:
+        return list(
+            api.fetch_by_ids(layer.endpoint, layer.id_field, values, concurrency=1)
+        )
+
+    def submit(layer: Layer, force: bool = False) -> None:
+        pending = waiting[layer.name]
+        while pending and (force or len(pending) >= batch_size):
+            chunk, pending[:] = pending[:batch_size], pending[batch_size:]
+            batches[layer.name].append(executor.submit(lookup, layer, chunk))
+
+    try:
+        documents = executor.submit(lookup, DOCUMENT_LAYER, ids)
+        activities: List[dict] = []
+        for record in api.fetch_by_ids(
+            ACTIVITY_LAYER.endpoint,
+            ACTIVITY_LAYER.id_field,
+            ids,
+            concurrency=max(concurrency // 2, 1),
+        ):
+            activities.append(record)
+            for layer in RELATED_LAYERS:
+                value = record.get(layer.id_field)
+                if value and value not in seen[layer.name]:
+                    seen[layer.name].add(value)
+                    waiting[layer.name].append(value)
+                    submit(layer)
+        for layer in RELATED_LAYERS:
+            submit(layer, force=True)
+
+        records: Dict[str, List[dict]] = {
+            DOCUMENT_LAYER.name: documents.result(),
+            ACTIVITY_LAYER.name: activities,
+        }
+        for layer in RELATED_LAYERS:
+            records[layer.name] = [
+                item for future in batches[layer.name] for item in future.result()
+            ]
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    frames = {name: _to_frame(name, rows) for name, rows in records.items()}
+    logger.info(
+        "Crawled related entities",
+        extra={"rows": {name: len(frame) for name, frame in frames.items()}},
+    )
+    return frames
+
+
+def write_crawl(
+    frames: Mapping[str, pd.DataFrame],
+    out_dir: str | Path,
+    config: Dict[str, Any],
+) -> Dict[str, Path]:
+    """Write crawled *frames* as ``<name>.csv`` files under *out_dir*.
+
+    Returns the ``files`` mapping (``activity_csv`` ...) pointing at the
+    written paths, ready to merge into a pipeline configuration.
+    """
+
+    target = Path(out_dir)
+    target.mkdir(parents=True, exist_ok=True)
+    files: Dict[str, Path] = {}
+    for layer in LAYERS:
+        frame = frames.get(layer.name)
+        if frame is None:
+            continue
+        path = target / f"{layer.name}.csv"
+        write_csv(frame, path, config)
+        files[layer.files_key] = path
+    return files
+
+
+def _to_frame(name: str, rows: List[dict]) -> pd.DataFrame:
+    frame = pd.json_normalize(rows) if rows else pd.DataFrame()
+    renames = {
+        source: target
+        for source, target in COLUMN_RENAMES.get(name, {}).items()
+        if source in frame.columns and target not in frame.columns
+    }
+    frame = frame.rename(columns=renames)
+    columns = INPUT_COLUMNS.get(name)
+    if columns:
+        extra = [column for column in frame.columns if column not in columns]
+        frame = frame.reindex(columns=[*columns, *extra])
+    if name == DOCUMENT_LAYER.name:
+        frame = frame.rename(columns=lambda column: f"{DOCUMENT_PREFIX}{column}")
+    return frame
+
+
+__all__ = [
+    "INPUT_COLUMNS",
+    "LAYERS",
+    "Layer",
+    "crawl_documents",
+    "write_crawl",
+]
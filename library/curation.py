@@ -0,0 +1,254 @@
+"""Compiled curation dictionaries with memory-mapped warm starts.
+
+The CSV dictionaries under ``dictionary/_curation`` are parsed, typed and
+de-duplicated once and stored in a single indexed bundle file. Every section of
+the bundle is an Arrow IPC file; a JSON header records the byte range of each
+section together with a fingerprint of its source CSV so that stale sections
+trigger an automatic rebuild.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import struct
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Mapping
+
+import pandas as pd
+
+from .io import LoaderError, read_csv, resolve_path
+from .transforms.common import mark_prepared
+from .transforms.document import (
+    _prepare_citation_thresholds,
+    _prepare_document_reference,
+)
+from .transforms.testitem import _prepare_reference
+
+try:  # pragma: no cover - optional dependency
+    import pyarrow as pa  # type: ignore[import-not-found]
+    import pyarrow.ipc as pa_ipc  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None  # type: ignore[assignment]
+    pa_ipc = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+_PROJECT_ROOT = Path(__file__).resolve().parent.parent
+_MAGIC = b"CHEMBLPQ-CURATION\n"
+_HEADER_SIZE = struct.Struct("<Q")
+BUNDLE_VERSION = 1
+
+CURATION_SOURCES: Dict[str, tuple[str, ...]] = {
+    "testitem": ("testitem_reference_csv",),
+    "document": ("document_reference_csv",),
+    "citation_fraction": (
+        "citation_reference_csv",
+        "citation_fraction_csv",
+        "citation_csv",
+    ),
+}
+
+_PREPARERS: Dict[str, Callable[[pd.DataFrame], pd.DataFrame]] = {
+    "testitem": _prepare_reference,
+    "document": _prepare_document_reference,
+    "citation_fraction": _prepare_citation_thresholds,
+}
+
+
+def bundle_path(config: Mapping[str, Any]) -> Path | None:
+    """Return the configured bundle location or ``None`` when disabled."""
+
+    raw = (config.get("curation") or {}).get("bundle_path")
+    if not raw:
+        return None
+    path = Path(str(raw))
+    if not path.is_absolute():
+        path = _PROJECT_ROOT / path
+    return path
+
+
+def source_key(name: str, config: Mapping[str, Any]) -> str | None:
+    """Return the ``files`` key backing curation dictionary *name*."""
+
+    files_cfg = config.get("files") or {}
+    for key in CURATION_SOURCES.get(name, ()):
+        if key in files_cfg:
+            return key
+    return None
+
+
+def build_bundle(config: Mapping[str, Any], path: str | Path | None = None) -> Path:
+    """Compile the curation dictionaries into one bundle file at *path*."""
+
+    _require_pyarrow()
+    target = Path(path) if path is not None else bundle_path(config)
+    if target is None:
+        raise LoaderError("curation.bundle_path is not configured")
+
+    sections: list[tuple[str, bytes, Dict[str, Any]]] = []
+    for name in CURATION_SOURCES:
+        key = source_key(name, config)
+        if key is None:
+            continue
+        source = resolve_path(key, config)
+        frame = _PREPARERS[name](read_csv(key, dict(config)))
+        table = pa.Table.from_pandas(frame, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa_ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        sections.append((name, sink.getvalue().to_pybytes(), _fingerprint(source)))
+        logger.info(
+            "Compiled curation dictionary",
+            extra={"dictionary": name, "rows": len(frame), "source": str(source)},
+        )
+
+    entries: Dict[str, Any] = {}
+    offset = 0
+    for name, payload, fingerprint in sections:
+        entries[name] = {
+            "offset": offset,
+            "length": len(payload),
+            "source": fingerprint,
+        }
+        offset += len(payload)
+    header = json.dumps(
+        {"version": BUNDLE_VERSION, "entries": entries}, sort_keys=True
+    ).encode("utf-8")
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    temporary = target.with_name(f"{target.name}.tmp")
+    with temporary.open("wb") as handle:
+        handle.write(_MAGIC)
+        handle.write(_HEADER_SIZE.pack(len(header)))
+        handle.write(header)
+        for _, payload, _ in sections:
+            handle.write(payload)
+    os.replace(temporary, target)
+    return target
+
+
+def is_stale(config: Mapping[str, Any], path: str | Path | None = None) -> bool:
+    """Return ``True`` when the bundle is missing or any source CSV changed."""
+
+    target = Path(path) if path is not None else bundle_path(config)
+    if target is None or not target.exists():
+        return True
+    try:
+        header = _read_header(target)
+    except (OSError, ValueError):
+        return True
+    if header.get("version") != BUNDLE_VERSION:
+        return True
+    entries = header.get("entries", {})
+    for name in CURATION_SOURCES:
+        key = source_key(name, config)
+        if key is None:
+            continue
+        entry = entries.get(name)
+        if entry is None:
+            return True
+        try:
+            current = _fingerprint(resolve_path(key, config))
+        except LoaderError:
+            return True
+        if entry.get("source") != current:
+            return True
+    return False
+
+
+def load_bundle(
+    config: Mapping[str, Any],
+    path: str | Path | None = None,
+    *,
+    names: Iterable[str] | None = None,
+    rebuild: bool = True,
+) -> Dict[str, pd.DataFrame]:
+    """Memory-map the bundle and return the prepared dictionaries it holds.
+
+    Only the sections listed in *names* are materialized (all by default). The
+    bundle is recompiled first when *rebuild* is set and a source CSV changed
+    since the section was compiled.
+    """
+
+    _require_pyarrow()
+    target = Path(path) if path is not None else bundle_path(config)
+    if target is None:
+        raise LoaderError("curation.bundle_path is not configured")
+    if rebuild and is_stale(config, target):
+        logger.info("Rebuilding stale curation bundle", extra={"path": str(target)})
+        build_bundle(config, target)
+
+    header = _read_header(target)
+    wanted = set(names) if names is not None else None
+    data_start = len(_MAGIC) + _HEADER_SIZE.size + _header_length(target)
+    frames: Dict[str, pd.DataFrame] = {}
+    with pa.memory_map(str(target), "r") as mapped:
+        buffer = mapped.read_buffer()
+        for name, entry in header.get("entries", {}).items():
+            if wanted is not None and name not in wanted:
+                continue
+            section = buffer.slice(data_start + entry["offset"], entry["length"])
+            table = pa_ipc.open_file(pa.BufferReader(section)).read_all()
+            frames[name] = mark_prepared(table.to_pandas())
+    return frames
+
+
+def load_curation(name: str, config: Mapping[str, Any]) -> pd.DataFrame:
+    """Return curation dictionary *name*, preferring the compiled bundle.
+
+    Falls back to reading and preparing the source CSV when no bundle is
+    configured, ``pyarrow`` is unavailable or the source is not a local file.
+    """
+
+    key = source_key(name, config)
+    if key is None:
+        raise LoaderError(f"No source file configured for curation '{name}'")
+    source_kind = str((config.get("source") or {}).get("kind", "file")).lower()
+    if pa is not None and source_kind == "file" and bundle_path(config) is not None:
+        frames = load_bundle(config, names=[name])
+        if name in frames:
+            return frames[name]
+    return _PREPARERS[name](read_csv(key, dict(config)))
+
+
+def _fingerprint(path: Path) -> Dict[str, Any]:
+    stat = path.stat()
+    return {
+        "path": str(path.resolve()),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def _header_length(path: Path) -> int:
+    with path.open("rb") as handle:
+        magic = handle.read(len(_MAGIC))
+        if magic != _MAGIC:
+            raise ValueError(f"Not a curation bundle: {path}")
+        (length,) = _HEADER_SIZE.unpack(handle.read(_HEADER_SIZE.size))
+    return length
+
+
+def _read_header(path: Path) -> Dict[str, Any]:
+    length = _header_length(path)
+    with path.open("rb") as handle:
+        handle.seek(len(_MAGIC) + _HEADER_SIZE.size)
+        return json.loads(handle.read(length).decode("utf-8"))
+
+
+def _require_pyarrow() -> None:
+    if pa is None:  # pragma: no cover - runtime guard
+        raise RuntimeError("The 'pyarrow' package is required for curation bundles")
+
+
+__all__ = [
+    "CURATION_SOURCES",
+    "build_bundle",
+    "bundle_path",
+    "is_stale",
+    "load_bundle",
+    "load_curation",
+    "source_key",
+]
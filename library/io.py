@@ -164,6 +164,22 @@ def _read_kwargs(config: Dict[str, Any], *, encoding: str) -> Dict[str, Any]:
     return kwargs
 
 
+def resolve_path(path_key: str, config: Dict[str, Any]) -> Path:
+    """Return the local file behind *path_key*, honouring fallback directories."""
+
+    path = _build_path(path_key, config)
+    if path.exists():
+        return path
+    fallback = _locate_fallback_path(path, config)
+    if fallback is None:
+        raise LoaderError(f"File not found: {path}")
+    logger.info(
+        "Using fallback path",
+        extra={"path_key": path_key, "requested": str(path), "fallback": str(fallback)},
+    )
+    return fallback
+
+
 def read_csv(path_key: str, config: Dict[str, Any]) -> pd.DataFrame:
     """Read a CSV identified by *path_key* using *config* options."""
 
@@ -176,16 +192,10 @@ def read_csv(path_key: str, config: Dict[str, Any]) -> pd.DataFrame:
     last_error: UnicodeDecodeError | None = None
 
     if source_kind == "file":
-        if not path.exists():
-            fallback = _locate_fallback_path(path, config)
-            if fallback is not None:
-                logger.info(
-                    "Using fallback path",
-                    extra={"path_key": path_key, "requested": str(path), "fallback": str(fallback)},
-                )
-                path = fallback
-            else:
-                raise LoaderError(f"File not found: {path}")
+        path = resolve_path(path_key, config)
+        if path.is_dir() or path.suffix.lower() == ".parquet":
+            # Parquet datasets written by chembl_client.write_parquet.
+            return pd.read_parquet(path)
         for encoding in encodings:
             try:
                 kwargs = _read_kwargs(config, encoding=encoding)
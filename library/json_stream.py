@@ -0,0 +1,129 @@
+"""Incremental parsing of ChEMBL list payloads.
+
+ChEMBL pages are JSON objects holding one list of records next to a
+``page_meta`` object. :func:`iter_json_items` walks such an object as its
+bytes arrive and yields each record of the list as soon as it is complete,
+so only one record (plus the current network chunk) is held in memory.
+"""
+
+from __future__ import annotations
+
+import codecs
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+_DECODER = json.JSONDecoder()
+_WHITESPACE = " \t\n\r"
+
+
+class _Buffer:
+    """Text window over a byte stream with on-demand refills."""
+
+    def __init__(self, chunks: Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Append the next chunk; return ``False`` at the end of the stream."""
+
+        if self.eof:
+            return False
+        for chunk in self._chunks:
+            if not chunk:
+                continue
+            self.text = self.text[self.pos :] + self._decoder.decode(chunk)
+            self.pos = 0
+            return True
+        self.text = self.text[self.pos :] + self._decoder.decode(b"", final=True)
+        self.pos = 0
+        self.eof = True
+        return False
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it."""
+
+        while True:
+            while self.pos < len(self.text) and self.text[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.text):
+                return self.text[self.pos]
+            if not self.fill():
+                raise ValueError("Unexpected end of JSON stream")
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected {char!r} in JSON stream, found {found!r}")
+        self.pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A value touching the end of the window (e.g. a number) may
+            # continue in the next chunk.
+            if end == len(self.text) and not self.eof and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_items(
+    chunks: Iterable[bytes],
+    key: Optional[str] = None,
+    meta: Optional[Dict[str, Any]] = None,
+) -> Iterator[Any]:
+    """Yield the elements of the list stored under *key* in a JSON object.
+
+    Without *key* the first list-valued member is streamed. Every other
+    top-level member (``page_meta`` in particular) is decoded into *meta*,
+    which is complete once the iterator is exhausted.
+    """
+
+    buffer = _Buffer(chunks)
+    extra: Dict[str, Any] = meta if meta is not None else {}
+    streamed = False
+    buffer.expect("{")
+    if buffer.peek() == "}":
+        return
+    while True:
+        name = buffer.value()
+        if not isinstance(name, str):
+            raise ValueError("Expected an object key in JSON stream")
+        buffer.expect(":")
+        wanted = name == key if key is not None else not streamed
+        if wanted and not streamed and buffer.peek() == "[":
+            streamed = True
+            buffer.pos += 1
+            if buffer.peek() == "]":
+                buffer.pos += 1
+            else:
+                while True:
+                    yield buffer.value()
+                    separator = buffer.peek()
+                    buffer.pos += 1
+                    if separator == "]":
+                        break
+                    if separator != ",":
+                        raise ValueError("Malformed array in JSON stream")
+        else:
+            extra[name] = buffer.value()
+        separator = buffer.peek()
+        buffer.pos += 1
+        if separator == "}":
+            return
+        if separator != ",":
+            raise ValueError("Malformed object in JSON stream")
+
+
+__all__ = ["iter_json_items"]
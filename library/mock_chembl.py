@@ -0,0 +1,224 @@
+"""Local stand-in for the ChEMBL REST API used for tests and benchmarks.
+
+:class:`MockChemblServer` serves deterministic synthetic records for any
+endpoint (``/<prefix>/<endpoint>.json``) with ChEMBL-style pagination,
+``only`` projection and ``<field>__in`` filters. Response latency follows a
+log-normal distribution with an optional slow tail, and a configurable share
+of requests fail with 5xx errors or 429 throttling responses.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/chembl/api/data"
+
+
+@dataclass(frozen=True)
+class MockSettings:
+    """Behaviour of :class:`MockChemblServer`.
+
+    Latency is log-normal with the given *latency_median* (seconds) and
+    *latency_sigma*; with probability *tail_probability* a request instead
+    takes *tail_latency*. *error_rate* and *throttle_rate* are the shares of
+    requests answered with HTTP 500 and HTTP 429 (with ``Retry-After:
+    retry_after``).
+    """
+
+    total: int = 10_000
+    max_limit: int = 1000
+    latency_median: float = 0.0
+    latency_sigma: float = 0.5
+    tail_probability: float = 0.0
+    tail_latency: float = 1.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: float = 0.0
+    seed: Optional[int] = None
+
+
+def collection_name(endpoint: str) -> str:
+    """Return the ChEMBL plural key for *endpoint* (``activity`` -> ``activities``)."""
+
+    if endpoint.endswith("y"):
+        return endpoint[:-1] + "ies"
+    return endpoint + "s"
+
+
+def synthetic_record(endpoint: str, index: int) -> Dict[str, Any]:
+    """Return the deterministic record number *index* of *endpoint*."""
+
+    return {
+        f"{endpoint}_chembl_id": f"CHEMBL{index}",
+        "id": index,
+        "pref_name": f"{endpoint} {index}",
+        "standard_value": str(round(index * 0.37, 2)),
+        "score": {"value": index % 97, "source": "mock"},
+        "synonyms": [f"SYN{index}", f"ALT{index}"],
+    }
+
+
+class MockChemblServer:
+    """Threaded HTTP server emulating the ChEMBL pagination API.
+
+    Use as a context manager; :attr:`base_url` is ready to pass to
+    :class:`library.chembl_client.ChemblClient`.
+    """
+
+    def __init__(
+        self, settings: MockSettings | None = None, *, host: str = "127.0.0.1"
+    ) -> None:
+        self.settings = settings or MockSettings()
+        self.stats: Dict[str, int] = {"requests": 0, "errors": 0, "throttled": 0}
+        self._random = random.Random(self.settings.seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, 0), _make_handler(self))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self) -> "MockChemblServer":
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._server.serve_forever,
+                name="mock-chembl",
+                daemon=True,
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread.join()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "MockChemblServer":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def respond(self, path: str, query: Dict[str, List[str]]) -> tuple[int, Any]:
+        """Return the status code and body for a request (after the delay)."""
+
+        settings = self.settings
+        with self._lock:
+            self.stats["requests"] += 1
+            draw = self._random.random()
+            slow = self._random.random() < settings.tail_probability
+            noise = self._random.gauss(0.0, 1.0)
+        if slow:
+            delay = settings.tail_latency
+        elif settings.latency_median > 0:
+            delay = settings.latency_median * math.exp(settings.latency_sigma * noise)
+        else:
+            delay = 0.0
+        if delay:
+            time.sleep(delay)
+
+        if draw < settings.throttle_rate:
+            self._count("throttled")
+            return 429, {"error": "Too Many Requests"}
+        if draw < settings.throttle_rate + settings.error_rate:
+            self._count("errors")
+            return 500, {"error": "Internal Server Error"}
+
+        endpoint = path.rstrip("/").rsplit("/", 1)[-1]
+        if endpoint.endswith(".json"):
+            endpoint = endpoint[: -len(".json")]
+        params = {key: values[-1] for key, values in query.items()}
+        limit = min(max(int(params.get("limit", 20)), 1), settings.max_limit)
+        offset = max(int(params.get("offset", 0)), 0)
+
+        indices = self._matching_indices(endpoint, params)
+        total = len(indices) if indices is not None else settings.total
+        stop = min(offset + limit, total)
+        selected = indices[offset:stop] if indices is not None else range(offset, stop)
+        items = [synthetic_record(endpoint, index) for index in selected]
+        only = [field for field in params.get("only", "").split(",") if field]
+        if only:
+            items = [{key: item.get(key) for key in only} for item in items]
+
+        next_link = None
+        if stop < total:
+            next_link = f"{path}?{urlencode({**params, 'offset': stop})}"
+        previous = None
+        if offset > 0:
+            previous_params = {**params, "offset": max(offset - limit, 0)}
+            previous = f"{path}?{urlencode(previous_params)}"
+        return 200, {
+            collection_name(endpoint): items,
+            "page_meta": {
+                "limit": limit,
+                "offset": offset,
+                "total_count": total,
+                "next": next_link,
+                "previous": previous,
+            },
+        }
+
+    def _matching_indices(
+        self, endpoint: str, params: Dict[str, str]
+    ) -> Optional[List[int]]:
+        filters = [key for key in params if key.endswith("__in")]
+        if not filters:
+            return None
+        wanted = params[filters[0]].split(",")
+        indices = []
+        for value in dict.fromkeys(wanted):
+            digits = value.strip().upper().removeprefix("CHEMBL")
+            if digits.isdigit() and int(digits) < self.settings.total:
+                indices.append(int(digits))
+        return indices
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+
+def _make_handler(server: MockChemblServer) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server API
+            parts = urlsplit(self.path)
+            status, payload = server.respond(parts.path, parse_qs(parts.query))
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            if status == 429:
+                self.send_header("Retry-After", str(server.settings.retry_after))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: Any) -> None:
+            logger.debug(format, *args)
+
+    return Handler
+
+
+__all__ = [
+    "API_PREFIX",
+    "MockChemblServer",
+    "MockSettings",
+    "collection_name",
+    "synthetic_record",
+]
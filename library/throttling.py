@@ -2,47 +2,494 @@
 
 from __future__ import annotations
 
+import json
+import os
+import random
+import threading
 import time
-from typing import Callable
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, Optional, Protocol, TypeVar
+
+try:  # pragma: no cover - platform specific
+    import fcntl  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+    import msvcrt  # type: ignore[import-not-found]
 
 try:  # pragma: no cover - optional dependency
     import requests  # type: ignore[import-not-found]
 except ImportError:  # pragma: no cover - optional dependency
     requests = None  # type: ignore[assignment]
 
+RETRYABLE_STATUSES: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Exponential backoff settings used by :func:`retry_request`.
+
+    The delay before retry *n* (0-based) is ``backoff * 2**n`` capped at
+    *max_backoff*, plus up to ``jitter`` times that delay drawn uniformly at
+    random. A ``Retry-After`` header wins when it asks for a longer wait.
+    """
+
+    retries: int = 3
+    backoff: float = 1.0
+    max_backoff: float = 60.0
+    jitter: float = 0.5
+    statuses: frozenset[int] = RETRYABLE_STATUSES
+    retry_connection_errors: bool = True
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        base = min(self.backoff * (2**attempt), self.max_backoff)
+        if self.jitter:
+            base += random.uniform(0.0, self.jitter * base)
+        if retry_after is not None:
+            return max(retry_after, base)
+        return base
+
+
+class Limiter(Protocol):
+    """Interface shared by the client-side rate limiters."""
+
+    def acquire(self) -> float: ...
+
+    def feedback(self, status: Optional[int]) -> None: ...
+
+
+class RateLimiter:
+    """Space requests at least ``1 / rate`` seconds apart across threads."""
+
+    def __init__(self, rate: float) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+
+    def acquire(self) -> float:
+        """Block until the next request may start; return the time waited."""
+
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + 1.0 / self.rate
+        wait = slot - now
+        if wait > 0:
+            time.sleep(wait)
+        return max(wait, 0.0)
+
+    def feedback(self, status: Optional[int]) -> None:
+        """Receive the outcome of a request; fixed-rate limiters ignore it."""
+
+
+THROTTLE_STATUSES: frozenset[int] = frozenset({429, 503})
+
+
+class TokenBucket:
+    """Token-bucket limiter shared by threads and, optionally, processes.
+
+    Tokens refill at ``rate`` per second up to *capacity*. ``acquire`` takes a
+    token and sleeps when the bucket is empty; the token is reserved before
+    sleeping so waiting callers queue fairly instead of polling.
+
+    When *state_path* is given, the bucket state (tokens, rate and refill
+    timestamp) lives in that JSON file and every update happens under an
+    exclusive lock on ``<state_path>.lock``. All processes using the same path
+    then draw from one bucket.
+
+    The rate adapts with AIMD: a throttling status (429/503) multiplies it by
+    *decrease* (at most once per *cooldown* seconds, so one burst of rejected
+    in-flight requests counts once). Each success adds ``increase / rate``,
+    which raises the rate by about *increase* requests per second for every
+    second of clean traffic. The rate stays within ``[min_rate, max_rate]``.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: Optional[float] = None,
+        *,
+        min_rate: Optional[float] = None,
+        max_rate: Optional[float] = None,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        cooldown: float = 1.0,
+        state_path: str | Path | None = None,
+    ) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        self.capacity = float(capacity) if capacity is not None else max(rate, 1.0)
+        self.min_rate = float(min_rate) if min_rate is not None else rate / 10.0
+        self.max_rate = float(max_rate) if max_rate is not None else rate * 4.0
+        self.increase = float(increase)
+        self.decrease = float(decrease)
+        self.cooldown = float(cooldown)
+        self.state_path = Path(state_path) if state_path is not None else None
+        self._lock = threading.Lock()
+        self._state: Dict[str, float] = {
+            "rate": float(rate),
+            "tokens": self.capacity,
+            "updated": time.time(),
+            "last_decrease": 0.0,
+        }
+        self._metrics: Dict[str, float] = {
+            "acquired": 0,
+            "total_wait": 0.0,
+            "max_wait": 0.0,
+            "throttled": 0,
+            "successes": 0,
+        }
+
+    @property
+    def rate(self) -> float:
+        """Current refill rate in requests per second."""
+
+        with self._locked_state() as state:
+            return state["rate"]
+
+    def acquire(self) -> float:
+        """Take one token, sleeping while the bucket is empty; return the wait."""
+
+        with self._locked_state() as state:
+            self._refill(state)
+            state["tokens"] -= 1.0
+            deficit = -state["tokens"]
+            wait = deficit / state["rate"] if deficit > 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+        with self._lock:
+            self._metrics["acquired"] += 1
+            self._metrics["total_wait"] += wait
+            self._metrics["max_wait"] = max(self._metrics["max_wait"], wait)
+        return wait
+
+    def feedback(self, status: Optional[int]) -> None:
+        """Adapt the rate to the outcome of a request."""
+
+        if status in THROTTLE_STATUSES:
+            with self._locked_state() as state:
+                now = time.time()
+                if now - state.get("last_decrease", 0.0) >= self.cooldown:
+                    self._refill(state)
+                    state["rate"] = max(self.min_rate, state["rate"] * self.decrease)
+                    state["last_decrease"] = now
+            with self._lock:
+                self._metrics["throttled"] += 1
+        elif status is not None and 200 <= status < 400:
+            with self._locked_state() as state:
+                self._refill(state)
+                state["rate"] = min(
+                    self.max_rate, state["rate"] + self.increase / state["rate"]
+                )
+            with self._lock:
+                self._metrics["successes"] += 1
+
+    def metrics(self) -> Dict[str, float]:
+        """Return the current rate and this process's wait statistics."""
+
+        rate = self.rate
+        with self._lock:
+            snapshot = dict(self._metrics)
+        acquired = snapshot["acquired"]
+        snapshot["rate"] = rate
+        snapshot["mean_wait"] = snapshot["total_wait"] / acquired if acquired else 0.0
+        return snapshot
+
+    def _refill(self, state: Dict[str, float]) -> None:
+        now = time.time()
+        elapsed = max(now - state["updated"], 0.0)
+        state["tokens"] = min(self.capacity, state["tokens"] + elapsed * state["rate"])
+        state["updated"] = now
+
+    @contextmanager
+    def _locked_state(self) -> Iterator[Dict[str, float]]:
+        with self._lock:
+            if self.state_path is None:
+                yield self._state
+                return
+            with _file_lock(self.state_path.with_name(self.state_path.name + ".lock")):
+                state = self._read_shared_state()
+                yield state
+                self._write_shared_state(state)
+
+    def _read_shared_state(self) -> Dict[str, float]:
+        assert self.state_path is not None
+        try:
+            loaded: Dict[str, Any] = json.loads(self.state_path.read_text("utf-8"))
+        except (OSError, ValueError):
+            return dict(self._state)
+        state = dict(self._state)
+        state.update({key: float(value) for key, value in loaded.items()})
+        return state
+
+    def _write_shared_state(self, state: Dict[str, float]) -> None:
+        assert self.state_path is not None
+        temporary = self.state_path.with_name(
+            f"{self.state_path.name}.{os.getpid()}.tmp"
+        )
+        temporary.write_text(json.dumps(state), "utf-8")
+        os.replace(temporary, self.state_path)
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as handle:
+        if fcntl is not None:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        else:  # pragma: no cover - Windows
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            else:  # pragma: no cover - Windows
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class HedgePolicy:
+    """Duplicate slow requests and keep whichever copy answers first.
+
+    Latencies of completed requests are kept in a sliding *window*. Once
+    *min_samples* have been seen, a request still running after the
+    *percentile* latency (clamped to ``[min_delay, max_delay]``) gets one
+    duplicate; before that *initial_delay* is used, and ``None`` disables
+    hedging until the window fills. Hedges are capped at *max_fraction* of
+    the primary requests so tail control never adds more than that much load.
+
+    Requests run on a private pool of *max_workers* threads; the losing copy
+    cannot be interrupted, so it finishes in the background and its response
+    is closed. Size the HTTP connection pool with the extra requests in mind.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        *,
+        min_delay: float = 0.05,
+        max_delay: Optional[float] = None,
+        initial_delay: Optional[float] = None,
+        max_fraction: float = 0.05,
+        window: int = 256,
+        min_samples: int = 20,
+        max_workers: int = 32,
+    ) -> None:
+        if not 0 < percentile < 100:
+            raise ValueError("percentile must be between 0 and 100")
+        if max_fraction < 0:
+            raise ValueError("max_fraction must not be negative")
+        self.percentile = float(percentile)
+        self.min_delay = float(min_delay)
+        self.max_delay = max_delay
+        self.initial_delay = initial_delay
+        self.max_fraction = float(max_fraction)
+        self.min_samples = int(min_samples)
+        self.max_workers = max(int(max_workers), 2)
+        self.stats: Dict[str, int] = {"requests": 0, "hedged": 0, "hedge_wins": 0}
+        self._latencies: Deque[float] = deque(maxlen=max(int(window), 1))
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    def delay(self) -> Optional[float]:
+        """Return how long to wait before hedging, or ``None`` to never hedge."""
+
+        with self._lock:
+            samples = sorted(self._latencies)
+        if len(samples) < max(self.min_samples, 1):
+            if self.initial_delay is None:
+                return None
+            value = float(self.initial_delay)
+        else:
+            rank = min(int(len(samples) * self.percentile / 100.0), len(samples) - 1)
+            value = samples[rank]
+        value = max(value, self.min_delay)
+        if self.max_delay is not None:
+            value = min(value, float(self.max_delay))
+        return value
+
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+
+    def run(
+        self, request_fn: Callable[[], T], on_hedge: Optional[Callable[[], None]] = None
+    ) -> T:
+        """Call *request_fn*, hedging it once if it is slower than :meth:`delay`."""
+
+        with self._lock:
+            self.stats["requests"] += 1
+        delay = self.delay()
+        if delay is None:
+            return self._timed(request_fn)
+
+        primary = self._submit(request_fn)
+        done, _ = wait([primary], timeout=delay)
+        if done or not self._reserve_hedge():
+            return primary.result()
+
+        if on_hedge is not None:
+            on_hedge()
+        hedge = self._submit(request_fn)
+        pending = {primary, hedge}
+        errors: Dict[Future[T], BaseException] = {}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                exc = future.exception()
+                if exc is not None:
+                    errors[future] = exc
+                    continue
+                for loser in pending:
+                    loser.add_done_callback(_discard_result)
+                if future is hedge:
+                    with self._lock:
+                        self.stats["hedge_wins"] += 1
+                return future.result()
+        # Both copies failed; surface the primary's error like an unhedged call.
+        raise errors.get(primary) or errors[hedge]
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+    def _reserve_hedge(self) -> bool:
+        with self._lock:
+            if self.stats["hedged"] + 1 > self.max_fraction * self.stats["requests"]:
+                return False
+            self.stats["hedged"] += 1
+            return True
+
+    def _submit(self, request_fn: Callable[[], T]) -> Future[T]:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="chembl-hedge"
+                )
+            executor = self._executor
+        return executor.submit(self._timed, request_fn)
+
+    def _timed(self, request_fn: Callable[[], T]) -> T:
+        started = time.monotonic()
+        result = request_fn()
+        self.record(time.monotonic() - started)
+        return result
+
+
+def _discard_result(future: Future[Any]) -> None:
+    if future.cancelled() or future.exception() is not None:
+        return
+    close = getattr(future.result(), "close", None)
+    if callable(close):
+        close()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Return the delay in seconds encoded by a ``Retry-After`` header."""
+
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max((moment - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
 
 def retry_request(
     request_fn: Callable[[], requests.Response],
     *,
     retries: int = 3,
     backoff: float = 1.0,
+    policy: Optional[RetryPolicy] = None,
+    limiter: Optional[Limiter] = None,
+    on_retry: Optional[Callable[[int, float, BaseException], None]] = None,
 ) -> requests.Response:
-    """Invoke *request_fn* with exponential backoff on throttling errors."""
+    """Invoke *request_fn* with exponential backoff on throttling errors.
+
+    Without an explicit *policy* the legacy ``retries``/``backoff`` arguments
+    apply without jitter. Every attempt first waits for *limiter*, which is
+    told the resulting status code. *on_retry* is called with the attempt
+    number, the chosen delay and the error before each retry sleep.
+    """
 
     if requests is None:  # pragma: no cover - runtime guard
         raise RuntimeError("The 'requests' package is required for retry_request")
 
+    active = policy or RetryPolicy(
+        retries=retries, backoff=backoff, max_backoff=float("inf"), jitter=0.0
+    )
     attempt = 0
     while True:
+        if limiter is not None:
+            limiter.acquire()
         try:
             response = request_fn()
             response.raise_for_status()
-            return response
         except requests.HTTPError as exc:
-            status = exc.response.status_code if exc.response else None
-            if status not in {429, 500, 502, 503, 504}:
+            response = exc.response
+            status = response.status_code if response is not None else None
+            if limiter is not None:
+                limiter.feedback(status)
+            if status not in active.statuses or attempt >= active.retries:
                 raise
-            if attempt >= retries:
+            retry_after = (
+                parse_retry_after(response.headers.get("Retry-After"))
+                if response is not None
+                else None
+            )
+            sleep_for = active.delay(attempt, retry_after)
+            error: BaseException = exc
+            if response is not None:
+                # Release the pooled connection; streamed bodies hold it open.
+                response.close()
+        except (requests.ConnectionError, requests.Timeout) as exc:
+            if limiter is not None:
+                limiter.feedback(None)
+            if not active.retry_connection_errors or attempt >= active.retries:
                 raise
-            sleep_for = backoff * (2 ** attempt)
-            retry_after = exc.response.headers.get("Retry-After") if exc.response else None
-            if retry_after:
-                try:
-                    sleep_for = max(float(retry_after), sleep_for)
-                except ValueError:
-                    pass
-            time.sleep(sleep_for)
-            attempt += 1
-
-
-__all__ = ["retry_request"]
+            sleep_for = active.delay(attempt)
+            error = exc
+        else:
+            if limiter is not None:
+                limiter.feedback(response.status_code)
+            return response
+
+        if on_retry is not None:
+            on_retry(attempt, sleep_for, error)
+        time.sleep(sleep_for)
+        attempt += 1
+
+
+__all__ = [
+    "RETRYABLE_STATUSES",
+    "THROTTLE_STATUSES",
+    "HedgePolicy",
+    "Limiter",
+    "RateLimiter",
+    "RetryPolicy",
+    "TokenBucket",
+    "parse_retry_after",
+    "retry_request",
+]
@@ -1,6 +1,19 @@
 """Domain-specific normalization helpers for ChEMBL datasets."""
 
-from .common import clean_pipe, normalize_pipe, normalize_string, to_text
+from .common import (
+    PipeRules,
+    UniqueValueCache,
+    clean_pipe,
+    compile_pipe_rules,
+    map_unique,
+    normalize_doi,
+    normalize_doi_series,
+    normalize_pipe,
+    normalize_pipe_series,
+    normalize_string,
+    to_text,
+    to_text_series,
+)
 from .activity import normalize_activity, normalize_activity_frame
 from .assay import normalize_assay
 from .document import normalize_document
@@ -8,10 +21,18 @@ from .target import normalize_target
 from .testitem import normalize_testitem
 
 __all__ = [
+    "PipeRules",
+    "UniqueValueCache",
     "clean_pipe",
+    "compile_pipe_rules",
+    "map_unique",
+    "normalize_doi",
+    "normalize_doi_series",
     "normalize_pipe",
+    "normalize_pipe_series",
     "normalize_string",
     "to_text",
+    "to_text_series",
     "normalize_activity",
     "normalize_activity_frame",
     "normalize_assay",
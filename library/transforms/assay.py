@@ -6,7 +6,8 @@ from typing import Dict
 import pandas as pd
 
 from .document import _prepare_activity
-from ..validators import coerce_types, finalize_aggregate_columns
+from ..config import compile_config
+from ..validators import finalize_aggregate_columns, safe_merge
 
 logger = logging.getLogger(__name__)
 
@@ -31,10 +32,12 @@ def normalize_assay(inputs: Dict[str, pd.DataFrame], config: dict) -> pd.DataFra
     logger.info("Starting assay post-processing", extra={"rows": len(assay_df)})
 
     aggregates = _aggregate_assay(activity_df)
-    enriched = assay_df.merge(
+    enriched = safe_merge(
+        assay_df,
         aggregates,
         on="document_chembl_id",
         how="left",
+        suffixes=("_x", "_y"),
     )
     enriched["document_assay_total"] = (
         enriched["document_assay_total"].fillna(0).astype("Int64")
@@ -46,10 +49,10 @@ def normalize_assay(inputs: Dict[str, pd.DataFrame], config: dict) -> pd.DataFra
             columns=[col for col in drop_columns if col in enriched.columns]
         )
 
-    column_types = config.get("pipeline", {}).get("assay", {}).get("type_map", {})
-    typed = coerce_types(enriched, column_types)
+    schema = compile_config(config).schema("assay")
+    typed = schema.plan.apply(enriched, add_missing=False)
 
-    column_order = config.get("pipeline", {}).get("assay", {}).get("column_order", [])
+    column_order = list(schema.column_order)
     if column_order:
         missing = [col for col in column_order if col not in typed.columns]
         if missing:
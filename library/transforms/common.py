@@ -1,14 +1,36 @@
 from __future__ import annotations
 
 import logging
+import re
 import unicodedata
-from typing import Any, Dict, Iterable, Optional
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from itertools import chain
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Hashable, Iterable, Mapping, Optional
 
+import numpy as np
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
 
+PREPARED_REFERENCE_ATTR = "prepared_reference"
+
+
+def mark_prepared(frame: pd.DataFrame) -> pd.DataFrame:
+    """Flag *frame* as an already normalized curation reference."""
+
+    frame.attrs[PREPARED_REFERENCE_ATTR] = True
+    return frame
+
+
+def is_prepared(frame: pd.DataFrame | None) -> bool:
+    """Return ``True`` when *frame* was produced by a reference preparer."""
+
+    return frame is not None and bool(frame.attrs.get(PREPARED_REFERENCE_ATTR))
+
+
 def to_text(value: Any) -> str:
     """Convert *value* to a trimmed lowercase string.
 
@@ -20,10 +42,168 @@ def to_text(value: Any) -> str:
         return ""
     if isinstance(value, float) and pd.isna(value):
         return ""
-    text = str(value)
-    normalized = "".join(ch for ch in text if unicodedata.category(ch)[0] != "C")
-    stripped = normalized.strip()
-    return stripped
+    return _clean_text(str(value))
+
+
+class _ControlCharTable(dict):
+    """``str.translate`` table deleting Unicode control (``C*``) characters.
+
+    Code points are classified lazily on first sight and memoized, so each
+    distinct character costs one :func:`unicodedata.category` call per run.
+    """
+
+    def __missing__(self, codepoint: int) -> Optional[int]:
+        value = None if unicodedata.category(chr(codepoint))[0] == "C" else codepoint
+        self[codepoint] = value
+        return value
+
+
+_CONTROL_CHARS = _ControlCharTable()
+
+
+def _clean_text(text: str) -> str:
+    # Printable ASCII has no control characters, so only strip it.
+    if text.isascii() and text.isprintable():
+        return text.strip()
+    return text.translate(_CONTROL_CHARS).strip()
+
+
+def to_text_series(series: pd.Series, *, lower: bool = False) -> pd.Series:
+    """Vectorized :func:`to_text` returning identical values for *series*.
+
+    Each distinct string is converted once; strings skip the per-character
+    category lookup when they are printable ASCII and otherwise go through a
+    memoized translate table. With *lower* the result is also lowercased in
+    the same pass, matching ``to_text(value).lower()``.
+    """
+
+    cache: Dict[str, str] = {}
+    values: list[str] = []
+    append = values.append
+    for value in series.tolist():
+        if type(value) is str:
+            text = cache.get(value)
+            if text is None:
+                text = _clean_text(value)
+                if lower:
+                    text = text.lower()
+                cache[value] = text
+            append(text)
+        elif value is None or (isinstance(value, float) and value != value):
+            append("")
+        else:
+            # Only strings are memoized: 1, 1.0 and True hash alike.
+            text = _clean_text(str(value))
+            append(text.lower() if lower else text)
+    return pd.Series(
+        np.array(values, dtype=object), index=series.index, name=series.name
+    )
+
+
+class UniqueValueCache:
+    """Bounded LRU cache of ``func(value)`` results for :func:`map_unique`.
+
+    One instance can be shared by several columns (or calls) so values that
+    repeat across them are converted once. Entries are keyed by the function,
+    the value type and the value, so ``1``, ``1.0`` and ``True`` stay apart;
+    pass a named function rather than a fresh ``lambda`` to benefit from it.
+    """
+
+    def __init__(self, maxsize: int = 100_000) -> None:
+        if maxsize < 1:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "evictions": 0}
+        self._entries: OrderedDict[Hashable, Any] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, func: Callable[[Any], Any], value: Any) -> Any:
+        """Return ``func(value)``, computing it only on a cache miss."""
+
+        key = (func, type(value), value)
+        try:
+            result = self._entries[key]
+        except KeyError:
+            self.stats["misses"] += 1
+            result = func(value)
+            self._entries[key] = result
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+            return result
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return result
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+def map_unique(
+    series: pd.Series,
+    func: Callable[[Any], Any],
+    *,
+    na_action: Optional[str] = None,
+    cache: Optional[UniqueValueCache] = None,
+) -> pd.Series:
+    """Return ``series.map(func)`` evaluating *func* once per distinct value.
+
+    The series is factorized, *func* runs over the unique values (through
+    *cache* when given) and the results are broadcast back by code. Missing
+    values are passed to *func* once per null type (``None``, ``NaN``,
+    ``pd.NA``...) or kept as they are with ``na_action="ignore"``, matching
+    :meth:`pandas.Series.map`. Object columns mixing value types are keyed by
+    type as well, since ``1``, ``1.0`` and ``True`` factorize together.
+    """
+
+    if na_action not in (None, "ignore"):
+        raise ValueError(f"na_action must be None or 'ignore', got {na_action!r}")
+
+    codes, uniques = _factorize_typed(series)
+    apply = func if cache is None else lambda value: cache.lookup(func, value)
+
+    mapped = np.empty(len(uniques) + 1, dtype=object)
+    for position, value in enumerate(uniques):
+        mapped[position] = apply(value)
+    result = mapped.take(codes)
+
+    missing = np.flatnonzero(codes == -1)
+    if len(missing):
+        values = series.to_numpy(dtype=object)
+        by_type: Dict[type, Any] = {}
+        for position in missing:
+            value = values[position]
+            if na_action == "ignore":
+                result[position] = value
+                continue
+            kind = type(value)
+            if kind not in by_type:
+                by_type[kind] = apply(value)
+            result[position] = by_type[kind]
+
+    return pd.Series(result, index=series.index, name=series.name).infer_objects()
+
+
+def _factorize_typed(series: pd.Series) -> tuple[np.ndarray, list[Any]]:
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    if series.dtype != object:
+        return codes, list(uniques)
+    if pd.api.types.infer_dtype(uniques, skipna=True) in ("string", "empty"):
+        return codes, list(uniques)
+
+    # Split values that compare equal across types (1 == 1.0 == True).
+    values = series.to_numpy(dtype=object)
+    present = codes >= 0
+    type_codes, kinds = pd.factorize(
+        np.array([type(value) for value in values[present]], dtype=object)
+    )
+    typed_codes, _ = pd.factorize(codes[present] * len(kinds) + type_codes)
+    _, first = np.unique(typed_codes, return_index=True)
+    codes = codes.copy()
+    codes[present] = typed_codes
+    return codes, list(values[present][first])
 
 
 def normalize_string(value: Any, lower: bool = True) -> Any:
@@ -44,6 +224,88 @@ def normalize_string(value: Any, lower: bool = True) -> Any:
     return text
 
 
+DOI_TRIM_CHARS = " .;,:)]}>\"'"
+DOI_PREFIXES: tuple[str, ...] = (
+    "doi:",
+    "https://doi.org/",
+    "http://doi.org/",
+    "https://dx.doi.org/",
+    "http://dx.doi.org/",
+    "doi.org/",
+    "dx.doi.org/",
+)
+DOI_ENCODED_SEPARATORS: tuple[str, ...] = ("%2f", "%2F")
+
+# Alternation is ordered, so the first matching prefix wins as in a loop.
+_DOI_PREFIX = "^(?:" + "|".join(re.escape(prefix) for prefix in DOI_PREFIXES) + ")"
+_DOI_PREFIX_RE = re.compile(_DOI_PREFIX)
+_DOI_ENCODED_RE = re.compile(
+    "|".join(re.escape(encoded) for encoded in DOI_ENCODED_SEPARATORS)
+)
+
+
+def normalize_doi(value: Any) -> Optional[str]:
+    """Return the bare lowercase DOI in *value* or ``None`` when it is invalid.
+
+    URL and ``doi:`` prefixes, surrounding punctuation, spaces and encoded
+    slashes are removed; the result must start with ``10.``, contain a ``/``
+    and be 5-300 characters long.
+    """
+
+    text = to_text(value)
+    if not text:
+        return None
+    compact = _DOI_PREFIX_RE.sub("", text.lower(), count=1).strip(DOI_TRIM_CHARS)
+    compact = _DOI_ENCODED_RE.sub("/", compact.replace(" ", ""))
+    if "/" not in compact or not compact.startswith("10."):
+        return None
+    if not 5 <= len(compact) <= 300:
+        return None
+    return compact
+
+
+def normalize_doi_series(series: pd.Series) -> pd.Series:
+    """Vectorized :func:`normalize_doi`: an object Series with ``None`` gaps.
+
+    Each distinct text is normalized once, so stacking several DOI columns
+    into one Series deduplicates values across them. ASCII values go through
+    Arrow regex kernels; the rare non-ASCII ones use :func:`normalize_doi`.
+    """
+
+    text = to_text_series(series)
+    codes, uniques = pd.factorize(text.to_numpy(dtype=object))
+    normalized = _normalize_doi_values(uniques)
+    return pd.Series(
+        normalized[codes], index=series.index, name=series.name, dtype=object
+    )
+
+
+def _normalize_doi_values(texts: np.ndarray) -> np.ndarray:
+    """Normalize distinct cleaned strings (see :func:`normalize_doi_series`)."""
+
+    values = pd.Series(texts, dtype=pd.StringDtype("pyarrow"))
+    compact = (
+        values.str.lower()
+        .str.replace(_DOI_PREFIX, "", n=1, regex=True)
+        .str.strip(DOI_TRIM_CHARS)
+        .str.replace(" ", "", regex=False)
+    )
+    for encoded in DOI_ENCODED_SEPARATORS:
+        compact = compact.str.replace(encoded, "/", regex=False)
+    lengths = compact.str.len()
+    valid = (
+        compact.str.contains("/", regex=False)
+        & compact.str.startswith("10.")
+        & lengths.between(5, 300)
+    )
+    result = compact.to_numpy(dtype=object)
+    result[~valid.to_numpy(dtype=bool)] = None
+    unicode = np.flatnonzero(~values.str.isascii().to_numpy(dtype=bool))
+    for index in unicode:
+        result[index] = normalize_doi(texts[index])
+    return result
+
+
 def _normalize_token(value: Any, lower: bool = True) -> Optional[str]:
     text = to_text(value)
     if text == "":
@@ -77,48 +339,147 @@ def _prepare_drop_list(drop_list: Optional[Iterable[str]]) -> set[str]:
     return drops
 
 
+@dataclass(frozen=True)
+class PipeRules:
+    """Pre-normalized alias and drop tables for pipe-delimited columns."""
+
+    alias: Mapping[str, Optional[str]] = field(
+        default_factory=lambda: MappingProxyType({})
+    )
+    drop: frozenset[str] = frozenset()
+
+
+EMPTY_PIPE_RULES = PipeRules()
+
+
+def compile_pipe_rules(
+    alias_map: Optional[Dict[str, Optional[str]]] = None,
+    drop_list: Optional[Iterable[str]] = None,
+) -> PipeRules:
+    """Normalize *alias_map* and *drop_list* once for repeated pipe cleaning."""
+
+    if not alias_map and not drop_list:
+        return EMPTY_PIPE_RULES
+    return PipeRules(
+        alias=MappingProxyType(_prepare_alias_map(alias_map)),
+        drop=frozenset(_prepare_drop_list(drop_list)),
+    )
+
+
+def _resolve_pipe_rules(
+    alias_map: Optional[Dict[str, Optional[str]]],
+    drop_list: Optional[Iterable[str]],
+    rules: Optional[PipeRules],
+) -> PipeRules:
+    if rules is not None:
+        return rules
+    return compile_pipe_rules(alias_map, drop_list)
+
+
 def clean_pipe(
     series: pd.Series,
     alias_map: Optional[Dict[str, Optional[str]]] = None,
     drop_list: Optional[Iterable[str]] = None,
     sort: bool = True,
+    *,
+    rules: Optional[PipeRules] = None,
 ) -> pd.Series:
-    """Normalize pipe-delimited strings with aliasing and optional sorting."""
+    """Normalize pipe-delimited strings with aliasing and optional sorting.
 
-    alias_normalized = _prepare_alias_map(alias_map)
-    drop_normalized = _prepare_drop_list(drop_list)
+    Pass pre-compiled *rules* (see :func:`compile_pipe_rules`) to skip
+    normalizing *alias_map* and *drop_list* on every call. Missing and empty
+    values become ``""``.
+    """
 
-    def _process(value: Any) -> str:
-        normalized = _normalize_token(value)
-        if normalized is None:
-            return ""
-        parts = [token for token in normalized.split("|") if token != ""]
-        cleaned: list[str] = []
-        for part in parts:
-            token = _normalize_token(part)
-            if token is None:
-                continue
-            mapped = alias_normalized.get(token, token)
-            if mapped is None:
-                continue
-            if mapped in drop_normalized:
-                continue
-            cleaned.append(mapped)
-        if not cleaned:
-            return ""
+    compiled = _resolve_pipe_rules(alias_map, drop_list, rules)
+    values = _clean_pipe_values(to_text_series(series), compiled, sort)
+    return pd.Series(values, index=series.index, name=series.name).infer_objects()
+
+
+def normalize_pipe_series(
+    series: pd.Series,
+    alias_map: Optional[Dict[str, Optional[str]]] = None,
+    drop_list: Optional[Iterable[str]] = None,
+    sort: bool = True,
+    *,
+    rules: Optional[PipeRules] = None,
+) -> pd.Series:
+    """Vectorized :func:`normalize_pipe` returning identical values for *series*.
+
+    Unlike :func:`clean_pipe`, missing values and values without any token
+    left after aliasing and dropping become ``pd.NA``.
+    """
+
+    compiled = _resolve_pipe_rules(alias_map, drop_list, rules)
+    missing = series.isna().to_numpy()
+    text = to_text_series(series)
+    values = _clean_pipe_values(text, compiled, sort)
+    values[missing | (values == "")] = pd.NA
+    return pd.Series(values, index=series.index, name=series.name, dtype=object)
+
+
+def _clean_pipe_values(text: pd.Series, rules: PipeRules, sort: bool) -> np.ndarray:
+    """Clean every value of *text* (already passed through :func:`to_text`).
+
+    Distinct values are split into a token table of ``(row, token)`` pairs;
+    each distinct raw token is normalized once, aliasing and dropping happen
+    on the distinct normalized tokens, and the table is de-duplicated (keeping
+    the first occurrence or ordering by token) before being joined back per
+    distinct value. Lower-casing and whitespace folding never create or
+    remove ``|``, so normalizing tokens after splitting matches normalizing
+    the whole value first.
+    """
+
+    row_codes, row_values = pd.factorize(text.to_numpy(dtype=object))
+    result = np.full(len(row_values), "", dtype=object)
+    parts = [value.split("|") for value in row_values]
+    rows = np.repeat(
+        np.arange(len(parts)), np.fromiter(map(len, parts), np.int64, len(parts))
+    )
+    flat = np.fromiter(chain.from_iterable(parts), dtype=object, count=len(rows))
+    if len(flat):
+        token_codes, raw_tokens = pd.factorize(flat)
+        final_codes, final_tokens = _resolve_pipe_tokens(raw_tokens, rules)
+        codes = final_codes.take(token_codes)
+        kept = codes >= 0
+        table = pd.DataFrame({"row": rows[kept], "token": codes[kept]})
+        table = table.drop_duplicates(ignore_index=True)
         if sort:
-            cleaned = sorted(dict.fromkeys(cleaned))
-        else:
-            seen: set[str] = set()
-            deduped: list[str] = []
-            for token in cleaned:
-                if token not in seen:
-                    seen.add(token)
-                    deduped.append(token)
-            cleaned = deduped
-        return "|".join(cleaned)
+            ranks = np.empty(len(final_tokens), dtype=np.int64)
+            ranks[sorted(range(len(final_tokens)), key=final_tokens.__getitem__)] = (
+                np.arange(len(final_tokens))
+            )
+            table = table.iloc[np.lexsort((ranks.take(table["token"]), table["row"]))]
+        table_rows = table["row"].to_numpy()
+        if len(table_rows):
+            starts = np.flatnonzero(np.r_[True, table_rows[1:] != table_rows[:-1]])
+            groups = np.split(final_tokens.take(table["token"].to_numpy()), starts[1:])
+            result[table_rows[starts]] = ["|".join(group) for group in groups]
+    return result.take(row_codes)
+
+
+def _resolve_pipe_tokens(
+    raw_tokens: Iterable[str], rules: PipeRules
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the final-token code of each raw token and the final tokens.
+
+    Dropped or empty tokens get code ``-1``.
+    """
 
-    return series.apply(_process)
+    normalized = pd.Series(
+        [" ".join(token.split()).lower() for token in raw_tokens], dtype=object
+    )
+    mapped = normalized
+    if rules.alias:
+        aliased = normalized.isin(list(rules.alias))
+        mapped = normalized.where(~aliased, normalized.map(dict(rules.alias)))
+    valid = (normalized != "") & mapped.notna()
+    if rules.drop:
+        valid &= ~mapped.isin(list(rules.drop))
+    codes = np.full(len(normalized), -1, dtype=np.int64)
+    final_codes, final_tokens = pd.factorize(mapped[valid].to_numpy(dtype=object))
+    codes[valid.to_numpy()] = final_codes
+    return codes, np.asarray(final_tokens, dtype=object)
 
 
 def normalize_pipe(
@@ -126,11 +487,14 @@ def normalize_pipe(
     alias_map: Optional[Dict[str, Optional[str]]] = None,
     drop_list: Optional[Iterable[str]] = None,
     sort: bool = True,
+    *,
+    rules: Optional[PipeRules] = None,
 ) -> Any:
     """Normalize pipe-delimited scalar values with aliasing and de-duplication."""
 
-    alias_normalized = _prepare_alias_map(alias_map)
-    drop_normalized = _prepare_drop_list(drop_list)
+    compiled = _resolve_pipe_rules(alias_map, drop_list, rules)
+    alias_normalized = compiled.alias
+    drop_normalized = compiled.drop
 
     if value is None:
         return pd.NA
@@ -173,4 +537,24 @@ def normalize_pipe(
     return "|".join(cleaned)
 
 
-__all__ = ["to_text", "clean_pipe", "normalize_pipe", "normalize_string"]
+__all__ = [
+    "DOI_ENCODED_SEPARATORS",
+    "DOI_PREFIXES",
+    "DOI_TRIM_CHARS",
+    "EMPTY_PIPE_RULES",
+    "PREPARED_REFERENCE_ATTR",
+    "PipeRules",
+    "clean_pipe",
+    "compile_pipe_rules",
+    "UniqueValueCache",
+    "is_prepared",
+    "map_unique",
+    "mark_prepared",
+    "normalize_doi",
+    "normalize_doi_series",
+    "normalize_pipe",
+    "normalize_pipe_series",
+    "normalize_string",
+    "to_text",
+    "to_text_series",
+]
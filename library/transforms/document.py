@@ -1,28 +1,35 @@
 from __future__ import annotations
 
 import logging
-from collections import Counter
 from typing import Any, Dict, Iterable, Optional
 
+import numpy as np
 import pandas as pd
 
-from .common import clean_pipe, to_text
-from ..validators import coerce_types, ensure_columns
+from .common import (
+    PipeRules,
+    _normalize_doi_values,
+    clean_pipe,
+    is_prepared,
+    map_unique,
+    mark_prepared,
+    to_text,
+    to_text_series,
+)
+from ..config import compile_config
+from ..validators import SchemaPlan, coerce_types, safe_merge
 
 logger = logging.getLogger(__name__)
 
 
-TRIM_CHARS = " .;,:)]}>\"'"
-DOI_PREFIXES: tuple[str, ...] = (
-    "doi:",
-    "https://doi.org/",
-    "http://doi.org/",
-    "https://dx.doi.org/",
-    "http://dx.doi.org/",
-    "doi.org/",
-    "dx.doi.org/",
+# (key, name, column) of each DOI source, in priority order.
+DOI_SOURCES: tuple[tuple[str, str, str], ...] = (
+    ("pm", "PubMed", "PubMed.doi"),
+    ("crossref", "crossref", "crossref.doi"),
+    ("openalex", "OpenAlex", "OpenAlex.doi"),
+    ("chembl", "ChEMBL", "ChEMBL.doi"),
+    ("scholar", "scholar", "scholar.doi"),
 )
-DOI_ENCODED_SEPARATORS: tuple[str, ...] = ("%2f", "%2F")
 
 
 PMID_SOURCES: tuple[str, ...] = (
@@ -100,34 +107,32 @@ def _sanitize_digits(value: Any) -> str:
     return digits
 
 
-def _sanitize_pmid(value: Any) -> Optional[str]:
-    digits = _sanitize_digits(value)
-    return digits or None
-
-
-def _normalize_doi(value: Any) -> Optional[str]:
-    text = to_text(value)
-    if not text:
-        return None
+def _sanitize_pmid_series(series: pd.Series) -> pd.Series:
+    """Column-wise :func:`_sanitize_digits`; empty string when no digits."""
 
-    lowered = text.lower()
-    without_prefix = lowered
-    for prefix in DOI_PREFIXES:
-        if without_prefix.startswith(prefix):
-            without_prefix = without_prefix[len(prefix) :]
-            break
+    text = to_text_series(series).astype(pd.StringDtype("pyarrow"))
+    digits = text.str.replace(r"[^0-9]+", "", regex=True)
+    # ``str.isdigit`` also keeps non-ASCII digits, which the regex drops.
+    unicode = ~text.str.isascii()
+    if unicode.any():
+        digits[unicode] = text[unicode].map(_sanitize_digits)
+    return digits
 
-    trimmed = without_prefix.strip(TRIM_CHARS)
-    compact = trimmed.replace(" ", "")
-    for encoded in DOI_ENCODED_SEPARATORS:
-        compact = compact.replace(encoded, "/")
 
-    if not compact or "/" not in compact or not compact.startswith("10."):
-        return None
-    if not 5 <= len(compact) <= 300:
-        return None
+def _coalesce_pmid(prepared: pd.DataFrame) -> np.ndarray:
+    """First non-empty sanitized PMID across ``PMID_SOURCES``, else ``None``."""
 
-    return compact
+    pmid = np.full(len(prepared), "", dtype=object)
+    for candidate in PMID_SOURCES:
+        if candidate not in prepared.columns:
+            continue
+        pending = pmid == ""
+        if not pending.any():
+            break
+        digits = _sanitize_pmid_series(prepared[candidate]).to_numpy(dtype=object)
+        pmid[pending] = digits[pending]
+    pmid[pmid == ""] = None
+    return pmid
 
 
 def _merge_sources(document_out: pd.DataFrame) -> pd.DataFrame:
@@ -162,68 +167,41 @@ def _merge_sources(document_out: pd.DataFrame) -> pd.DataFrame:
         start = prepared.get("PubMed.StartPage", pd.Series(index=prepared.index))
         end = prepared.get("PubMed.EndPage", pd.Series(index=prepared.index))
         start_text = (
-            start.apply(to_text) if not start.empty else pd.Series("", index=prepared.index)
-        )
+            to_text_series(start) if not start.empty else pd.Series("", index=prepared.index)
+        ).to_numpy(dtype=object)
         end_text = (
-            end.apply(to_text) if not end.empty else pd.Series("", index=prepared.index)
-        )
-
-        def _combine_pages(start_val: str, end_val: str) -> str:
-            if start_val and end_val:
-                return f"{start_val}-{end_val}"
-            if start_val:
-                return start_val
-            if end_val:
-                return end_val
-            return ""
-
-        prepared["page"] = [
-            _combine_pages(s, e)
-            for s, e in zip(start_text.tolist(), end_text.tolist())
-        ]
+            to_text_series(end) if not end.empty else pd.Series("", index=prepared.index)
+        ).to_numpy(dtype=object)
+        has_start = start_text != ""
+        has_end = end_text != ""
+        page = np.where(has_start, start_text, end_text)
+        both = has_start & has_end
+        page[both] = start_text[both] + "-" + end_text[both]
+        prepared["page"] = pd.Series(page, index=prepared.index, dtype=object)
 
     noise_columns = NOISE_COLUMNS.intersection(prepared.columns)
     if noise_columns:
         prepared = prepared.drop(columns=sorted(noise_columns))
 
     if "page" in prepared.columns:
-        prepared["page"] = prepared["page"].map(lambda value: to_text(value))
+        prepared["page"] = to_text_series(prepared["page"])
         prepared["page"] = (
             prepared["page"].str.replace("–", "-", regex=False).str.replace("—", "-", regex=False)
         )
 
     if "authors" in prepared.columns:
-        prepared["authors"] = prepared["authors"].apply(to_text)
+        prepared["authors"] = to_text_series(prepared["authors"])
 
     for column in LOWER_CASE_COLUMNS:
         if column in prepared.columns:
-            prepared[column] = prepared[column].map(lambda value: to_text(value).lower())
-
-    pmid_values: list[Optional[str]] = []
-    for _, row in prepared.iterrows():
-        pmid: Optional[str] = None
-        for candidate in PMID_SOURCES:
-            if candidate not in prepared.columns:
-                continue
-            pmid = _sanitize_pmid(row.get(candidate))
-            if pmid:
-                break
-        pmid_values.append(pmid)
+            prepared[column] = to_text_series(prepared[column], lower=True)
 
-    prepared["PMID"] = pmid_values
+    prepared["PMID"] = _coalesce_pmid(prepared)
     prepared["PMID"] = prepared["PMID"].astype("object")
 
     return prepared
 
 
-def _choose_text(candidates: Iterable[Any]) -> Optional[str]:
-    for value in candidates:
-        text = to_text(value)
-        if text:
-            return text
-    return None
-
-
 def _normalize_page(value: Any) -> Optional[str]:
     text = to_text(value)
     if not text:
@@ -249,196 +227,156 @@ def _parse_int_candidate(value: Any) -> tuple[Optional[int], bool]:
         return (None, True)
 
 
-def _validate_rows(document_df: pd.DataFrame) -> pd.DataFrame:
-    if document_df.empty:
-        return document_df.copy()
+def _text_column(frame: pd.DataFrame, column: str) -> pd.Series:
+    """Return :func:`to_text` of *column*; a missing column reads as ``""``."""
 
-    source_specs = (
-        {"key": "pm", "name": "PubMed", "priority": 0, "column": "PubMed.doi"},
-        {"key": "crossref", "name": "crossref", "priority": 1, "column": "crossref.doi"},
-        {"key": "openalex", "name": "OpenAlex", "priority": 2, "column": "OpenAlex.doi"},
-        {"key": "chembl", "name": "ChEMBL", "priority": 3, "column": "ChEMBL.doi"},
-        {"key": "scholar", "name": "scholar", "priority": 4, "column": "scholar.doi"},
-    )
-    fallback_priority = max(spec["priority"] for spec in source_specs) + 1
-
-    def distinct_preserving(values: list[str]) -> list[str]:
-        seen: set[str] = set()
-        result: list[str] = []
-        for value in values:
-            if value not in seen:
-                seen.add(value)
-                result.append(value)
-        return result
-
-    records: list[dict[str, Any]] = []
-    for _, row in document_df.iterrows():
-        base = row.to_dict()
-
-        sources: list[dict[str, Any]] = []
-        for spec in source_specs:
-            raw_value = row.get(spec["column"])
-            normalized_value = _normalize_doi(raw_value)
-            source_entry = {
-                **spec,
-                "raw": to_text(raw_value),
-                "norm": normalized_value,
-                "valid": normalized_value is not None,
-            }
-            sources.append(source_entry)
+    if column not in frame.columns:
+        return pd.Series("", index=frame.index, dtype=object)
+    return to_text_series(frame[column])
 
-        sources_by_key = {entry["key"]: entry for entry in sources}
-        pm_entry = sources_by_key["pm"]
-        valid_sources = [entry for entry in sources if entry["valid"] and entry["norm"]]
 
-        doi_counts = Counter(entry["norm"] for entry in valid_sources)
+def _first_text(
+    frame: pd.DataFrame, columns: Iterable[str], func: Any = None
+) -> pd.Series:
+    """First non-empty text of *columns* (mapped through *func*), else ``None``."""
 
-        def get_priority_for_doi(doi: Optional[str]) -> int:
-            if not doi:
-                return fallback_priority
-            supporters = [
-                entry["priority"]
-                for entry in valid_sources
-                if entry["norm"] == doi
-            ]
-            return min(supporters) if supporters else fallback_priority
-
-        consensus_doi: Optional[str] = None
-        consensus_support = 0
-        best_rank = fallback_priority
-        for doi_value, count in doi_counts.items():
-            rank = get_priority_for_doi(doi_value)
-            if count > consensus_support or (
-                count == consensus_support and rank < best_rank
-            ):
-                consensus_doi = doi_value
-                consensus_support = count
-                best_rank = rank
-
-        consensus_supporters = [
-            entry
-            for entry in valid_sources
-            if consensus_doi is not None and entry["norm"] == consensus_doi
-        ]
-        consensus_source = (
-            min(consensus_supporters, key=lambda entry: entry["priority"])["name"]
-            if consensus_supporters
-            else None
-        )
+    chosen = pd.Series(None, index=frame.index, dtype=object)
+    for column in columns:
+        text = _text_column(frame, column)
+        if func is not None:
+            text = map_unique(text, func)
+        take = chosen.isna() & (text != "")
+        chosen[take] = text[take]
+    return chosen
 
-        sorted_valid = sorted(valid_sources, key=lambda entry: entry["priority"])
-        if pm_entry["valid"]:
-            selected_doi = pm_entry["norm"]
-            selected_source = pm_entry["name"]
-        elif consensus_support >= 2 and consensus_doi is not None:
-            selected_doi = consensus_doi
-            selected_source = consensus_source
-        elif sorted_valid:
-            selected_doi = sorted_valid[0]["norm"]
-            selected_source = sorted_valid[0]["name"]
-        else:
-            selected_doi = None
-            selected_source = None
-
-        peer_sources = [entry for entry in valid_sources if entry["key"] != "pm"]
-        peer_normalized = [entry["norm"] for entry in peer_sources]
-        has_peer_support = bool(peer_sources)
-        pm_matches_peers = bool(
-            pm_entry["norm"]
-            and any(value == pm_entry["norm"] for value in peer_normalized)
-        )
 
-        invalid_doi = (not pm_entry["valid"] and has_peer_support) or (
-            pm_entry["valid"] and has_peer_support and not pm_matches_peers
-        )
-        if not pm_entry["valid"] and has_peer_support:
-            reason = "pubmed_doi_missing_or_malformed"
-        elif pm_entry["valid"] and has_peer_support and not pm_matches_peers:
-            reason = "pubmed_doi_mismatch_with_sources"
-        elif pm_entry["valid"] and pm_matches_peers:
-            reason = "pubmed_doi_confirmed"
-        else:
-            reason = "insufficient_data"
+def _first_int(
+    frame: pd.DataFrame, columns: Iterable[str]
+) -> tuple[pd.Series, pd.Series]:
+    """Volume/issue fallback: first parsable integer of *columns*.
 
-        same_count = (
-            sum(1 for value in peer_normalized if value == pm_entry["norm"])
-            if pm_entry["norm"]
-            else 0
-        )
+    The invalid flag is set when no column parses and one of them held text
+    that is not an integer.
+    """
 
-        title = _choose_text(
-            [row.get("title"), row.get("crossref.title"), row.get("ChEMBL.title")]
-        )
-        abstract = _choose_text([row.get("abstract"), row.get("ChEMBL.abstract")])
-        page_candidates = [
-            _normalize_page(row.get("page")),
-            _normalize_page(row.get("crossref.page")),
-            _normalize_page(row.get("ChEMBL.page")),
-        ]
-        page = _choose_text(page_candidates)
-
-        new_volume: Optional[int] = None
-        invalid_volume = False
-        for candidate in (row.get("volume"), row.get("ChEMBL.volume")):
-            parsed, invalid = _parse_int_candidate(candidate)
-            if parsed is not None:
-                new_volume = parsed
-                invalid_volume = False
-                break
-            invalid_volume = invalid_volume or invalid
-
-        new_issue: Optional[int] = None
-        invalid_issue = False
-        for candidate in (row.get("issue"), row.get("ChEMBL.issue")):
-            parsed, invalid = _parse_int_candidate(candidate)
-            if parsed is not None:
-                new_issue = parsed
-                invalid_issue = False
-                break
-            invalid_issue = invalid_issue or invalid
+    value = pd.Series(None, index=frame.index, dtype=object)
+    invalid = pd.Series(False, index=frame.index)
+    for column in columns:
+        parsed = map_unique(_text_column(frame, column), _parse_int_candidate)
+        numbers, bad = zip(*parsed.tolist(), strict=True)
+        number = pd.Series(numbers, index=frame.index, dtype=object)
+        pending = value.isna()
+        take = pending & number.notna()
+        value[take] = number[take]
+        invalid |= pending & np.array(bad)
+    return value, invalid & value.isna()
 
-        records.append(
-            {
-                **base,
-                "doi_same_count": same_count,
-                "invalid_doi": invalid_doi,
-                "reason": reason,
-                "selected_doi": selected_doi,
-                "selected_source": selected_source,
-                "consensus_doi": consensus_doi,
-                "consensus_support": consensus_support,
-                "pm_doi_norm": pm_entry["norm"],
-                "pm_valid": pm_entry["valid"],
-                "chembl_doi_norm": sources_by_key["chembl"]["norm"],
-                "chembl_valid": sources_by_key["chembl"]["valid"],
-                "scholar_doi_norm": sources_by_key["scholar"]["norm"],
-                "scholar_valid": sources_by_key["scholar"]["valid"],
-                "crossref_doi_norm": sources_by_key["crossref"]["norm"],
-                "crossref_valid": sources_by_key["crossref"]["valid"],
-                "openalex_doi_norm": sources_by_key["openalex"]["norm"],
-                "openalex_valid": sources_by_key["openalex"]["valid"],
-                "pm_doi_raw": pm_entry["raw"],
-                "chembl_doi_raw": sources_by_key["chembl"]["raw"],
-                "scholar_doi_raw": sources_by_key["scholar"]["raw"],
-                "crossref_doi_raw": sources_by_key["crossref"]["raw"],
-                "openalex_doi_raw": sources_by_key["openalex"]["raw"],
-                "peers_valid_distinct": len(
-                    distinct_preserving(
-                        [entry["norm"] for entry in valid_sources if entry["norm"]]
-                    )
-                ),
-                "new_title": title,
-                "new_abstract": abstract,
-                "new_page": page,
-                "new_volume": new_volume,
-                "invalid_volume": invalid_volume,
-                "new_issue": new_issue,
-                "invalid_issue": invalid_issue,
-                "PMID_for_validation": row.get("PMID"),
-            }
-        )
 
-    return pd.DataFrame.from_records(records)
+def _pick(frame: pd.DataFrame, columns: pd.Series) -> pd.Series:
+    """Return ``frame.loc[row, columns[row]]`` for every row."""
+
+    positions = frame.columns.get_indexer(columns)
+    values = frame.to_numpy()[np.arange(len(frame)), positions]
+    return pd.Series(values, index=frame.index, dtype=object)
+
+
+def _validate_rows(document_df: pd.DataFrame) -> pd.DataFrame:
+    if document_df.empty:
+        return document_df.copy()
+
+    frame = document_df.reset_index(drop=True)
+    keys = [key for key, _, _ in DOI_SOURCES]
+    names = {key: name for key, name, _ in DOI_SOURCES}
+    raw = pd.DataFrame(
+        {key: _text_column(frame, column) for key, _, column in DOI_SOURCES}
+    )
+    # Normalize each distinct DOI text once across all sources.
+    codes, uniques = pd.factorize(raw.to_numpy().ravel())
+    norm = pd.DataFrame(
+        _normalize_doi_values(uniques)[codes].reshape(raw.shape), columns=keys
+    )
+    valid = norm.notna()
+
+    # Per source: how many sources report its DOI, and whether it is the
+    # highest-priority source to do so (each distinct DOI votes once).
+    support = pd.DataFrame(0, index=frame.index, columns=keys)
+    first_seen = valid.copy()
+    for position, key in enumerate(keys):
+        for other in keys:
+            support[key] += norm[other].eq(norm[key])
+        for earlier in keys[:position]:
+            first_seen[key] &= ~norm[earlier].eq(norm[key])
+    support = support.where(valid, 0)
+
+    # Ties go to the DOI reported first in priority order (idxmax keeps the
+    # first maximum); rows without a valid DOI have no consensus.
+    votes = support.where(first_seen, -1)
+    best = votes.idxmax(axis=1)
+    consensus_support = votes.max(axis=1).clip(lower=0)
+    has_consensus = consensus_support > 0
+    consensus_doi = _pick(norm, best).where(has_consensus, None)
+
+    # PubMed wins when valid, then a consensus of two or more sources, then
+    # the first valid source in priority order.
+    any_valid = valid.any(axis=1)
+    use_consensus = ~valid["pm"] & (consensus_support >= 2)
+    selected = best.where(use_consensus, valid.idxmax(axis=1))
+    selected_doi = _pick(norm, selected)
+    selected_source = selected.map(names).where(any_valid, None)
+
+    peers_valid = valid.drop(columns="pm").any(axis=1)
+    same_count = (support["pm"] - 1).clip(lower=0)
+    missing = ~valid["pm"] & peers_valid
+    mismatch = valid["pm"] & peers_valid & (same_count == 0)
+    reason = np.select(
+        [missing, mismatch, same_count > 0],
+        [
+            "pubmed_doi_missing_or_malformed",
+            "pubmed_doi_mismatch_with_sources",
+            "pubmed_doi_confirmed",
+        ],
+        default="insufficient_data",
+    )
+
+    new_volume, invalid_volume = _first_int(frame, ("volume", "ChEMBL.volume"))
+    new_issue, invalid_issue = _first_int(frame, ("issue", "ChEMBL.issue"))
+
+    derived: Dict[str, Any] = {
+        "doi_same_count": same_count,
+        "invalid_doi": missing | mismatch,
+        "reason": pd.Series(reason, index=frame.index),
+        "selected_doi": selected_doi,
+        "selected_source": selected_source,
+        "consensus_doi": consensus_doi,
+        "consensus_support": consensus_support,
+    }
+    report_keys = ("pm", "chembl", "scholar", "crossref", "openalex")
+    for key in report_keys:
+        derived[f"{key}_doi_norm"] = norm[key]
+        derived[f"{key}_valid"] = valid[key]
+    for key in report_keys:
+        derived[f"{key}_doi_raw"] = raw[key]
+    derived.update(
+        {
+            "peers_valid_distinct": first_seen.sum(axis=1),
+            "new_title": _first_text(
+                frame, ("title", "crossref.title", "ChEMBL.title")
+            ),
+            "new_abstract": _first_text(frame, ("abstract", "ChEMBL.abstract")),
+            "new_page": _first_text(
+                frame,
+                ("page", "crossref.page", "ChEMBL.page"),
+                lambda value: to_text(_normalize_page(value)),
+            ),
+            "new_volume": new_volume,
+            "invalid_volume": invalid_volume,
+            "new_issue": new_issue,
+            "invalid_issue": invalid_issue,
+            "PMID_for_validation": frame.get("PMID"),
+        }
+    )
+    # Derived values overwrite same-named input columns in place.
+    return frame.assign(**derived)
 
 
 def _coalesce_text(target: pd.Series, fallback: pd.Series) -> pd.Series:
@@ -699,8 +637,7 @@ def _aggregate_activity(
         "assay_chembl_id",
         "molecule_chembl_id",
     ]
-    activity = ensure_columns(activity.copy(), required_columns, ACTIVITY_SCHEMA)
-    activity = coerce_types(activity, ACTIVITY_SCHEMA)
+    activity = SchemaPlan.compile(ACTIVITY_SCHEMA, required_columns).apply(activity)
     activity = activity[activity["document_chembl_id"].notna()]
 
     base_counts = (
@@ -738,9 +675,7 @@ def _aggregate_activity(
     aggregated = aggregated.join(testitem_counts.rename("n_testitem"), how="left")
     aggregated = aggregated.rename_axis("document_chembl_id").reset_index()
 
-    thresholds_typed = coerce_types(
-        thresholds, {"N": "Int64", "K_min_significant": "Int64"}
-    )
+    thresholds_typed = _prepare_citation_thresholds(thresholds)
     aggregated = aggregated.merge(
         thresholds_typed.rename(columns={"N": "n_activity"}),
         on="n_activity",
@@ -775,21 +710,15 @@ def _aggregate_activity(
     return aggregated
 
 
-def _merge_document_reference(
-    document: pd.DataFrame, reference: pd.DataFrame
-) -> pd.DataFrame:
-    if document.empty or reference.empty:
-        return document.copy()
+def _prepare_document_reference(reference: pd.DataFrame) -> pd.DataFrame:
+    """Sanitize ``pubmed_id`` keys and keep only the columns used for merging."""
 
-    if "PMID" not in document.columns:
-        return document.copy()
+    if is_prepared(reference) or "pubmed_id" not in reference.columns:
+        return reference
 
     prepared_reference = reference.copy()
-    if "pubmed_id" not in prepared_reference.columns:
-        return document.copy()
-
-    prepared_reference["pubmed_id"] = prepared_reference["pubmed_id"].map(
-        _sanitize_digits
+    prepared_reference["pubmed_id"] = map_unique(
+        prepared_reference["pubmed_id"], _sanitize_digits
     )
     prepared_reference = prepared_reference.replace({"pubmed_id": {"": pd.NA}})
     prepared_reference = prepared_reference.dropna(subset=["pubmed_id"])
@@ -804,10 +733,35 @@ def _merge_document_reference(
         if column in prepared_reference.columns:
             required_columns.append(column)
     prepared_reference = prepared_reference.loc[:, required_columns]
+    return mark_prepared(prepared_reference)
+
+
+def _prepare_citation_thresholds(thresholds: pd.DataFrame) -> pd.DataFrame:
+    if is_prepared(thresholds):
+        return thresholds
+    typed = coerce_types(thresholds, {"N": "Int64", "K_min_significant": "Int64"})
+    return mark_prepared(typed)
+
+
+def _merge_document_reference(
+    document: pd.DataFrame, reference: pd.DataFrame
+) -> pd.DataFrame:
+    if document.empty or reference.empty:
+        return document.copy()
+
+    if "PMID" not in document.columns:
+        return document.copy()
+
+    prepared_reference = _prepare_document_reference(reference)
+    if "pubmed_id" not in prepared_reference.columns:
+        return document.copy()
 
     document_prepared = document.copy()
-    document_prepared["_pmid_key"] = document_prepared["PMID"].map(_sanitize_digits)
-    merged = document_prepared.merge(
+    document_prepared["_pmid_key"] = map_unique(
+        document_prepared["PMID"], _sanitize_digits
+    )
+    merged = safe_merge(
+        document_prepared,
         prepared_reference,
         how="left",
         left_on="_pmid_key",
@@ -852,26 +806,19 @@ def _merge_document_reference(
     return merged
 
 
-def _apply_classification_rules(df: pd.DataFrame, config: dict) -> pd.DataFrame:
-    rules = (
-        config.get("pipeline", {}).get("document", {}).get("classification_rules", [])
-    )
+def _apply_classification_rules(
+    df: pd.DataFrame, rules: Iterable[tuple[str, PipeRules]]
+) -> pd.DataFrame:
+    rules = tuple(rules)
     if not rules:
         return df
     result = df.copy()
-    for rule in rules:
-        column = rule.get("column")
+    # Rules run in configuration order; several may target the same column.
+    for column, column_rules in rules:
         if column not in result.columns:
             continue
-        alias_map = rule.get("alias")
-        drop_list = rule.get("drop")
         logger.debug("Normalizing pipe column", extra={"column": column})
-        result[column] = clean_pipe(
-            result[column],
-            alias_map=alias_map,
-            drop_list=drop_list,
-            sort=False,
-        )
+        result[column] = clean_pipe(result[column], sort=False, rules=column_rules)
     return result
 
 
@@ -886,29 +833,31 @@ def _resolve_document_id_column(document_df: pd.DataFrame) -> Optional[str]:
         if candidate in document_df.columns:
             return candidate
     return None
-def _compute_review(row: pd.Series, base_weight: int, threshold: float) -> bool:
-    pub_type = to_text(row.get("PubMed.publication_type", ""))
-    scholar_type = to_text(row.get("scholar.PublicationTypes", ""))
-    openalex_type = to_text(row.get("OpenAlex.publication_type", ""))
-    openalex_cross = to_text(row.get("OpenAlex.crossref_type", ""))
-    base_review = bool(row.get("review", False))
-    n_responses = row.get("n_responces", 1)
-
-    def contains_review(value: str) -> bool:
-        return "review" in value
-
-    vote_score = (
-        int(contains_review(pub_type))
-        + int(scholar_type == "review")
-        + int(openalex_type == "review")
-        + int(openalex_cross == "review")
-        + (base_weight * int(base_review))
+def _compute_review(
+    frame: pd.DataFrame, base_weight: int, threshold: float
+) -> pd.Series:
+    """Flag reviews by publication-type votes per response, or the base flag."""
+
+    base_review = frame["review"].fillna(False).astype(bool)
+    votes = (
+        _text_column(frame, "PubMed.publication_type")
+        .str.contains("review", regex=False)
+        .astype(int)
+        + _text_column(frame, "scholar.PublicationTypes").eq("review")
+        + _text_column(frame, "OpenAlex.publication_type").eq("review")
+        + _text_column(frame, "OpenAlex.crossref_type").eq("review")
+        + base_weight * base_review
     )
-    normalized_score = vote_score / n_responses if n_responses else 0
-    return bool(base_review or normalized_score > threshold)
+    if "n_responces" in frame.columns:
+        responses = frame["n_responces"].astype("float64")
+    else:
+        responses = pd.Series(1.0, index=frame.index)
+    score = (votes / responses).where(responses != 0, 0.0)
+    return base_review | (score > threshold)
 
 
 def normalize_document(inputs: Dict[str, pd.DataFrame], config: dict) -> pd.DataFrame:
+    compiled = compile_config(config)
     document_df = inputs.get("document", pd.DataFrame()).copy()
     document_reference_df = inputs.get("document_reference", pd.DataFrame()).copy()
     if "document_out" in inputs:
@@ -958,11 +907,13 @@ def normalize_document(inputs: Dict[str, pd.DataFrame], config: dict) -> pd.Data
             )
             aggregates_key = document_id_column
 
-        merged = document_df.merge(
+        merged = safe_merge(
+            document_df,
             aggregates,
             left_on=document_id_column,
             right_on=aggregates_key,
             how="left",
+            suffixes=("_x", "_y"),
         )
 
         if document_id_column != "document_chembl_id":
@@ -979,7 +930,7 @@ def normalize_document(inputs: Dict[str, pd.DataFrame], config: dict) -> pd.Data
             "significant_citations_fraction"
         ].astype("boolean")
 
-    normalized = _apply_classification_rules(merged, config)
+    normalized = _apply_classification_rules(merged, compiled.rules("document"))
 
     review_cfg = document_cfg.get("review", {})
     base_weight = int(review_cfg.get("base_weight", 2))
@@ -991,18 +942,14 @@ def normalize_document(inputs: Dict[str, pd.DataFrame], config: dict) -> pd.Data
     normalized["review"] = normalized["review"].fillna(False).astype("boolean")
     if response_columns:
         response_frame = normalized.reindex(columns=response_columns, fill_value="")
-        response_count = response_frame.apply(lambda column: column.map(to_text)).ne("").sum(
-            axis=1
-        )
+        response_count = response_frame.apply(to_text_series).ne("").sum(axis=1)
     else:
         response_count = pd.Series(0, index=normalized.index)
 
     normalized["n_responces"] = (
         base_weight + response_count
     ).astype("Int64")
-    normalized["review"] = normalized.apply(
-        lambda row: _compute_review(row, base_weight, threshold), axis=1
-    )
+    normalized["review"] = _compute_review(normalized, base_weight, threshold)
     normalized["is_experimental"] = ~normalized["review"].astype(bool)
 
     if REMOVED_OUTPUT_COLUMNS:
@@ -1020,38 +967,23 @@ def normalize_document(inputs: Dict[str, pd.DataFrame], config: dict) -> pd.Data
     if rename_map:
         normalized = normalized.rename(columns=rename_map)
 
-    column_types = document_cfg.get("type_map", {})
-    column_order = document_cfg.get("column_order", [])
-    required_columns: set[str] = set(column_types.keys()) | set(column_order)
-    if required_columns:
-        normalized = ensure_columns(normalized, required_columns, column_types)
-
-
-    typed = coerce_types(normalized, column_types)
+    schema = compiled.schema("document")
+    typed = schema.plan.apply(normalized)
 
     formatters = document_cfg.get("formatters", {})
     zero_pad = formatters.get("zero_pad", {})
     for column, width in zero_pad.items():
         if column in typed.columns:
-            typed[column] = (
-                typed[column]
-                .astype("string")
-                .fillna("")
-                .map(
-                    lambda value, width=int(width): value.zfill(width)
-                    if value != ""
-                    else value
-                )
-                .astype("string")
-            )
+            typed[column] = map_unique(
+                typed[column].astype("string").fillna(""),
+                lambda value, width=int(width): value.zfill(width)
+                if value != ""
+                else value,
+            ).astype("string")
 
 
-    if column_order:
-        typed = ensure_columns(typed, column_order, column_types)
-        missing = [col for col in column_order if col not in typed.columns]
-        if missing:
-            raise ValueError(f"Document output is missing columns: {missing}")
-        typed = typed.loc[:, column_order]
+    if schema.column_order:
+        typed = typed.loc[:, list(schema.column_order)]
 
     return typed
 
@@ -7,8 +7,9 @@ from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import pandas as pd
 
-from .common import clean_pipe
-from ..validators import coerce_types, deduplicate, ensure_columns
+from .common import EMPTY_PIPE_RULES, PipeRules, clean_pipe, map_unique
+from ..config import compile_config
+from ..validators import deduplicate
 
 logger = logging.getLogger(__name__)
 
@@ -235,30 +236,26 @@ def normalize_target(inputs: Dict[str, pd.DataFrame], config: dict) -> pd.DataFr
 
     logger.info("Starting target post-processing", extra={"rows": len(target_df)})
 
+    compiled = compile_config(config)
+    taxonomy = compiled.lookup("taxonomy") or EMPTY_PIPE_RULES
+
     target_df = _enrich_name_columns(target_df)
-    target_df = _enrich_ec_annotations(target_df)
+    target_df = _enrich_ec_annotations(target_df, taxonomy)
     target_df = _enrich_protein_class_predictions(target_df)
 
     if "synonyms" in target_df.columns:
         target_df["synonyms"] = clean_pipe(
             target_df["synonyms"],
-            alias_map=None,
-            drop_list=None,
             sort=False,
+            rules=EMPTY_PIPE_RULES,
         )
 
-    output_columns = (
-        config.get("pipeline", {}).get("target", {}).get("output_columns", [])
+    schema = compiled.schema("target")
+    typed = schema.plan.apply(
+        target_df,
+        add_missing=bool(schema.column_order),
+        select=True,
     )
-    type_map = config.get("pipeline", {}).get("target", {}).get("type_map", {})
-
-    if output_columns:
-        target_df = ensure_columns(target_df, output_columns, type_map)
-
-    typed = coerce_types(target_df, type_map)
-
-    if output_columns:
-        typed = typed.loc[:, output_columns]
 
     if "target_chembl_id" in typed.columns:
         typed = deduplicate(typed, ["target_chembl_id"])
@@ -298,10 +295,11 @@ def _enrich_name_columns(df: pd.DataFrame) -> pd.DataFrame:
     )
 
     if "gene_symbol_list" in result.columns:
-        result["gene_symbol_list"] = result["gene_symbol_list"].apply(
+        result["gene_symbol_list"] = map_unique(
+            result["gene_symbol_list"],
             lambda value: _strip_brackets(value).lower()
             if isinstance(value, str)
-            else _strip_brackets(value)
+            else _strip_brackets(value),
         )
 
     synonym_columns = [
@@ -312,8 +310,8 @@ def _enrich_name_columns(df: pd.DataFrame) -> pd.DataFrame:
     ]
 
     if "target_components" in result.columns:
-        result["_component_synonyms"] = result["target_components"].apply(
-            _extract_component_descriptions
+        result["_component_synonyms"] = map_unique(
+            result["target_components"], _extract_component_descriptions
         )
         synonym_columns.append("_component_synonyms")
 
@@ -328,34 +326,36 @@ def _enrich_name_columns(df: pd.DataFrame) -> pd.DataFrame:
     return result
 
 
-def _enrich_ec_annotations(df: pd.DataFrame) -> pd.DataFrame:
+def _enrich_ec_annotations(
+    df: pd.DataFrame, taxonomy: PipeRules = EMPTY_PIPE_RULES
+) -> pd.DataFrame:
     result = df.copy()
 
     if result.empty:
         return result
 
     if "reaction_ec_numbers" in result.columns:
-        result["reaction_ec_numbers"] = result["reaction_ec_numbers"].apply(
-            lambda value: _join_pipe_tokens(_split_pipe(value))
+        result["reaction_ec_numbers"] = map_unique(
+            result["reaction_ec_numbers"],
+            lambda value: _join_pipe_tokens(_split_pipe(value)),
         )
     else:
         result["reaction_ec_numbers"] = ""
 
-    result["cellularity"] = result.apply(
-        lambda row: _classify_cellularity(
-            row.get("lineage_superkingdom"),
-            _candidate_lineage_values(
-                [
-                    row.get("lineage_phylum"),
-                    row.get("lineage_class"),
-                ]
-            ),
-        ),
-        axis=1,
-    )
+    lineage = _normalize_lineage_columns(result, taxonomy)
+    result["cellularity"] = [
+        _classify_cellularity(superkingdom, _candidate_lineage_values([phylum, klass]))
+        for superkingdom, phylum, klass in zip(
+            lineage["lineage_superkingdom"],
+            lineage["lineage_phylum"],
+            lineage["lineage_class"],
+            strict=True,
+        )
+    ]
 
-    result["multifunctional_enzyme"] = result["reaction_ec_numbers"].apply(
-        lambda value: "true" if len(_extract_ec_majors(value)) > 1 else "false"
+    result["multifunctional_enzyme"] = map_unique(
+        result["reaction_ec_numbers"],
+        lambda value: "true" if len(_extract_ec_majors(value)) > 1 else "false",
     )
 
     return result
@@ -695,6 +695,43 @@ def _combine_synonyms(row: pd.Series, columns: Sequence[str]) -> str:
     return "|".join(deduped)
 
 
+LINEAGE_COLUMNS: tuple[str, ...] = (
+    "lineage_superkingdom",
+    "lineage_phylum",
+    "lineage_class",
+)
+
+
+def _normalize_lineage_columns(
+    df: pd.DataFrame, taxonomy: PipeRules
+) -> Dict[str, List[Any]]:
+    """Normalize lineage columns once per distinct value through *taxonomy*.
+
+    Values mapped to ``None`` or listed in the drop table become empty strings
+    and are therefore ignored by :func:`_classify_cellularity`.
+    """
+
+    normalized: Dict[str, List[Any]] = {}
+    for column in LINEAGE_COLUMNS:
+        if column not in df.columns:
+            normalized[column] = [None] * len(df)
+            continue
+        codes, uniques = pd.factorize(df[column], use_na_sentinel=True)
+        mapped = [_lookup_taxon(value, taxonomy) for value in uniques]
+        normalized[column] = [mapped[code] if code >= 0 else None for code in codes]
+    return normalized
+
+
+def _lookup_taxon(value: Any, taxonomy: PipeRules) -> str:
+    key = " ".join(_normalize_taxon_value(value).split())
+    if not key:
+        return ""
+    mapped = taxonomy.alias.get(key, key)
+    if mapped is None or mapped in taxonomy.drop:
+        return ""
+    return mapped
+
+
 def _classify_cellularity(superkingdom: Any, candidates: Sequence[Any]) -> str:
     sk = _normalize_taxon_value(superkingdom)
 
@@ -9,11 +9,17 @@ import pandas as pd
 #             2024-10-05 — добавлен справочник для подстановки all_names/nstereo.
 #             2024-10-10 — синхронизированы агрегации, нормализация текстов и проверка invalid_record.
 #             2024-10-19 — убраны документные агрегаты из итогового набора данных.
-from .common import normalize_pipe, normalize_string, to_text
-from ..validators import (
-    coerce_types,
-    ensure_columns,
+from .common import (
+    EMPTY_PIPE_RULES,
+    is_prepared,
+    map_unique,
+    mark_prepared,
+    normalize_pipe_series,
+    normalize_string,
+    to_text,
 )
+from ..config import compile_config
+from ..validators import SchemaPlan, coerce_types
 
 logger = logging.getLogger(__name__)
 
@@ -24,7 +30,7 @@ def _compute_unknown_chirality(series: pd.Series, reference: int) -> pd.Series:
             return False
         return bool((int(value) - reference) != 0)
 
-    return series.apply(_transform)
+    return map_unique(series, _transform)
 
 
 def _prepare_reference(reference_df: pd.DataFrame | None) -> pd.DataFrame:
@@ -33,15 +39,16 @@ def _prepare_reference(reference_df: pd.DataFrame | None) -> pd.DataFrame:
         "all_names": "string",
         "nstereo": "Int64",
     }
+    if is_prepared(reference_df):
+        return reference_df
     if reference_df is None or reference_df.empty:
         return pd.DataFrame(columns=list(schema.keys()))
 
-    completed = ensure_columns(reference_df, list(schema.keys()), schema)
-    typed = coerce_types(completed, schema)
+    typed = SchemaPlan.compile(schema, schema.keys()).apply(reference_df)
     filtered = typed[typed["molecule_chembl_id"].notna()].copy()
     selected = filtered.loc[:, list(schema.keys())]
     deduped = selected.drop_duplicates(subset=["molecule_chembl_id"])
-    return deduped.reset_index(drop=True)
+    return mark_prepared(deduped.reset_index(drop=True))
 
 
 def _apply_reference(
@@ -99,19 +106,19 @@ def normalize_testitem(inputs: Dict[str, pd.DataFrame], config: dict) -> pd.Data
     typed = coerce_types(testitem_df, base_schema)
     typed = _apply_reference(typed, reference_df)
 
-    cleaning_config = config.get("cleaning", {})
-    sort_pipes = bool(cleaning_config.get("sort_pipes", True))
+    compiled = compile_config(config)
+    sort_pipes = compiled.sort_pipes
     pipeline_testitem = config.get("pipeline", {}).get("testitem", {})
 
     if "pref_name" in typed.columns:
-        typed["pref_name"] = typed["pref_name"].map(normalize_string).astype("string")
+        typed["pref_name"] = map_unique(typed["pref_name"], normalize_string).astype(
+            "string"
+        )
 
     if "all_names" in typed.columns:
-        typed["all_names"] = (
-            typed["all_names"]
-            .map(lambda value: normalize_pipe(value, sort=sort_pipes))
-            .astype("string")
-        )
+        typed["all_names"] = normalize_pipe_series(
+            typed["all_names"], sort=sort_pipes, rules=EMPTY_PIPE_RULES
+        ).astype("string")
 
     if "document_chembl_id" not in typed.columns:
         typed["document_chembl_id"] = pd.Series(
@@ -188,7 +195,7 @@ def normalize_testitem(inputs: Dict[str, pd.DataFrame], config: dict) -> pd.Data
 
     if "standard_inchi_key" in typed.columns:
         typed["skeleton_inchi_key"] = (
-            typed["standard_inchi_key"].map(_compute_skeleton).astype("string")
+            map_unique(typed["standard_inchi_key"], _compute_skeleton).astype("string")
         )
     else:
         typed["skeleton_inchi_key"] = pd.Series(
@@ -209,20 +216,8 @@ def normalize_testitem(inputs: Dict[str, pd.DataFrame], config: dict) -> pd.Data
         columns=[col for col in columns_to_remove if col in processed.columns]
     )
 
-    column_types = pipeline_testitem.get("type_map", {})
-    column_order = pipeline_testitem.get("column_order", [])
-
-    required_columns = column_order or list(column_types.keys())
-    completed = ensure_columns(processed, required_columns, column_types)
-    typed_result = coerce_types(completed, column_types)
-
-    if column_order:
-        missing = [col for col in column_order if col not in typed_result.columns]
-        if missing:
-            raise ValueError(f"Testitem output is missing columns: {missing}")
-        typed_result = typed_result.loc[:, column_order]
-
-    return typed_result
+    schema = compiled.schema("testitem")
+    return schema.plan.apply(processed, select=True)
 
 
 __all__ = ["normalize_testitem"]
@@ -1,37 +1,455 @@
+"""Single-pass data quality checks for frames and chunk streams.
+
+Checks are declared up front (:class:`Unique`, :class:`NotNull`,
+:class:`Sorted`, :class:`References`) and executed together by
+:class:`ValidationRunner`, which walks a frame or an iterable of chunks once.
+Every check keeps O(1) state per chunk boundary plus, for uniqueness, a sorted
+array of 64-bit key hashes, and the report stays bounded: each result holds a
+failure count and a fixed-size uniform sample of offending rows.
+"""
+
 from __future__ import annotations
 
 import logging
-from typing import Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_bool_dtype, is_integer_dtype, is_numeric_dtype
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SAMPLE_SIZE = 5
+
+
+@dataclass(frozen=True)
+class Unique:
+    """Rows must not repeat the key formed by *columns*."""
+
+    columns: tuple[str, ...]
+
+    @property
+    def name(self) -> str:
+        return f"unique({', '.join(self.columns)})"
+
+    def _start(self) -> "_UniqueState":
+        return _UniqueState(self)
+
+
+@dataclass(frozen=True)
+class NotNull:
+    """*column* must not contain missing values."""
+
+    column: str
+
+    @property
+    def name(self) -> str:
+        return f"not_null({self.column})"
+
+    def _start(self) -> "_NotNullState":
+        return _NotNullState(self)
+
+
+@dataclass(frozen=True)
+class Sorted:
+    """Rows must be ordered by *columns* (missing values last)."""
+
+    columns: tuple[str, ...]
+    ascending: bool = True
+
+    @property
+    def name(self) -> str:
+        return f"sorted({', '.join(self.columns)})"
+
+    def _start(self) -> "_SortedState":
+        return _SortedState(self)
+
+
+@dataclass(frozen=True)
+class References:
+    """Non-null values of *column* must exist in *reference*.
+
+    *reference* is either a collection of allowed values, looked up through a
+    hash index, or a :class:`BloomFilter` for reference sets too large to
+    hold (which may let a small share of missing values through).
+    """
+
+    column: str
+    reference: Any = field(compare=False, hash=False)
+
+    @property
+    def name(self) -> str:
+        return f"references({self.column})"
+
+    def _start(self) -> "_ReferencesState":
+        return _ReferencesState(self)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over the text form of values.
+
+    Sized for *capacity* values at a false-positive rate of *error_rate*.
+    Values are compared as strings, so ``1`` and ``"1"`` are the same member.
+    """
+
+    _KEYS = ("0123456789abcdef", "fedcba9876543210")
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        bits = int(np.ceil(-capacity * np.log(error_rate) / np.log(2) ** 2))
+        self.size = max(bits, 8)
+        self.hashes = max(int(round(self.size / capacity * np.log(2))), 1)
+        self._bits = np.zeros(self.size, dtype=bool)
+
+    def add(self, values: Iterable[Any]) -> None:
+        positions = self._positions(values)
+        self._bits[positions.ravel()] = True
+
+    def contains(self, values: Iterable[Any]) -> np.ndarray:
+        """Return a mask of *values* that may be members."""
+
+        positions = self._positions(values)
+        if positions.size == 0:
+            return np.zeros(positions.shape[0], dtype=bool)
+        return self._bits[positions].all(axis=1)
+
+    def _positions(self, values: Iterable[Any]) -> np.ndarray:
+        text = pd.Series(list(values) if not isinstance(values, pd.Series) else values)
+        array = text.astype(str).to_numpy(dtype=object)
+        first, second = (
+            pd.util.hash_array(array, hash_key=key, categorize=True)
+            for key in self._KEYS
+        )
+        steps = np.arange(self.hashes, dtype=np.uint64)
+        combined = first[:, None] + steps[None, :] * (second[:, None] | np.uint64(1))
+        return (combined % np.uint64(self.size)).astype(np.int64)
+
+
+@dataclass
+class CheckResult:
+    """Outcome of one check: counts and a bounded sample of failing rows."""
+
+    name: str
+    rows: int = 0
+    failures: int = 0
+    samples: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return self.failures == 0
+
+
+@dataclass
+class ValidationReport:
+    """Results of a :class:`ValidationRunner` pass."""
+
+    results: List[CheckResult]
+    rows: int = 0
+    chunks: int = 0
+
+    @property
+    def ok(self) -> bool:
+        return all(result.ok for result in self.results)
 
-def ensure_no_duplicates(df: pd.DataFrame, subset: Sequence[str], context: str) -> None:
-    duplicated = df.duplicated(subset=list(subset))
-    if duplicated.any():
-        rows = df[duplicated]
-        details = rows[list(subset)].to_dict("records")
-        raise ValueError(f"Duplicate keys detected in {context}: {details}")
+    @property
+    def failed(self) -> List[CheckResult]:
+        return [result for result in self.results if not result.ok]
+
+    def summary(self) -> str:
+        parts = [
+            f"{result.name}: {result.failures} of {result.rows} rows, "
+            f"e.g. {result.samples}"
+            for result in self.failed
+        ]
+        return "; ".join(parts) if parts else "all checks passed"
+
+    def raise_for_failures(self, context: str) -> None:
+        if not self.ok:
+            raise ValueError(f"Validation failed for {context}: {self.summary()}")
+
+
+class ValidationRunner:
+    """Run *checks* over a frame or a stream of chunks in one pass.
+
+    Samples of failing rows are drawn uniformly (bottom-k over random keys
+    from a generator seeded with *seed*) and capped at *sample_size* per
+    check, whatever the number of failures.
+    """
+
+    def __init__(
+        self,
+        checks: Sequence[Unique | NotNull | Sorted | References],
+        *,
+        sample_size: int = DEFAULT_SAMPLE_SIZE,
+        seed: Optional[int] = 0,
+    ) -> None:
+        self.checks = list(checks)
+        self.sample_size = sample_size
+        self.seed = seed
+
+    def run(self, data: pd.DataFrame | Iterable[pd.DataFrame]) -> ValidationReport:
+        chunks = [data] if isinstance(data, pd.DataFrame) else data
+        random = np.random.default_rng(self.seed)
+        states = [check._start() for check in self.checks]
+        samplers = [_Sampler(self.sample_size, random) for _ in states]
+        offset = 0
+        count = 0
+        for chunk in chunks:
+            for state, sampler in zip(states, samplers, strict=True):
+                state.update(chunk, offset, sampler)
+            offset += len(chunk)
+            count += 1
+
+        results = []
+        for check, state, sampler in zip(self.checks, states, samplers, strict=True):
+            results.append(
+                CheckResult(
+                    name=check.name,
+                    rows=offset,
+                    failures=state.failures,
+                    samples=sampler.samples(),
+                )
+            )
+        report = ValidationReport(results=results, rows=offset, chunks=count)
+        if not report.ok:
+            logger.debug("Validation failures", extra={"summary": report.summary()})
+        return report
+
+
+class _Sampler:
+    """Keep a uniform sample of at most *size* failing rows."""
+
+    def __init__(self, size: int, random: np.random.Generator) -> None:
+        self.size = size
+        self._random = random
+        self._keys = np.empty(0)
+        self._rows: List[Dict[str, Any]] = []
+
+    def offer(self, frame: pd.DataFrame, positions: np.ndarray, offset: int) -> None:
+        if self.size <= 0 or len(positions) == 0:
+            return
+        keys = self._random.random(len(positions))
+        if len(positions) > self.size:
+            chosen = np.argpartition(keys, self.size)[: self.size]
+            keys, positions = keys[chosen], positions[chosen]
+        records = frame.iloc[positions].to_dict("records")
+        for position, record in zip(positions, records, strict=True):
+            record["row"] = int(position) + offset
+        keys = np.concatenate([self._keys, keys])
+        rows = self._rows + records
+        if len(rows) > self.size:
+            keep = np.sort(np.argpartition(keys, self.size)[: self.size])
+            keys = keys[keep]
+            rows = [rows[index] for index in keep]
+        self._keys, self._rows = keys, rows
+
+    def samples(self) -> List[Dict[str, Any]]:
+        return sorted(self._rows, key=lambda record: record["row"])
+
+
+class _UniqueState:
+    """Exact duplicates within a chunk, 64-bit key hashes across chunks."""
+
+    def __init__(self, check: Unique) -> None:
+        self.columns = list(check.columns)
+        self.failures = 0
+        self._seen = np.empty(0, dtype=np.uint64)
+        self._pending: List[np.ndarray] = []
+
+    def update(self, chunk: pd.DataFrame, offset: int, sampler: _Sampler) -> None:
+        keys = chunk.loc[:, self.columns]
+        repeated = keys.duplicated().to_numpy(copy=True)
+        hashes = pd.util.hash_pandas_object(
+            keys.apply(_canonical_key), index=False
+        ).to_numpy()
+        if self._pending:
+            # Sorted lazily, so a single frame never pays for it.
+            self._seen = np.sort(np.concatenate([self._seen, *self._pending]))
+            self._pending = []
+        if len(self._seen):
+            # Sorted needles keep the binary search cache friendly.
+            order = np.argsort(hashes)
+            needles = hashes[order]
+            slots = np.searchsorted(self._seen, needles).clip(max=len(self._seen) - 1)
+            repeated[order[self._seen[slots] == needles]] = True
+        self._pending.append(hashes[~repeated])
+        positions = np.flatnonzero(repeated)
+        self.failures += len(positions)
+        sampler.offer(keys, positions, offset)
+
+
+def _canonical_key(series: pd.Series) -> pd.Series:
+    """Hash numeric keys by value, so ``1``, ``1.0`` and ``Int64`` 1 agree.
+
+    Chunked readers widen an integer column to ``float64`` in any chunk that
+    holds a blank; whole numbers are therefore hashed as integers and other
+    numbers (including ``NaN``) as floats, whatever the chunk dtype.
+    """
+
+    if not is_numeric_dtype(series.dtype) or is_bool_dtype(series.dtype):
+        return series
+    values = series.to_numpy(dtype="float64", na_value=np.nan)
+    hashes = pd.util.hash_array(values)
+    whole = np.isfinite(values) & (np.abs(values) < 2.0**63)
+    whole[whole] = values[whole] == np.floor(values[whole])
+    if is_integer_dtype(series.dtype):
+        # Exact for integers beyond float precision.
+        integers = series.to_numpy()[whole].astype("int64")
+    else:
+        integers = values[whole].astype("int64")
+    hashes[whole] = pd.util.hash_array(integers)
+    return pd.Series(hashes, index=series.index)
+
+
+class _NotNullState:
+    def __init__(self, check: NotNull) -> None:
+        self.column = check.column
+        self.failures = 0
+
+    def update(self, chunk: pd.DataFrame, offset: int, sampler: _Sampler) -> None:
+        if self.column not in chunk.columns:
+            return
+        positions = np.flatnonzero(chunk[self.column].isna().to_numpy())
+        self.failures += len(positions)
+        sampler.offer(chunk.loc[:, [self.column]], positions, offset)
+
+
+class _SortedState:
+    """O(n) monotonicity check carrying the last row across chunks."""
+
+    def __init__(self, check: Sorted) -> None:
+        self.columns = list(check.columns)
+        self.ascending = check.ascending
+        self.failures = 0
+        self._last: Optional[pd.DataFrame] = None
+
+    def update(self, chunk: pd.DataFrame, offset: int, sampler: _Sampler) -> None:
+        keys = chunk.loc[:, self.columns]
+        if keys.empty:
+            return
+        carried = self._last is not None
+        frame = pd.concat([self._last, keys]) if carried else keys
+        # Pair i compares frame rows i and i + 1 lexicographically.
+        in_order = np.zeros(len(frame) - 1, dtype=bool)
+        tied = np.ones(len(frame) - 1, dtype=bool)
+        for column in self.columns:
+            before, equal = _compare_neighbours(frame[column], self.ascending)
+            in_order |= tied & before
+            tied &= equal
+        broken = np.flatnonzero(~(in_order | tied))
+        positions = broken if carried else broken + 1
+        self.failures += len(positions)
+        sampler.offer(keys, positions, offset)
+        self._last = keys.iloc[[-1]]
+
+
+def _compare_neighbours(
+    series: pd.Series, ascending: bool
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return ``(before, equal)`` for each pair of consecutive values.
+
+    Missing values sort last and compare equal to each other, as in
+    :meth:`pandas.DataFrame.sort_values`.
+    """
+
+    missing = series.isna().to_numpy()
+    if is_numeric_dtype(series.dtype) and not is_bool_dtype(series.dtype):
+        values = series.to_numpy(dtype="float64", na_value=np.nan)
+    else:
+        values = series.to_numpy(dtype=object)
+    first, second = values[:-1], values[1:]
+    first_missing, second_missing = missing[:-1], missing[1:]
+    present = ~first_missing & ~second_missing
+
+    before = ~first_missing & second_missing
+    equal = first_missing & second_missing
+    if present.any():
+        left, right = first[present], second[present]
+        before[present] = (left < right) if ascending else (left > right)
+        equal[present] = left == right
+    return before, equal
+
+
+class _ReferencesState:
+    def __init__(self, check: References) -> None:
+        self.column = check.column
+        self.failures = 0
+        reference = check.reference
+        if isinstance(reference, BloomFilter):
+            self._bloom: Optional[BloomFilter] = reference
+            self._index: Optional[pd.Index] = None
+        else:
+            self._bloom = None
+            values = pd.Series(list(reference), dtype=object)
+            self._index = pd.Index(pd.unique(values.dropna()))
+
+    def update(self, chunk: pd.DataFrame, offset: int, sampler: _Sampler) -> None:
+        if self.column not in chunk.columns:
+            return
+        values = chunk[self.column]
+        checked = np.flatnonzero(values.notna().to_numpy())
+        candidates = values.iloc[checked]
+        if self._bloom is not None:
+            found = self._bloom.contains(candidates)
+        else:
+            found = self._index.get_indexer(candidates.to_numpy(dtype=object)) >= 0
+        positions = checked[~found]
+        self.failures += len(positions)
+        sampler.offer(chunk.loc[:, [self.column]], positions, offset)
+
+
+def ensure_no_duplicates(
+    df: pd.DataFrame,
+    subset: Sequence[str],
+    context: str,
+    *,
+    sample_size: int = DEFAULT_SAMPLE_SIZE,
+) -> None:
+    """Raise ``ValueError`` listing a sample of repeated *subset* keys."""
+
+    report = ValidationRunner([Unique(tuple(subset))], sample_size=sample_size).run(df)
+    if not report.ok:
+        (result,) = report.results
+        raise ValueError(
+            f"Duplicate keys detected in {context}: {result.failures} rows, "
+            f"e.g. {result.samples}"
+        )
 
 
 def ensure_not_null(df: pd.DataFrame, columns: Iterable[str], context: str) -> None:
-    for column in columns:
-        if column not in df.columns:
-            continue
-        if df[column].isna().any():
+    present = [column for column in columns if column in df.columns]
+    checks = [NotNull(column) for column in present]
+    report = ValidationRunner(checks, sample_size=0).run(df)
+    for column, result in zip(present, report.results, strict=True):
+        if not result.ok:
             raise ValueError(f"Null values found in column '{column}' for {context}")
 
 
 def ensure_sorted(df: pd.DataFrame, by: Sequence[str], context: str) -> None:
-    if df.empty:
-        return
-    sorted_df = df.sort_values(by=list(by), kind="mergesort").reset_index(drop=True)
-    if not df[list(by)].equals(sorted_df[list(by)]):
+    """Log a warning when *df* is not ordered by *by*, without sorting it."""
+
+    report = ValidationRunner([Sorted(tuple(by))], sample_size=0).run(df)
+    if not report.ok:
         logger.warning(
-            "DataFrame is not sorted as requested", extra={"context": context}
+            "DataFrame is not sorted as requested",
+            extra={"context": context, "unsorted_rows": report.results[0].failures},
         )
 
 
-__all__ = ["ensure_no_duplicates", "ensure_not_null", "ensure_sorted"]
+__all__ = [
+    "BloomFilter",
+    "CheckResult",
+    "NotNull",
+    "References",
+    "Sorted",
+    "Unique",
+    "ValidationReport",
+    "ValidationRunner",
+    "ensure_no_duplicates",
+    "ensure_not_null",
+    "ensure_sorted",
+]
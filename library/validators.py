@@ -1,9 +1,20 @@
 from __future__ import annotations
 
 import logging
-from typing import Any, Dict, Iterable, Sequence
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Mapping, Sequence
 
+import numpy as np
 import pandas as pd
+from pandas.api.types import (
+    is_float_dtype,
+    is_numeric_dtype,
+    is_object_dtype,
+    is_string_dtype,
+    pandas_dtype,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -25,71 +36,473 @@ def assert_columns(df: pd.DataFrame, expected: Sequence[str]) -> None:
         raise ValueError(f"Missing columns: {missing}")
 
 
+@lru_cache(maxsize=None)
+def _resolve_dtype_name(dtype: str) -> str:
+    return _DTYPE_ALIASES.get(dtype.lower(), dtype)
+
+
 def _resolve_dtype(dtype: Any) -> Any:
     if isinstance(dtype, str):
-        lowered = dtype.lower()
-        if lowered in _DTYPE_ALIASES:
-            return _DTYPE_ALIASES[lowered]
-        return dtype
+        return _resolve_dtype_name(dtype)
     return dtype
 
 
+def resolve_type_map(spec: Dict[str, Any]) -> Dict[str, Any]:
+    """Return *spec* with every dtype alias resolved to its pandas name."""
+
+    return {column: _resolve_dtype(dtype) for column, dtype in spec.items()}
+
+
+_BOOLEAN_STRINGS: Dict[str, bool] = {
+    "true": True,
+    "false": False,
+    "True": True,
+    "False": False,
+}
+
+
+@dataclass(frozen=True)
+class SchemaPlan:
+    """Column additions, dtype conversions and order for one frame schema.
+
+    Build plans with :meth:`compile` (or take them from
+    :meth:`library.config.CompiledConfig.schema`) and reuse them: dtype
+    aliases are resolved once. :meth:`apply` conforms a frame in a single
+    pass and copies its data at most once.
+    """
+
+    type_map: Mapping[str, Any] = field(default_factory=lambda: MappingProxyType({}))
+    columns: tuple[str, ...] = ()
+    order: tuple[str, ...] = ()
+
+    @classmethod
+    def compile(
+        cls,
+        type_map: Mapping[str, Any] | None = None,
+        columns: Iterable[str] = (),
+        order: Iterable[str] = (),
+    ) -> "SchemaPlan":
+        """Return a plan converting *type_map* columns and adding *columns*.
+
+        *order*, when given, is the column selection and order produced by
+        ``apply(df, select=True)``.
+        """
+
+        return cls(
+            type_map=MappingProxyType(resolve_type_map(dict(type_map or {}))),
+            columns=tuple(dict.fromkeys(columns)),
+            order=tuple(order),
+        )
+
+    def apply(
+        self,
+        df: pd.DataFrame,
+        *,
+        add_missing: bool = True,
+        coerce: bool = True,
+        select: bool = False,
+    ) -> pd.DataFrame:
+        """Return *df* conformed to the plan.
+
+        Missing :attr:`columns` are added as all-NA columns of their
+        ``type_map`` dtype (``string`` by default), ``type_map`` columns not
+        already of their target dtype are converted and, with *select*, only
+        the :attr:`order` columns are kept, in that order. Untouched columns
+        are copied once into the new frame.
+        """
+
+        names = list(df.columns)
+        data: Dict[int, Any] = {}
+        for position, column in enumerate(names):
+            series = df.iloc[:, position]
+            if coerce and column in self.type_map:
+                series = _convert_column(series, self.type_map[column])
+            data[position] = series.array
+
+        if add_missing:
+            present = set(names)
+            for column in self.columns:
+                if column not in present:
+                    dtype = _missing_dtype(self.type_map.get(column, "string"))
+                    filler = pd.Series(pd.NA, index=df.index, dtype=dtype)
+                    data[len(names)] = filler.array
+                    names.append(column)
+
+        positions = list(data)
+        if select and self.order:
+            index_of = {column: position for position, column in enumerate(names)}
+            missing = [column for column in self.order if column not in index_of]
+            if missing:
+                raise ValueError(f"Missing columns: {missing}")
+            if len(index_of) == len(names):
+                positions = [index_of[column] for column in self.order]
+
+        result = pd.DataFrame(
+            {key: data[position] for key, position in enumerate(positions)},
+            index=df.index,
+        )
+        result.columns = pd.Index(
+            [names[position] for position in positions], name=df.columns.name
+        )
+        if select and self.order and len(positions) != len(self.order):
+            result = result.loc[:, list(self.order)]
+        return result.__finalize__(df)
+
+
+def _missing_dtype(dtype: Any) -> Any:
+    resolved = _resolve_dtype(dtype)
+    if resolved in {"Int64", "int64"}:
+        return "Int64"
+    if resolved in {"boolean", "bool"}:
+        return "boolean"
+    return resolved
+
+
+def _has_dtype(series: pd.Series, dtype: Any) -> bool:
+    try:
+        return series.dtype == pandas_dtype(dtype)
+    except TypeError:
+        return False
+
+
+def _convert_column(series: pd.Series, resolved: Any) -> pd.Series:
+    if resolved in {"Int64", "int64"}:
+        if _has_dtype(series, "Int64"):
+            return series
+        return pd.to_numeric(series, errors="coerce").astype("Int64")
+    if resolved in {"boolean", "bool"}:
+        if _has_dtype(series, "boolean"):
+            return series
+        return _parse_boolean(series)
+    if _has_dtype(series, resolved):
+        return series
+    return series.astype(resolved)
+
+
+def _parse_boolean(series: pd.Series) -> pd.Series:
+    """Convert *series* to ``boolean``, reading ``"true"``/``"False"`` strings.
+
+    Each distinct value is parsed once; columns holding only the literal
+    strings (and nulls) are built directly from the factorized codes.
+    """
+
+    if series.dtype != object and not is_string_dtype(series.dtype):
+        return series.astype("boolean")
+
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    parsed = [
+        _BOOLEAN_STRINGS.get(value, value) if isinstance(value, str) else value
+        for value in uniques
+    ]
+    missing = codes == -1
+    if all(type(value) is bool for value in parsed):
+        flags = np.array(parsed + [False], dtype=bool)
+        array = pd.arrays.BooleanArray(flags.take(codes), missing)
+        return pd.Series(array, index=series.index, name=series.name)
+
+    values = np.array(parsed + [None], dtype=object)
+    return pd.Series(values.take(codes), index=series.index, name=series.name).astype(
+        "boolean"
+    )
+
+
 def coerce_types(df: pd.DataFrame, spec: Dict[str, Any]) -> pd.DataFrame:
-    result = df.copy()
-    for column, dtype in spec.items():
-        if column not in result.columns:
-            continue
-        resolved = _resolve_dtype(dtype)
-        if resolved in {"Int64", "int64"}:
-            result[column] = pd.to_numeric(result[column], errors="coerce").astype(
-                "Int64"
-            )
-        elif resolved in {"boolean", "bool"}:
-            result[column] = (
-                result[column]
-                .replace({"true": True, "false": False, "True": True, "False": False})
-                .astype("boolean")
-            )
-        elif resolved == "string":
-            result[column] = result[column].astype("string")
-        else:
-            result[column] = result[column].astype(resolved)
-    return result
+    """Return a copy of *df* with the *spec* columns converted to their dtypes."""
+
+    return SchemaPlan.compile(spec).apply(df, add_missing=False)
 
 
 def ensure_columns(
     df: pd.DataFrame, columns: Sequence[str], type_map: Dict[str, Any] | None = None
 ) -> pd.DataFrame:
-    result = df.copy()
-    column_types = type_map or {}
-    for column in columns:
-        if column in result.columns:
-            continue
-        resolved = _resolve_dtype(column_types.get(column, "string"))
-        if resolved in {"Int64", "int64"}:
-            result[column] = pd.Series(pd.NA, index=result.index, dtype="Int64")
-        elif resolved in {"boolean", "bool"}:
-            result[column] = pd.Series(pd.NA, index=result.index, dtype="boolean")
-        elif resolved == "string":
-            result[column] = pd.Series(pd.NA, index=result.index, dtype="string")
-        else:
-            result[column] = pd.Series(pd.NA, index=result.index, dtype=resolved)
-    return result
+    """Return a copy of *df* with all-NA columns added for missing *columns*."""
+
+    return SchemaPlan.compile(type_map, columns).apply(df, coerce=False)
+
+
+@dataclass(frozen=True)
+class MergeReport:
+    """Key coverage of one :func:`safe_merge` call."""
+
+    left_rows: int
+    right_rows: int
+    matched_rows: int
+    rows: int
+    strategy: str
+
+    @property
+    def match_rate(self) -> float:
+        """Share of left rows whose key exists on the right side."""
+
+        return self.matched_rows / self.left_rows if self.left_rows else 1.0
+
+
+_MAP_JOIN_VALIDATE = {None, "m:1", "many_to_one"}
 
 
 def safe_merge(
     left: pd.DataFrame,
     right: pd.DataFrame,
-    on: Sequence[str],
+    on: Sequence[str] | str | None = None,
     how: str = "left",
     suffixes: tuple[str, str] = ("_left", "_right"),
     validate: str | None = None,
+    *,
+    left_on: Sequence[str] | str | None = None,
+    right_on: Sequence[str] | str | None = None,
+    factorize: bool = False,
+    reports: list[MergeReport] | None = None,
+) -> pd.DataFrame:
+    """Merge *left* and *right* after aligning the key dtypes.
+
+    Right-hand keys are cast to the dtype of the matching left key (numbers
+    and text are compared through their text form), so ``string`` keys meet
+    ``object`` keys and ``Int64`` identifiers meet digit strings. When the
+    right keys are unique and *how* is ``left`` or ``inner``, the join is a
+    positional lookup into *right* instead of a hash merge; otherwise, with
+    *factorize*, left joins run on shared integer codes rather than the key
+    values. The result equals :meth:`pandas.DataFrame.merge` on the aligned
+    keys. Each call logs a :class:`MergeReport`, also appended to *reports*
+    when given.
+    """
+
+    if on is not None:
+        left_keys = right_keys = [on] if isinstance(on, str) else list(on)
+    else:
+        left_keys = [left_on] if isinstance(left_on, str) else list(left_on or [])
+        right_keys = [right_on] if isinstance(right_on, str) else list(right_on or [])
+    if not left_keys or len(left_keys) != len(right_keys):
+        raise ValueError("safe_merge needs matching left and right keys")
+
+    left, right = _align_keys(left, right, left_keys, right_keys)
+    left_codes, right_codes = _shared_codes(left, right, left_keys, right_keys)
+    matched = np.isin(left_codes, right_codes)
+
+    result = None
+    strategy = "merge"
+    if how in ("left", "inner") and validate in _MAP_JOIN_VALIDATE:
+        if len(np.unique(right_codes)) == len(right_codes):
+            result = _lookup_join(
+                left,
+                right,
+                left_keys,
+                right_keys,
+                how,
+                suffixes,
+                left_codes,
+                right_codes,
+            )
+            strategy = "lookup"
+    if result is None and factorize and how == "left":
+        result = _merge_on_codes(
+            left,
+            right,
+            left_keys,
+            right_keys,
+            how,
+            suffixes,
+            validate,
+            left_codes,
+            right_codes,
+        )
+        strategy = "codes"
+    if result is None:
+        kwargs: Dict[str, Any] = (
+            {"on": left_keys}
+            if left_keys == right_keys
+            else {
+                "left_on": left_keys,
+                "right_on": right_keys,
+            }
+        )
+        result = left.merge(
+            right, how=how, suffixes=suffixes, validate=validate, **kwargs
+        )
+
+    report = MergeReport(
+        left_rows=len(left),
+        right_rows=len(right),
+        matched_rows=int(matched.sum()),
+        rows=len(result),
+        strategy=strategy,
+    )
+    logger.info(
+        "Merged frames",
+        extra={
+            "on": left_keys,
+            "how": how,
+            "match_rate": round(report.match_rate, 4),
+            **asdict(report),
+        },
+    )
+    if reports is not None:
+        reports.append(report)
+    return result
+
+
+def _is_text(dtype: Any) -> bool:
+    return is_object_dtype(dtype) or is_string_dtype(dtype)
+
+
+def _align_keys(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    left_keys: Sequence[str],
+    right_keys: Sequence[str],
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Cast right keys to the left key dtypes, or both to a nullable dtype.
+
+    Right keys that cannot take the left dtype (digit strings with missing
+    values against ``int64``, say) move both sides to ``Int64``, ``Float64``
+    or ``string`` instead of silently keeping mismatched dtypes.
+    """
+
+    left_aligned: Dict[str, pd.Series] = {}
+    right_aligned: Dict[str, pd.Series] = {}
+    for left_key, right_key in zip(left_keys, right_keys, strict=True):
+        target = left[left_key].dtype
+        values = right[right_key]
+        if values.dtype == target:
+            continue
+        if _is_text(target) and is_numeric_dtype(values.dtype):
+            values = _numeric_text(values)
+        elif is_numeric_dtype(target) and _is_text(values.dtype):
+            numbers = pd.to_numeric(values, errors="coerce")
+            unparsed = int((numbers.isna() & values.notna()).sum())
+            if unparsed:
+                logger.warning(
+                    "Merge key values are not numeric",
+                    extra={"key": right_key, "rows": unparsed},
+                )
+            values = numbers
+        elif not (_is_text(target) and _is_text(values.dtype)):
+            continue
+        try:
+            right_aligned[right_key] = values.astype(target)
+        except (TypeError, ValueError):
+            common = _common_key_dtype(left[left_key], values)
+            left_aligned[left_key] = left[left_key].astype(common)
+            right_aligned[right_key] = values.astype(common)
+    if left_aligned:
+        left = left.assign(**left_aligned)
+    if right_aligned:
+        right = right.assign(**right_aligned)
+    return left, right
+
+
+def _common_key_dtype(left: pd.Series, right: pd.Series) -> str:
+    """Return a nullable dtype both key columns can be cast to."""
+
+    if not (is_numeric_dtype(left.dtype) and is_numeric_dtype(right.dtype)):
+        return "string"
+    both = pd.concat([left.dropna(), right.dropna()]).astype("float64")
+    return "Int64" if (both == both.round()).all() else "Float64"
+
+
+def _numeric_text(values: pd.Series) -> pd.Series:
+    """Return *values* as text, writing integral floats without ``.0``."""
+
+    if is_float_dtype(values.dtype):
+        finite = values.dropna()
+        if (finite == finite.round()).all():
+            values = values.astype("Int64")
+    return values.astype("string")
+
+
+def _shared_codes(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    left_keys: Sequence[str],
+    right_keys: Sequence[str],
+) -> tuple[np.ndarray, np.ndarray]:
+    """Factorize the keys of both sides into one integer code space.
+
+    Missing keys get a code of their own, as :meth:`DataFrame.merge` joins
+    missing keys with each other.
+    """
+
+    columns = []
+    for left_key, right_key in zip(left_keys, right_keys, strict=True):
+        both = pd.concat([left[left_key], right[right_key]], ignore_index=True)
+        if left[left_key].dtype != right[right_key].dtype:
+            both = both.astype(object)
+        columns.append(pd.factorize(both, use_na_sentinel=False)[0])
+    if len(columns) == 1:
+        codes = columns[0]
+    else:
+        codes = pd.MultiIndex.from_arrays(columns).factorize()[0]
+    return codes[: len(left)], codes[len(left) :]
+
+
+def _lookup_join(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    left_keys: Sequence[str],
+    right_keys: Sequence[str],
+    how: str,
+    suffixes: tuple[str, str],
+    left_codes: np.ndarray,
+    right_codes: np.ndarray,
+) -> pd.DataFrame | None:
+    """Join a unique-keyed *right* by position; ``None`` if names would clash."""
+
+    shared = left_keys == right_keys
+    right_columns = [
+        column for column in right.columns if not (shared and column in right_keys)
+    ]
+    overlap = set(left.columns) & set(right_columns)
+    left_names = [
+        f"{column}{suffixes[0] or ''}" if column in overlap else column
+        for column in left.columns
+    ]
+    right_names = [
+        f"{column}{suffixes[1] or ''}" if column in overlap else column
+        for column in right_columns
+    ]
+    names = left_names + right_names
+    if len(set(names)) != len(names) or not left.columns.is_unique:
+        return None
+
+    size = max(left_codes.max(initial=-1), right_codes.max(initial=-1)) + 1
+    positions = np.full(int(size), -1)
+    positions[right_codes] = np.arange(len(right_codes))
+    indexer = positions.take(left_codes) if len(left_codes) else left_codes
+    left_part = left
+    if how == "inner":
+        keep = indexer >= 0
+        left_part = left.iloc[np.flatnonzero(keep)]
+        indexer = indexer[keep]
+    left_part = left_part.reset_index(drop=True)
+    right_part = right.loc[:, right_columns].reset_index(drop=True).reindex(indexer)
+    right_part.index = left_part.index
+    result = pd.concat([left_part, right_part], axis=1)
+    result.columns = pd.Index(names)
+    return result
+
+
+def _merge_on_codes(
+    left: pd.DataFrame,
+    right: pd.DataFrame,
+    left_keys: Sequence[str],
+    right_keys: Sequence[str],
+    how: str,
+    suffixes: tuple[str, str],
+    validate: str | None,
+    left_codes: np.ndarray,
+    right_codes: np.ndarray,
 ) -> pd.DataFrame:
-    logger.debug("Merging", extra={"on": on, "how": how})
-    merged = left.merge(
-        right, on=list(on), how=how, suffixes=suffixes, validate=validate
+    code = "__safe_merge_code"
+    right_part = right
+    if left_keys == right_keys:
+        right_part = right.drop(columns=list(right_keys))
+    merged = left.assign(**{code: left_codes}).merge(
+        right_part.assign(**{code: right_codes}),
+        on=code,
+        how=how,
+        suffixes=suffixes,
+        validate=validate,
     )
-    return merged
+    return merged.drop(columns=code)
 
 
 def deduplicate(df: pd.DataFrame, subset: Sequence[str]) -> pd.DataFrame:
@@ -118,6 +531,8 @@ def sort_dataframe(df: pd.DataFrame, by: Sequence[str]) -> pd.DataFrame:
 
 
 __all__ = [
+    "MergeReport",
+    "SchemaPlan",
     "assert_columns",
     "coerce_types",
     "safe_merge",
@@ -125,4 +540,5 @@ __all__ = [
     "finalize_aggregate_columns",
     "sort_dataframe",
     "ensure_columns",
+    "resolve_type_map",
 ]
@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from library.chembl_client import ChemblClient
+from library.mock_chembl import MockChemblServer, MockSettings
+from library.throttling import HedgePolicy, RetryPolicy, TokenBucket
+
+logging.basicConfig(level=logging.WARNING, format="%(levelname)s %(message)s")
+
+ENDPOINT = "activity"
+
+
+def _percentile(values: List[float], percentile: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(int(round(percentile / 100.0 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[rank]
+
+
+def _modes(args: argparse.Namespace) -> Dict[str, Callable[[str], Dict[str, Any]]]:
+    retry = RetryPolicy(retries=args.retries, backoff=args.backoff, jitter=0.5)
+
+    def client(base_url: str, **kwargs: Any) -> ChemblClient:
+        return ChemblClient(
+            base_url, pool_size=args.concurrency * 2, retry_policy=retry, **kwargs
+        )
+
+    return {
+        "sequential": lambda url: {"client": client(url), "paged": {}},
+        "stream": lambda url: {"client": client(url), "paged": {"stream": True}},
+        "concurrent": lambda url: {
+            "client": client(url),
+            "paged": {"concurrency": args.concurrency},
+        },
+        "concurrent+hedge": lambda url: {
+            "client": client(
+                url,
+                hedge_policy=HedgePolicy(
+                    percentile=90, min_samples=10, max_fraction=0.1
+                ),
+            ),
+            "paged": {"concurrency": args.concurrency},
+        },
+        "concurrent+bucket": lambda url: {
+            "client": client(url, rate_limiter=TokenBucket(args.rate)),
+            "paged": {"concurrency": args.concurrency},
+        },
+    }
+
+
+def run_mode(
+    name: str, factory: Callable[[str], Dict[str, Any]], args: argparse.Namespace
+) -> Dict[str, Any]:
+    settings = MockSettings(
+        total=args.total,
+        latency_median=args.latency,
+        latency_sigma=args.sigma,
+        tail_probability=args.tail_probability,
+        tail_latency=args.tail_latency,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        seed=args.seed,
+    )
+    with MockChemblServer(settings) as server:
+        setup = factory(server.base_url)
+        client: ChemblClient = setup["client"]
+        latencies: List[float] = []
+        client.session.hooks["response"].append(
+            lambda response, *_, **__: latencies.append(
+                response.elapsed.total_seconds()
+            )
+        )
+        started = time.perf_counter()
+        records = sum(
+            1 for _ in client.paged(ENDPOINT, limit=args.limit, **setup["paged"])
+        )
+        elapsed = time.perf_counter() - started
+        client.close()
+        hedge = client.hedge_policy
+        if hedge is not None:
+            hedge.close()
+        server_stats = dict(server.stats)
+
+    return {
+        "mode": name,
+        "records": records,
+        "seconds": round(elapsed, 3),
+        "records_per_sec": round(records / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 1),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 1),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 1),
+        "requests": client.stats["requests"],
+        "retries": client.stats["retries"],
+        "hedged": client.stats["hedged"],
+        "server_errors": server_stats["errors"],
+        "server_throttled": server_stats["throttled"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark ChEMBL client modes against a local mock server"
+    )
+    parser.add_argument("--total", type=int, default=20_000, help="Records served")
+    parser.add_argument("--limit", type=int, default=500, help="Page size")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.02, help="Median latency, s")
+    parser.add_argument("--sigma", type=float, default=0.5, help="Log-normal sigma")
+    parser.add_argument("--tail-probability", type=float, default=0.02)
+    parser.add_argument("--tail-latency", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.01)
+    parser.add_argument("--throttle-rate", type=float, default=0.01)
+    parser.add_argument("--retries", type=int, default=5)
+    parser.add_argument("--backoff", type=float, default=0.05)
+    parser.add_argument("--rate", type=float, default=50.0, help="Token bucket rate")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--modes", nargs="*", help="Subset of modes to run (default: all)"
+    )
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args()
+
+    modes = _modes(args)
+    selected = args.modes or list(modes)
+    unknown = sorted(set(selected) - set(modes))
+    if unknown:
+        parser.error(f"Unknown modes: {', '.join(unknown)}")
+
+    results = [run_mode(name, modes[name], args) for name in selected]
+
+    columns = list(results[0])
+    widths = {
+        column: max(len(column), *(len(str(row[column])) for row in results))
+        for column in columns
+    }
+    print("  ".join(column.ljust(widths[column]) for column in columns))
+    for row in results:
+        print("  ".join(str(row[column]).ljust(widths[column]) for column in columns))
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2), encoding="utf-8")
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from library.config import load_config
+from library.curation import build_bundle, is_stale
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compile curation dictionaries")
+    parser.add_argument("--config", required=True, help="Path to config.yaml")
+    parser.add_argument("--out", help="Override bundle path")
+    parser.add_argument(
+        "--force", action="store_true", help="Rebuild even when the bundle is fresh"
+    )
+    args = parser.parse_args()
+
+    config = load_config(Path(args.config))
+    if not args.force and not is_stale(config, args.out):
+        logging.info("Curation bundle is up to date")
+        return
+
+    output_path = build_bundle(config, args.out)
+    logging.info("Curation bundle written", extra={"output": str(output_path)})
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
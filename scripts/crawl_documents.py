@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+from typing import List
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from library.chembl_client import BASE_URL, ChemblClient
+from library.config import load_config
+from library.crawler import crawl_documents, write_crawl
+
+logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+
+def _read_ids(path: Path) -> List[str]:
+    lines = path.read_text(encoding="utf-8").splitlines()
+    return [line.split(",")[0].strip() for line in lines if line.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Fetch documents and their related ChEMBL entities"
+    )
+    parser.add_argument("--config", required=True, help="Path to config.yaml")
+    parser.add_argument(
+        "--ids", required=True, help="File with one document_chembl_id per line"
+    )
+    parser.add_argument("--out", required=True, help="Output directory")
+    parser.add_argument("--base-url", default=BASE_URL, help="ChEMBL API base URL")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    config = load_config(Path(args.config))
+    ids = [
+        value for value in _read_ids(Path(args.ids)) if value != "document_chembl_id"
+    ]
+
+    with ChemblClient(args.base_url, pool_size=args.concurrency * 2) as client:
+        frames = crawl_documents(
+            ids, client, batch_size=args.batch_size, concurrency=args.concurrency
+        )
+    files = write_crawl(frames, Path(args.out), config)
+    for key, path in files.items():
+        logging.info("Wrote %s -> %s", key, path)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
@@ -13,6 +13,7 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from library.config import load_config
+from library.curation import CURATION_SOURCES, load_curation
 from library.io import read_csv, write_csv
 from library.transforms.document import normalize_document
 
@@ -67,13 +68,11 @@ def get_document_data(config: Dict[str, object]) -> Dict[str, pd.DataFrame]:
     if document_ref_key == "document_csv":
         document_ref_df = document_df
     else:
-        document_ref_df = read_csv(document_ref_key, config)
+        document_ref_df = load_curation("document", config)
         document_ref_df = _drop_columns(document_ref_df, EXCLUDED_COLUMNS)
 
     if document_out_key == "document_csv":
         document_out_df = document_df
-    elif document_out_key == document_ref_key:
-        document_out_df = document_ref_df
     else:
         document_out_df = read_csv(document_out_key, config)
         document_out_df = _drop_columns(document_out_df, EXCLUDED_COLUMNS)
@@ -81,7 +80,13 @@ def get_document_data(config: Dict[str, object]) -> Dict[str, pd.DataFrame]:
 
     activity_df = read_csv(activity_ref_key, config)
 
-    citation_df = read_csv(citation_key, config)
+    if (
+        citation_key in files_cfg
+        and citation_key in CURATION_SOURCES["citation_fraction"]
+    ):
+        citation_df = load_curation("citation_fraction", config)
+    else:
+        citation_df = read_csv(citation_key, config)
 
     return {
         "document": document_df,
@@ -10,6 +10,7 @@ if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from library.config import load_config
+from library.curation import load_curation
 from library.io import read_csv, write_csv
 from library.transforms.testitem import normalize_testitem
 
@@ -26,7 +27,7 @@ def main() -> None:
     config = load_config(config_path)
 
     testitem_df = read_csv("testitem_csv", config)
-    testitem_reference_df = read_csv("testitem_reference_csv", config)
+    testitem_reference_df = load_curation("testitem", config)
     activity_df = read_csv("activity_csv", config)
 
     result = normalize_testitem(
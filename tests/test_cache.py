@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import time
+
+from library.cache import ResponseCache, cache_key
+
+
+def test_cache_key_normalizes_params() -> None:
+    assert cache_key("activity", {"limit": 10, "offset": 0}) == cache_key(
+        "activity", {"offset": "0", "limit": "10"}
+    )
+    assert cache_key("activity", {"offset": 0}) != cache_key("assay", {"offset": 0})
+
+
+def test_cache_roundtrip_and_ttl(tmp_path) -> None:
+    cache = ResponseCache(tmp_path / "responses.sqlite", ttl=0.2)
+    cache.put("activity", {"offset": 0}, {"activities": [{"id": 1}]})
+
+    assert cache.get("activity", {"offset": "0"}) == {"activities": [{"id": 1}]}
+    time.sleep(0.3)
+    assert cache.get("activity", {"offset": 0}) is None
+    assert cache.stats["hits"] == 1
+    assert cache.stats["misses"] == 1
+
+
+def test_cache_evicts_least_recently_used(tmp_path) -> None:
+    cache = ResponseCache(tmp_path / "responses.sqlite")
+    payload = {"items": [f"value-{index}" for index in range(50)]}
+    for offset in range(3):
+        cache.put("activity", {"offset": offset}, payload)
+        time.sleep(0.01)
+    entry_size = cache.size() // 3
+    cache.get("activity", {"offset": 0})
+
+    cache.max_bytes = 2 * entry_size
+    cache.put("activity", {"offset": 3}, payload)
+
+    assert cache.get("activity", {"offset": 0}) is not None
+    assert cache.get("activity", {"offset": 1}) is None
+    assert cache.get("activity", {"offset": 3}) is not None
+    assert cache.size() <= 2 * entry_size
+
+
+def test_cache_tracks_size_without_scanning_on_put(tmp_path) -> None:
+    cache = ResponseCache(tmp_path / "responses.sqlite", max_bytes=10**6, ttl=0.2)
+    statements: list[str] = []
+    cache._conn.set_trace_callback(statements.append)
+
+    for offset in range(5):
+        cache.put("activity", {"offset": offset}, {"items": [offset] * offset})
+    cache.put("activity", {"offset": 0}, {"items": list(range(40))})
+
+    assert not [sql for sql in statements if "SUM(size)" in sql]
+    cache._conn.set_trace_callback(None)
+    assert cache._total == cache.size()
+
+    time.sleep(0.3)
+    assert cache.get("activity", {"offset": 0}) is None
+    assert cache._total == cache.size()
+    cache.clear()
+    assert cache._total == 0
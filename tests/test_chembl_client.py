@@ -0,0 +1,466 @@
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from library import chembl_client
+from library.cache import CacheMissError, ResponseCache
+from library.throttling import HedgePolicy, RateLimiter, RetryPolicy
+
+requests = pytest.importorskip("requests")
+
+
+class FakeResponse:
+    def __init__(
+        self,
+        payload: dict[str, Any],
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        self._payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self) -> None:
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} error", response=self)
+
+    def json(self) -> dict[str, Any]:
+        return self._payload
+
+    def iter_content(self, chunk_size: int = 1):
+        data = json.dumps(self._payload).encode("utf-8")
+        for start in range(0, len(data), 5):
+            yield data[start : start + 5]
+
+    def close(self) -> None:
+        self.closed = True
+
+
+class FakeSession:
+    def __init__(self, total: int, *, jitter: float = 0.0) -> None:
+        self.total = total
+        self.jitter = jitter
+        self.calls: list[int] = []
+        self.urls: list[str] = []
+        self.params: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def get(self, url: str, params: dict[str, Any], **kwargs: Any) -> FakeResponse:
+        offset = int(params["offset"])
+        limit = int(params["limit"])
+        with self._lock:
+            self.calls.append(offset)
+            self.urls.append(url)
+            self.params.append({**params, **kwargs})
+        if self.jitter:
+            time.sleep(random.uniform(0, self.jitter))
+        stop = min(offset + limit, self.total)
+        items = [{"id": index} for index in range(offset, stop)]
+        return FakeResponse(
+            {
+                "activities": items,
+                "page_meta": {
+                    "limit": limit,
+                    "offset": offset,
+                    "total_count": self.total,
+                },
+            }
+        )
+
+
+def test_paged_sequential() -> None:
+    session = FakeSession(25)
+    client = chembl_client.ChemblClient("http://localhost:1/api/", session=session)
+
+    records = list(client.paged("activities", limit=10))
+
+    assert [record["id"] for record in records] == list(range(25))
+    assert session.calls == [0, 10, 20, 25]
+    assert session.urls[0] == "http://localhost:1/api/activities.json"
+
+
+def test_paged_concurrent_preserves_order() -> None:
+    session = FakeSession(95, jitter=0.01)
+    client = chembl_client.ChemblClient(session=session)
+
+    records = list(client.paged("activities", limit=10, concurrency=4))
+
+    assert [record["id"] for record in records] == list(range(95))
+    assert sorted(session.calls) == list(range(0, 95, 10))
+
+
+class ShortPageSession(FakeSession):
+    """Serve *short* records fewer than requested at one offset."""
+
+    def __init__(self, total: int, *, short_at: int, short: int) -> None:
+        super().__init__(total)
+        self.short_at = short_at
+        self.short = short
+
+    def get(self, url: str, params: dict[str, Any], **kwargs: Any) -> FakeResponse:
+        response = super().get(url, params, **kwargs)
+        if int(params["offset"]) == self.short_at:
+            del response._payload["activities"][-self.short :]
+        return response
+
+
+def test_paged_concurrent_falls_back_after_short_page() -> None:
+    session = ShortPageSession(95, short_at=30, short=4)
+    client = chembl_client.ChemblClient(session=session)
+
+    records = list(client.paged("activities", limit=10, concurrency=4))
+
+    assert [record["id"] for record in records] == list(range(95))
+    # Pages after the short one are read sequentially from offset 36.
+    assert session.calls[-7:] == [36, 46, 56, 66, 76, 86, 95]
+
+
+def test_paged_concurrent_falls_back_on_total_drift() -> None:
+    session = FakeSession(35)
+    client = chembl_client.ChemblClient(session=session)
+    pages = client.paged("activities", limit=10, concurrency=2, max_pending=1)
+
+    records = [next(pages) for _ in range(10)]
+    session.total = 42
+    records.extend(pages)
+
+    assert [record["id"] for record in records] == list(range(42))
+    assert client.stats["drift"] == 1
+
+
+def test_paged_concurrent_bounds_pending_pages() -> None:
+    session = FakeSession(1000)
+    client = chembl_client.ChemblClient(session=session)
+
+    iterator = client.paged("activities", limit=10, concurrency=2, max_pending=3)
+    first = next(iterator)
+    time.sleep(0.05)
+
+    assert first == {"id": 0}
+    assert len(session.calls) <= 1 + 3
+    iterator.close()
+
+
+def test_module_paged_uses_default_client(monkeypatch) -> None:
+    session = FakeSession(3)
+    client = chembl_client.ChemblClient(session=session)
+    monkeypatch.setattr(chembl_client, "get_default_client", lambda: client)
+
+    records = list(chembl_client.paged("activities", limit=2))
+
+    assert [record["id"] for record in records] == [0, 1, 2]
+
+
+def test_client_session_is_pooled() -> None:
+    client = chembl_client.ChemblClient(pool_size=4)
+
+    session = client.session
+
+    adapter = session.get_adapter("https://www.ebi.ac.uk")
+    assert adapter._pool_maxsize == 4
+    assert "gzip" in session.headers["Accept-Encoding"]
+    assert client.session is session
+    client.close()
+
+
+class FlakySession(FakeSession):
+    def __init__(self, total: int, failures: list[int]) -> None:
+        super().__init__(total)
+        self.failures = list(failures)
+
+    def get(self, url: str, params: dict[str, Any], **kwargs: Any) -> FakeResponse:
+        if self.failures:
+            status = self.failures.pop(0)
+            return FakeResponse({}, status_code=status, headers={"Retry-After": "0"})
+        return super().get(url, params, **kwargs)
+
+
+def test_client_retries_throttled_pages() -> None:
+    session = FlakySession(5, [429, 503])
+    policy = RetryPolicy(retries=3, backoff=0.0, jitter=0.0)
+    client = chembl_client.ChemblClient(session=session, retry_policy=policy)
+
+    records = list(client.paged("activities", limit=10))
+
+    assert len(records) == 5
+    assert client.stats["retries"] == 2
+
+
+def test_client_gives_up_after_policy_retries() -> None:
+    session = FlakySession(5, [503, 503])
+    policy = RetryPolicy(retries=1, backoff=0.0, jitter=0.0)
+    client = chembl_client.ChemblClient(session=session, retry_policy=policy)
+
+    with pytest.raises(requests.HTTPError):
+        list(client.paged("activities"))
+
+
+def test_rate_limiter_spaces_requests() -> None:
+    limiter = RateLimiter(50.0)
+    started = time.monotonic()
+
+    for _ in range(6):
+        limiter.acquire()
+
+    assert time.monotonic() - started >= 5 / 50.0 * 0.9
+
+
+def test_client_hedges_slow_pages() -> None:
+    class SlowFirstSession(FakeSession):
+        started = 0
+
+        def get(self, url: str, params: dict[str, Any], **kwargs: Any) -> FakeResponse:
+            with self._lock:
+                self.started += 1
+                first = self.started == 1
+            if first:
+                time.sleep(0.5)
+            return super().get(url, params, **kwargs)
+
+    session = SlowFirstSession(5)
+    policy = HedgePolicy(initial_delay=0.02, min_samples=100, max_fraction=1.0)
+    client = chembl_client.ChemblClient(session=session, hedge_policy=policy)
+
+    started = time.monotonic()
+    page = client.get_page("activities", {"offset": 0, "limit": 5})
+
+    assert len(page["activities"]) == 5
+    assert time.monotonic() - started < 0.4
+    assert client.stats["hedged"] == 1
+    assert client.stats["requests"] == 2
+    policy.close()
+
+
+class IdSession:
+    def __init__(self) -> None:
+        self.filters: list[list[str]] = []
+        self._lock = threading.Lock()
+
+    def get(self, url: str, params: dict[str, Any], timeout: float) -> FakeResponse:
+        ids = str(params["molecule_chembl_id__in"]).split(",")
+        with self._lock:
+            self.filters.append(ids)
+        time.sleep(random.uniform(0, 0.01))
+        items = [{"molecule_chembl_id": value} for value in ids]
+        return FakeResponse(
+            {"molecules": items, "page_meta": {"total_count": len(items)}}
+        )
+
+
+def test_fetch_by_ids_dedups_and_batches() -> None:
+    session = IdSession()
+    client = chembl_client.ChemblClient("http://localhost:1/api", session=session)
+    ids = [f"CHEMBL{index}" for index in range(250)]
+    ids += ["CHEMBL3", " CHEMBL7 ", "", None, float("nan")]
+
+    records = list(
+        client.fetch_by_ids(
+            "molecule", "molecule_chembl_id", ids, batch_size=100, concurrency=3
+        )
+    )
+
+    assert [record["molecule_chembl_id"] for record in records] == ids[:250]
+    assert sorted(len(batch) for batch in session.filters) == [50, 100, 100]
+    assert client.stats["requests"] == 3
+
+
+def test_fetch_by_ids_respects_url_limit() -> None:
+    session = IdSession()
+    client = chembl_client.ChemblClient("http://localhost:1/api", session=session)
+    ids = [f"CHEMBL{index:07d}" for index in range(100)]
+
+    records = list(
+        client.fetch_by_ids("molecule", "molecule_chembl_id", ids, max_url_length=400)
+    )
+
+    assert len(records) == 100
+    assert len(session.filters) > 1
+    for batch in session.filters:
+        query = "molecule_chembl_id__in=" + "%2C".join(batch) + "&limit=1000&offset=0"
+        assert len(client.url("molecule")) + 1 + len(query) <= 400
+
+
+def test_offline_client_replays_cached_pages(tmp_path) -> None:
+    path = tmp_path / "responses.sqlite"
+    online = chembl_client.ChemblClient(
+        session=FakeSession(25), cache=ResponseCache(path)
+    )
+    expected = list(online.paged("activities", limit=10))
+
+    session = FakeSession(25)
+    offline = chembl_client.ChemblClient(
+        session=session, cache=ResponseCache(path, offline=True)
+    )
+    assert list(offline.paged("activities", limit=10)) == expected
+    assert session.calls == []
+    assert offline.stats["cache_hits"] == 4
+
+    with pytest.raises(CacheMissError):
+        offline.get_page("activities", {"offset": 0, "limit": 5})
+
+
+def test_paged_streams_with_field_projection() -> None:
+    session = FakeSession(25)
+    client = chembl_client.ChemblClient(session=session)
+
+    records = list(
+        client.paged("activities", limit=10, only=["id", "value"], stream=True)
+    )
+
+    assert [record["id"] for record in records] == list(range(25))
+    assert session.calls == [0, 10, 20, 25]
+    assert all(call["only"] == "id,value" for call in session.params)
+    assert all(call["stream"] is True for call in session.params)
+
+
+def test_iter_page_collects_page_meta() -> None:
+    client = chembl_client.ChemblClient(session=FakeSession(5))
+    meta: dict[str, Any] = {}
+
+    items = list(client.iter_page("activities", {"offset": 0, "limit": 5}, meta))
+
+    assert len(items) == 5
+    assert meta["page_meta"]["total_count"] == 5
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_paged_resumes_from_checkpoint(tmp_path, concurrency: int) -> None:
+    path = tmp_path / "activities.checkpoint.json"
+    client = chembl_client.ChemblClient(session=FakeSession(45))
+    params = {"target_chembl_id": "CHEMBL1"}
+
+    crawl = client.paged(
+        "activities", params, limit=10, concurrency=concurrency, checkpoint=path
+    )
+    first = [next(crawl)["id"] for _ in range(25)]
+    crawl.close()  # the crawl dies halfway through the third page
+
+    session = FakeSession(45)
+    resumed = chembl_client.ChemblClient(session=session)
+    rest = [
+        record["id"]
+        for record in resumed.paged(
+            "activities", params, limit=10, concurrency=concurrency, checkpoint=path
+        )
+    ]
+
+    assert first == list(range(25))
+    assert rest == list(range(20, 45))
+    assert min(session.calls) == 20
+    state = json.loads(path.read_text())
+    assert state["complete"] is True
+    assert state["records"] == 45
+
+    again = chembl_client.ChemblClient(session=FakeSession(45))
+    assert list(again.paged("activities", params, limit=10, checkpoint=path)) == []
+    other = chembl_client.ChemblClient(session=FakeSession(45))
+    other_params = {"target_chembl_id": "CHEMBL2"}
+    assert len(list(other.paged("activities", other_params, checkpoint=path))) == 45
+
+
+def test_write_parquet_streams_pages_into_dataset(tmp_path) -> None:
+    pytest.importorskip("pyarrow")
+    import pandas as pd
+
+    def records():
+        for record in chembl_client.ChemblClient(session=FakeSession(25)).paged(
+            "activities", limit=10
+        ):
+            yield {
+                **record,
+                "value": None if record["id"] < 3 else str(record["id"] / 2),
+                "ligand_efficiency": {"bei": record["id"] * 1.5, "le": None},
+                "tags": ["a", record["id"]],
+            }
+
+    result = chembl_client.write_parquet(
+        records(),
+        tmp_path / "activities",
+        infer_rows=5,
+        batch_rows=4,
+        rows_per_file=10,
+        overrides={"ligand_efficiency.le": "float64"},
+    )
+
+    assert result["rows"] == 25
+    assert len(result["files"]) == 3
+    assert result["schema"].field("value").type == "string"
+    frame = pd.read_parquet(tmp_path / "activities")
+    assert frame["id"].tolist() == list(range(25))
+    assert frame["ligand_efficiency.bei"].iloc[4] == 6.0
+    assert frame["ligand_efficiency.le"].isna().all()
+    assert frame["tags"].iloc[1] == '["a", 1]'
+
+
+class CursorSession(FakeSession):
+    """Serve pages keyed by an opaque cursor instead of offsets."""
+
+    def __init__(self, total: int, *, grow_by: int = 0) -> None:
+        super().__init__(total)
+        self.grow_by = grow_by
+
+    def get(self, url: str, params: dict[str, Any], **kwargs: Any) -> FakeResponse:
+        start = int(str(params.get("after", "0")))
+        limit = int(params["limit"])
+        with self._lock:
+            self.calls.append(start)
+            self.params.append(dict(params))
+            total = self.total
+            self.total += self.grow_by
+        stop = min(start + limit, total)
+        next_link = None
+        if stop < total:
+            next_link = f"/chembl/api/data/activities.json?limit={limit}&after={stop}"
+        return FakeResponse(
+            {
+                "activities": [{"id": index} for index in range(start, stop)],
+                "page_meta": {"total_count": total, "next": next_link},
+            }
+        )
+
+
+def test_paged_follows_next_links() -> None:
+    session = CursorSession(25)
+    client = chembl_client.ChemblClient(session=session)
+
+    records = list(client.paged("activities", {"q": "x"}, limit=10))
+
+    assert [record["id"] for record in records] == list(range(25))
+    # The last page has no next link, so no trailing empty request is sent.
+    assert session.calls == [0, 10, 20]
+    assert session.params[1] == {"limit": "10", "after": "10"}
+    assert client.stats["drift"] == 0
+
+
+def test_paged_detects_total_count_drift() -> None:
+    client = chembl_client.ChemblClient(session=CursorSession(25, grow_by=1))
+    records = list(client.paged("activities", limit=10))
+    assert len(records) >= 25
+    assert client.stats["drift"] >= 1
+
+    strict = chembl_client.ChemblClient(session=CursorSession(25, grow_by=1))
+    with pytest.raises(chembl_client.PaginationDriftError):
+        list(strict.paged("activities", limit=10, on_drift="raise"))
+
+
+def test_checkpoint_resumes_from_next_link(tmp_path) -> None:
+    path = tmp_path / "cursor.checkpoint.json"
+    crawl = chembl_client.ChemblClient(session=CursorSession(25)).paged(
+        "activities", limit=10, checkpoint=path
+    )
+    assert [next(crawl)["id"] for _ in range(12)] == list(range(12))
+    crawl.close()
+    assert json.loads(path.read_text())["next"].endswith("after=10")
+
+    session = CursorSession(25)
+    client = chembl_client.ChemblClient(session=session)
+    rest = list(client.paged("activities", limit=10, checkpoint=path))
+
+    assert [record["id"] for record in rest] == list(range(10, 25))
+    assert session.calls == [10, 20]
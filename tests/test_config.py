@@ -1,12 +1,13 @@
 from __future__ import annotations
 
+import copy
 from pathlib import Path
 from textwrap import dedent
 
 import pytest
 import yaml
 
-from library.config import load_config
+from library.config import compile_config, load_config
 
 
 def test_load_config_handles_windows_paths(tmp_path: Path) -> None:
@@ -50,3 +51,28 @@ def test_load_config_raises_original_error(tmp_path: Path) -> None:
 
     with pytest.raises(yaml.YAMLError):
         load_config(config_file)
+
+
+def test_compile_config_is_cached_and_normalized() -> None:
+    config = load_config(Path("tests/data/test_config.yaml"))
+
+    compiled = compile_config(config)
+
+    assert compile_config(config) is compiled
+    genre_rules = dict(compiled.rules("document"))["OpenAlex.Genre"]
+    assert genre_rules.alias == {"article": None, "0": None}
+    assert genre_rules.drop == {"0", "article"}
+    assert compiled.schema("document").type_map["review"] == "boolean"
+    assert compiled.schema("target").column_order[0] == "target_chembl_id"
+
+
+def test_compile_config_tracks_config_changes() -> None:
+    config = load_config(Path("tests/data/test_config.yaml"))
+    compiled = compile_config(config)
+
+    assert compile_config(copy.deepcopy(config)) is compiled
+
+    config["cleaning"]["sort_pipes"] = False
+
+    assert compile_config(config) is not compiled
+    assert compile_config(config).sort_pipes is False
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+import pandas as pd
+import pytest
+
+from library.chembl_client import ChemblClient
+from library.crawler import INPUT_COLUMNS, crawl_documents, write_crawl
+from library.io import read_csv
+from library.transforms.assay import normalize_assay
+from library.transforms.testitem import normalize_testitem
+
+pytest.importorskip("requests")
+
+ACTIVITIES = [
+    {
+        "activity_id": index,
+        "document_chembl_id": f"DOC{index % 3}",
+        "assay_chembl_id": f"A{index % 4}",
+        "molecule_chembl_id": f"M{index % 5}",
+        "target_chembl_id": f"T{index % 2}",
+        "ligand_efficiency": {"le": index / 10},
+    }
+    for index in range(30)
+]
+
+
+class Response:
+    def __init__(self, payload: dict[str, Any]) -> None:
+        self.payload = payload
+        self.status_code = 200
+        self.headers: dict[str, str] = {}
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def json(self) -> dict[str, Any]:
+        return self.payload
+
+
+class RelatedSession:
+    def __init__(self) -> None:
+        self.requests: list[tuple[str, list[str]]] = []
+        self._lock = threading.Lock()
+
+    def get(self, url: str, params: dict[str, Any], **kwargs: Any) -> Response:
+        endpoint = url.rsplit("/", 1)[-1].removesuffix(".json")
+        field = next(key for key in params if key.endswith("__in"))
+        wanted = str(params[field]).split(",")
+        with self._lock:
+            self.requests.append((endpoint, wanted))
+        if endpoint == "activity":
+            items = [row for row in ACTIVITIES if row["document_chembl_id"] in wanted]
+        elif endpoint == "molecule":
+            items = [
+                {
+                    "molecule_chembl_id": value,
+                    "molecule_structures": {"canonical_smiles": f"C{value}"},
+                }
+                for value in wanted
+            ]
+        elif endpoint == "assay":
+            items = [
+                {"assay_chembl_id": value, "document_chembl_id": "DOC0"}
+                for value in wanted
+            ]
+        else:
+            items = [{field.removesuffix("__in"): value} for value in wanted]
+        offset = int(params.get("offset", 0))
+        limit = int(params["limit"])
+        return Response(
+            {
+                f"{endpoint}s": items[offset : offset + limit],
+                "page_meta": {"total_count": len(items)},
+            }
+        )
+
+
+def test_crawl_documents_fetches_related_layers(tmp_path, test_config) -> None:
+    session = RelatedSession()
+    client = ChemblClient(session=session)
+
+    frames = crawl_documents(["DOC0", "DOC1", "DOC0"], client, batch_size=2)
+
+    assert frames["document"]["ChEMBL.document_chembl_id"].tolist() == [
+        "DOC0",
+        "DOC1",
+    ]
+    assert len(frames["activity"]) == 20
+    assert "activity_chembl_id" in frames["activity"].columns
+    assert "ligand_efficiency.le" in frames["activity"].columns
+    assert sorted(frames["assay"]["assay_chembl_id"]) == ["A0", "A1", "A2", "A3"]
+    assert sorted(frames["testitem"]["molecule_chembl_id"]) == [
+        f"M{index}" for index in range(5)
+    ]
+    assert frames["testitem"]["molecule_structures.canonical_smiles"].notna().all()
+    assert sorted(frames["target"]["target_chembl_id"]) == ["T0", "T1"]
+
+    lookups = [ids for endpoint, ids in session.requests if endpoint == "molecule"]
+    assert sorted(value for ids in lookups for value in ids) == [
+        f"M{index}" for index in range(5)
+    ]
+    assert max(len(ids) for ids in lookups) <= 2
+
+    files = write_crawl(frames, tmp_path, test_config)
+    assert set(files) == {
+        "document_csv",
+        "activity_csv",
+        "assay_csv",
+        "testitem_csv",
+        "target_csv",
+    }
+    written = pd.read_csv(files["activity_csv"])
+    assert len(written) == 20
+
+
+def test_crawl_output_feeds_assay_and_testitem_pipelines(tmp_path, test_config) -> None:
+    frames = crawl_documents(["DOC0", "DOC1"], ChemblClient(session=RelatedSession()))
+    files = write_crawl(frames, tmp_path, test_config)
+    config = {
+        **test_config,
+        "source": {**test_config["source"], "base_path": str(tmp_path)},
+        "files": {key: path.name for key, path in files.items()},
+    }
+
+    activity = read_csv("activity_csv", config)
+    for name in ("activity", "assay", "testitem"):
+        written = read_csv(f"{name}_csv", config)
+        assert tuple(written.columns[: len(INPUT_COLUMNS[name])]) == INPUT_COLUMNS[name]
+
+    assay = normalize_assay(
+        {"assay": read_csv("assay_csv", config), "activity": activity}, config
+    )
+    testitem = normalize_testitem(
+        {"testitem": read_csv("testitem_csv", config)}, config
+    )
+
+    assert sorted(assay["assay_chembl_id"]) == ["A0", "A1", "A2", "A3"]
+    assert assay["document_assay_total"].tolist() == [4, 4, 4, 4]
+    assert sorted(testitem["canonical_smiles"]) == [f"CM{index}" for index in range(5)]
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import copy
+import os
+import shutil
+from pathlib import Path
+
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from library import curation
+from library.config import load_config
+from library.transforms.common import is_prepared
+from library.transforms.testitem import _prepare_reference
+
+pytest.importorskip("pyarrow")
+
+
+@pytest.fixture()
+def bundle_config(tmp_path: Path) -> dict:
+    config = copy.deepcopy(load_config(Path("tests/data/test_config.yaml")))
+    for name in ("testitem_reference.csv", "document_reference.csv"):
+        shutil.copy(Path("tests/data") / name, tmp_path / name)
+    shutil.copy(
+        Path("tests/data/citation_fraction.csv"), tmp_path / "citation_fraction.csv"
+    )
+    config["source"]["base_path"] = str(tmp_path)
+    config["curation"] = {"bundle_path": str(tmp_path / "curation.bundle")}
+    return config
+
+
+def test_load_curation_builds_and_maps_bundle(bundle_config: dict) -> None:
+    frame = curation.load_curation("testitem", bundle_config)
+
+    assert curation.bundle_path(bundle_config).exists()
+    assert is_prepared(frame)
+    expected = _prepare_reference(pd.read_csv("tests/data/testitem_reference.csv"))
+    pdt.assert_frame_equal(frame, expected)
+
+    document = curation.load_curation("document", bundle_config)
+    assert document["pubmed_id"].tolist() == ["1001", "1002"]
+    thresholds = curation.load_curation("citation_fraction", bundle_config)
+    assert str(thresholds["N"].dtype) == "Int64"
+
+
+def test_bundle_rebuilds_when_source_changes(bundle_config: dict) -> None:
+    curation.build_bundle(bundle_config)
+    assert not curation.is_stale(bundle_config)
+
+    source = Path(bundle_config["source"]["base_path"]) / "testitem_reference.csv"
+    source.write_text("molecule_chembl_id,all_names,nstereo\nM9,Z,1\n", "utf-8")
+    stat = source.stat()
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert curation.is_stale(bundle_config)
+    frame = curation.load_curation("testitem", bundle_config)
+    assert frame["molecule_chembl_id"].tolist() == ["M9"]
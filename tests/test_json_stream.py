@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from library.json_stream import iter_json_items
+
+PAYLOAD = {
+    "activities": [
+        {"id": 1, "value": 12345.5, "name": "β-lactam", "tags": ["a", "b"]},
+        {"id": 2, "value": None, "name": "plain", "nested": {"x": [1, 2, {}]}},
+        {"id": 3, "value": 7, "name": 'quote " and \\ escape'},
+    ],
+    "page_meta": {"limit": 3, "offset": 0, "total_count": 3, "next": None},
+}
+
+
+def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 100000])
+def test_iter_json_items_across_chunk_sizes(size: int) -> None:
+    data = json.dumps(PAYLOAD, ensure_ascii=False, indent=1).encode("utf-8")
+    meta: dict = {}
+
+    items = list(iter_json_items(_chunks(data, size), "activities", meta))
+
+    assert items == PAYLOAD["activities"]
+    assert meta == {"page_meta": PAYLOAD["page_meta"]}
+
+
+def test_iter_json_items_streams_before_end() -> None:
+    data = json.dumps(PAYLOAD).encode("utf-8")
+    consumed: list[int] = []
+
+    def source():
+        for chunk in _chunks(data, 16):
+            consumed.append(len(chunk))
+            yield chunk
+
+    first = next(iter_json_items(source()))
+
+    assert first == PAYLOAD["activities"][0]
+    assert sum(consumed) < len(data)
+
+
+def test_iter_json_items_empty_and_leading_meta() -> None:
+    data = b'{"page_meta": {"total_count": 0}, "molecules": []}'
+    meta: dict = {}
+
+    assert list(iter_json_items([data], meta=meta)) == []
+    assert meta == {"page_meta": {"total_count": 0}}
+
+
+def test_iter_json_items_rejects_truncated_stream() -> None:
+    with pytest.raises(ValueError):
+        list(iter_json_items([b'{"activities": [{"id": 1}, {"id"']))
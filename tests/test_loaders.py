@@ -5,6 +5,7 @@ from pathlib import Path
 from typing import Any
 
 import pandas as pd
+import pytest
 
 from library import io as library_io
 
@@ -132,3 +133,15 @@ def test_write_csv(tmp_path: Path) -> None:
         reader = csv.reader(handle)
         header = next(reader)
         assert header == ["a", "b"]
+
+
+def test_read_csv_accepts_parquet_dataset(tmp_path: Path) -> None:
+    pytest.importorskip("pyarrow")
+    dataset = tmp_path / "activities"
+    dataset.mkdir()
+    expected = pd.DataFrame({"activity_chembl_id": ["1", "2"], "value": [1.5, None]})
+    expected.to_parquet(dataset / "part-00000.parquet", index=False)
+
+    loaded = library_io.read_csv("sample", _build_config(tmp_path, "activities"))
+
+    pd.testing.assert_frame_equal(loaded, expected)
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+import pytest
+
+from library.chembl_client import ChemblClient
+from library.mock_chembl import MockChemblServer, MockSettings
+from library.throttling import RetryPolicy
+
+pytest.importorskip("requests")
+
+
+def test_client_pages_through_mock_server() -> None:
+    with MockChemblServer(MockSettings(total=130)) as server:
+        with ChemblClient(server.base_url) as client:
+            records = list(client.paged("activity", limit=50, only=["id"]))
+            streamed = list(client.paged("activity", limit=50, stream=True))
+
+    assert records == [{"id": index} for index in range(130)]
+    assert [record["id"] for record in streamed] == list(range(130))
+
+
+def test_client_retries_mock_failures() -> None:
+    settings = MockSettings(total=200, error_rate=0.2, throttle_rate=0.2, seed=7)
+    policy = RetryPolicy(retries=10, backoff=0.0, jitter=0.0)
+    with MockChemblServer(settings) as server:
+        with ChemblClient(server.base_url, retry_policy=policy) as client:
+            records = list(client.paged("activity", limit=20, concurrency=3))
+        failures = server.stats["errors"] + server.stats["throttled"]
+
+    assert [record["id"] for record in records] == list(range(200))
+    assert failures > 0
+    assert client.stats["retries"] == failures
+
+
+def test_streamed_retries_release_pooled_connection() -> None:
+    settings = MockSettings(total=60, throttle_rate=0.5, seed=3)
+    policy = RetryPolicy(retries=20, backoff=0.0, jitter=0.0)
+    with MockChemblServer(settings) as server:
+        with ChemblClient(server.base_url, pool_size=1, retry_policy=policy) as client:
+            records = list(client.paged("activity", limit=10, stream=True))
+
+    assert [record["id"] for record in records] == list(range(60))
+    assert client.stats["retries"] == server.stats["throttled"] > 0
+
+
+def test_mock_server_filters_ids() -> None:
+    with MockChemblServer(MockSettings(total=100)) as server:
+        with ChemblClient(server.base_url) as client:
+            records = list(
+                client.fetch_by_ids(
+                    "molecule", "molecule_chembl_id", ["CHEMBL5", "CHEMBL2", "X"]
+                )
+            )
+
+    assert [record["molecule_chembl_id"] for record in records] == [
+        "CHEMBL5",
+        "CHEMBL2",
+    ]
@@ -3,7 +3,14 @@ from __future__ import annotations
 import pandas as pd
 import pandas.testing as pdt
 
-from library.transforms.document import normalize_document
+from library.config import compile_config
+from library.transforms.document import (
+    _apply_classification_rules,
+    _compute_review,
+    _merge_sources,
+    _validate_rows,
+    normalize_document,
+)
 from library.validators import coerce_types
 
 
@@ -73,3 +80,100 @@ def test_document_postprocess_backfills_missing_columns(
     type_map = test_config["pipeline"]["document"]["type_map"]
     expected = coerce_types(result, type_map)
     pdt.assert_frame_equal(result, expected)
+
+
+def test_merge_sources_joins_pages_and_coalesces_pmid() -> None:
+    document_out = pd.DataFrame(
+        {
+            "PMID": [None, "", "PMID: 12", None],
+            "PubMed.PMID": ["9", "x١٢", "7", None],
+            "PubMed.StartPage": ["10", None, "", "5"],
+            "PubMed.EndPage": ["12", "3", None, None],
+            "PubMed.ArticleTitle": [" Title\x00A ", "B", None, "c"],
+        }
+    )
+
+    result = _merge_sources(document_out)
+
+    assert result["page"].tolist() == ["10-12", "3", "", "5"]
+    assert result["PMID"].tolist()[:3] == ["9", "١٢", "12"]
+    assert pd.isna(result.loc[3, "PMID"])
+    assert result["PMID"].dtype == object
+    assert result["title"].tolist() == ["titlea", "b", "", "c"]
+
+
+def test_validate_rows_votes_on_doi_consensus() -> None:
+    document = pd.DataFrame(
+        {
+            "PubMed.doi": ["doi:10.1/a", None, "10.1/a", "bad", None],
+            "crossref.doi": ["10.1/A", "10.1/b", "10.1/c", None, None],
+            "OpenAlex.doi": [None, "10.1/c", "10.1/c", None, None],
+            "ChEMBL.doi": ["10.1%2Fa", "10.1/c", None, None, None],
+            "scholar.doi": [None, "10.1/b", None, None, None],
+            "volume": ["12", "x", None, "3", None],
+            "ChEMBL.volume": [None, "4", "y", None, None],
+            "PMID": ["1", "2", "3", "4", "5"],
+        },
+        index=[10, 11, 12, 13, 14],
+    )
+
+    result = _validate_rows(document)
+
+    assert result.index.tolist() == [0, 1, 2, 3, 4]
+    selected = result[["selected_doi", "selected_source"]].head(3)
+    assert selected.values.tolist() == [
+        ["10.1/a", "PubMed"],
+        ["10.1/b", "crossref"],
+        ["10.1/a", "PubMed"],
+    ]
+    assert result[["selected_doi", "selected_source"]].tail(2).isna().all().all()
+    assert result["consensus_support"].tolist() == [3, 2, 2, 0, 0]
+    assert result["doi_same_count"].tolist() == [2, 0, 0, 0, 0]
+    assert result["peers_valid_distinct"].tolist() == [1, 2, 2, 0, 0]
+    assert result["reason"].tolist() == [
+        "pubmed_doi_confirmed",
+        "pubmed_doi_missing_or_malformed",
+        "pubmed_doi_mismatch_with_sources",
+        "insufficient_data",
+        "insufficient_data",
+    ]
+    assert result["invalid_doi"].tolist() == [False, True, True, False, False]
+    assert result["new_volume"].fillna(0).tolist() == [12, 4, 0, 3, 0]
+    assert result["invalid_volume"].tolist() == [False, False, True, False, False]
+    assert result["PMID_for_validation"].tolist() == ["1", "2", "3", "4", "5"]
+
+
+def test_classification_rules_for_one_column_apply_in_order() -> None:
+    config = {
+        "pipeline": {
+            "document": {
+                "classification_rules": [
+                    {"column": "kind", "alias": {"letter": "review"}},
+                    {"column": "kind", "drop": ["review"]},
+                ]
+            }
+        }
+    }
+    document = pd.DataFrame({"kind": ["Letter|Journal Article", "review"]})
+
+    result = _apply_classification_rules(
+        document, compile_config(config).rules("document")
+    )
+
+    assert result["kind"].tolist() == ["journal article", ""]
+
+
+def test_compute_review_votes_per_response() -> None:
+    frame = pd.DataFrame(
+        {
+            "PubMed.publication_type": ["journal article|review", None, "", ""],
+            "scholar.PublicationTypes": ["review", "Review", None, ""],
+            "review": pd.array([False, False, True, False], dtype="boolean"),
+            "n_responces": pd.array([6, 2, 2, 0], dtype="Int64"),
+        }
+    )
+
+    result = _compute_review(frame, base_weight=2, threshold=0.335)
+
+    # 2/6 votes stay under the threshold; to_text keeps "Review" capitalized.
+    assert result.tolist() == [False, False, True, False]
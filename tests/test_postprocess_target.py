@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import copy
+
 import pandas as pd
 import pandas.testing as pdt
 
@@ -164,3 +166,30 @@ def test_target_protein_classification_fallback(test_config) -> None:
     expected = coerce_types(expected, type_map)
 
     pdt.assert_frame_equal(result, expected)
+
+
+def test_target_cellularity_uses_taxonomy_lookup(test_config, tmp_path) -> None:
+    alias_path = tmp_path / "alias_taxonomy.csv"
+    alias_path.write_text("alias,canonical\nMetazoa Group,chordata\n", "utf-8")
+    drop_path = tmp_path / "drop_taxonomy.csv"
+    drop_path.write_text("value\nunclassified eukaryota\n", "utf-8")
+    config = copy.deepcopy(test_config)
+    config["cleaning"]["alias_maps"] = {"taxonomy": str(alias_path)}
+    config["cleaning"]["drop_lists"] = {"taxonomy": str(drop_path)}
+
+    minimal = pd.DataFrame(
+        {
+            "target_chembl_id": ["T1", "T2"],
+            "lineage_superkingdom": ["Eukaryota", "Eukaryota"],
+            "lineage_phylum": ["Metazoa  Group", "Unclassified Eukaryota"],
+            "lineage_class": [pd.NA, "Chordata"],
+        }
+    )
+
+    result = normalize_target({"target": minimal}, config)
+
+    assert result["cellularity"].tolist() == ["multicellular", "multicellular"]
+    assert result["lineage_phylum"].tolist() == [
+        "Metazoa  Group",
+        "Unclassified Eukaryota",
+    ]
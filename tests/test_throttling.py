@@ -0,0 +1,95 @@
+import multiprocessing
+import threading
+import time
+
+import pytest
+
+from library.throttling import HedgePolicy, TokenBucket
+
+
+def test_token_bucket_spaces_requests_after_burst():
+    bucket = TokenBucket(rate=50.0, capacity=2)
+    waits = [bucket.acquire() for _ in range(6)]
+
+    assert waits[:2] == [0.0, 0.0]
+    assert sum(waits) == pytest.approx(4 / 50.0, abs=0.02)
+    metrics = bucket.metrics()
+    assert metrics["acquired"] == 6
+    assert metrics["max_wait"] > 0
+
+
+def test_token_bucket_aimd_feedback():
+    bucket = TokenBucket(rate=10.0, min_rate=1.0, max_rate=12.0, cooldown=60.0)
+
+    bucket.feedback(429)
+    assert bucket.rate == pytest.approx(5.0)
+    bucket.feedback(429)  # same burst, inside the cooldown window
+    assert bucket.rate == pytest.approx(5.0)
+
+    for _ in range(5):
+        bucket.feedback(200)
+    assert bucket.rate == pytest.approx(6.0, abs=0.1)
+    assert bucket.metrics()["throttled"] == 2
+
+
+def _drain(path, count, out):
+    bucket = TokenBucket(rate=20.0, capacity=1, state_path=path)
+    for _ in range(count):
+        bucket.acquire()
+    out.put(time.time())
+
+
+def test_token_bucket_shares_state_between_processes(tmp_path):
+    path = tmp_path / "bucket.json"
+    context = multiprocessing.get_context("fork")
+    out = context.Queue()
+    started = time.time()
+    workers = [context.Process(target=_drain, args=(path, 5, out)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(10)
+    finished = max(out.get(timeout=1) for _ in workers)
+
+    # Ten tokens at 20/s from a one-token bucket take roughly 0.45 s in total;
+    # independent buckets would each finish in about half that.
+    assert finished - started >= 0.4
+    assert path.exists()
+
+
+def test_hedge_policy_takes_first_response():
+    policy = HedgePolicy(initial_delay=0.02, min_samples=100, max_fraction=1.0)
+    calls = []
+    lock = threading.Lock()
+
+    def request():
+        with lock:
+            calls.append(len(calls))
+            attempt = calls[-1]
+        time.sleep(0.5 if attempt == 0 else 0.01)
+        return attempt
+
+    started = time.monotonic()
+    assert policy.run(request) == 1
+    assert time.monotonic() - started < 0.4
+    assert policy.stats == {"requests": 1, "hedged": 1, "hedge_wins": 1}
+    policy.close()
+
+
+def test_hedge_policy_caps_extra_load():
+    policy = HedgePolicy(initial_delay=0.0, min_delay=0.0, max_fraction=0.25)
+
+    for _ in range(8):
+        policy.run(lambda: time.sleep(0.01))
+
+    assert policy.stats["requests"] == 8
+    assert policy.stats["hedged"] == 2
+    policy.close()
+
+
+def test_hedge_policy_waits_for_percentile_samples():
+    policy = HedgePolicy(percentile=50, min_samples=4, min_delay=0.0)
+    assert policy.delay() is None
+    for latency in (0.1, 0.2, 0.3, 0.4):
+        policy.record(latency)
+    assert policy.delay() == 0.3
@@ -1,8 +1,20 @@
 from __future__ import annotations
 
 import pandas as pd
+import pytest
 
-from library.transforms import clean_pipe, to_text
+from library.transforms import (
+    UniqueValueCache,
+    clean_pipe,
+    map_unique,
+    normalize_doi,
+    normalize_doi_series,
+    normalize_pipe,
+    normalize_pipe_series,
+    to_text,
+    to_text_series,
+)
+from library.transforms.common import compile_pipe_rules
 
 
 def test_to_text_normalization() -> None:
@@ -10,6 +22,99 @@ def test_to_text_normalization() -> None:
     assert to_text("  Value  ") == "Value"
 
 
+def test_to_text_series_matches_scalar() -> None:
+    values = [
+        None,
+        float("nan"),
+        pd.NA,
+        "  Value  ",
+        "a\x00b\u200b",
+        "Ünïcode ",
+        1,
+        1.0,
+        True,
+    ]
+    series = pd.Series(values, dtype=object, index=list("abcdefghi"), name="col")
+
+    result = to_text_series(series)
+
+    assert result.tolist() == [to_text(value) for value in values]
+    assert result.index.equals(series.index)
+    assert result.name == "col"
+    lowered = to_text_series(series, lower=True)
+    assert lowered.tolist() == [to_text(value).lower() for value in values]
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("https://doi.org/10.1000/ABC.", "10.1000/abc"),
+        ("doi: 10.1000%2Fxyz ", "10.1000/xyz"),
+        ("DX.DOI.ORG/10.5/q)", "10.5/q"),
+        ("10.1000", None),
+        ("11.1/abc", None),
+        ("10.1/" + "a" * 296, None),
+        (None, None),
+    ],
+)
+def test_normalize_doi(value: object, expected: object) -> None:
+    assert normalize_doi(value) == expected
+
+
+def test_normalize_doi_series_matches_scalar() -> None:
+    values = [
+        "https://doi.org/10.1000/ABC.",
+        "doi:10.1000/abc",
+        "10.1000/İx",
+        "\x0010.2/b;",
+        "junk",
+        "",
+        None,
+        float("nan"),
+        10.5,
+    ]
+    series = pd.Series(values, dtype=object, index=range(10, 19), name="doi")
+
+    result = normalize_doi_series(series)
+
+    assert result.tolist() == [normalize_doi(value) for value in values]
+    assert result.index.equals(series.index)
+    assert result.name == "doi"
+    assert result.dtype == object
+
+
+def test_map_unique_calls_func_once_per_distinct_value() -> None:
+    calls: list[object] = []
+
+    def record(value: object) -> str:
+        calls.append(value)
+        return repr(value)
+
+    series = pd.Series(
+        ["b", "a", "b", None, 1, 1.0, True, None, float("nan")], dtype=object
+    )
+
+    result = map_unique(series, record)
+
+    assert result.tolist() == series.map(repr).tolist()
+    assert len(calls) == 7
+    ignored = map_unique(series, record, na_action="ignore")
+    assert ignored.isna().tolist() == series.isna().tolist()
+
+
+def test_map_unique_shares_cache_across_columns() -> None:
+    cache = UniqueValueCache(maxsize=2)
+    frame = pd.DataFrame({"a": ["x", "y", "x"], "b": ["y", "x", "z"]})
+
+    upper_a = map_unique(frame["a"], str.upper, cache=cache)
+    upper_b = map_unique(frame["b"], str.upper, cache=cache)
+
+    assert upper_a.tolist() == ["X", "Y", "X"]
+    assert upper_b.tolist() == ["Y", "X", "Z"]
+    assert cache.stats == {"hits": 2, "misses": 3, "evictions": 1}
+    assert len(cache) == 2
+
+
 def test_clean_pipe_applies_alias_and_drop() -> None:
     series = pd.Series(["Review | Journal", "Study|Article", None])
     alias = {"review": "review", "study": "analysis"}
@@ -18,3 +123,39 @@ def test_clean_pipe_applies_alias_and_drop() -> None:
     cleaned = clean_pipe(series, alias_map=alias, drop_list=drop, sort=True)
 
     assert cleaned.tolist() == ["review", "analysis", ""]
+
+
+def test_clean_pipe_accepts_compiled_rules() -> None:
+    series = pd.Series(["Review | Journal", "Study|Article", None])
+    rules = compile_pipe_rules({"Study": "Analysis"}, ["JOURNAL", "article"])
+
+    cleaned = clean_pipe(series, sort=True, rules=rules)
+
+    assert cleaned.tolist() == ["review", "analysis", ""]
+    assert normalize_pipe("Journal|Study", rules=rules) == "analysis"
+
+
+@pytest.mark.parametrize("sort", [True, False])
+def test_normalize_pipe_series_matches_scalar(sort: bool) -> None:
+    rules = compile_pipe_rules({"Study": "Analysis", "drop me": None}, ["journal"])
+    values = [
+        "Study | Journal | review|study",
+        "B|a||A | b\x00",
+        "drop me|JOURNAL",
+        "  ",
+        None,
+        float("nan"),
+        pd.NA,
+        "Zeta  Alpha|zeta alpha|Beta",
+    ]
+    series = pd.Series(values, dtype=object)
+
+    vectorized = normalize_pipe_series(series, sort=sort, rules=rules).tolist()
+    cleaned = clean_pipe(series, sort=sort, rules=rules).tolist()
+
+    for value, result, clean in zip(values, vectorized, cleaned, strict=True):
+        expected = normalize_pipe(value, sort=sort, rules=rules)
+        if expected is pd.NA:
+            assert result is pd.NA
+        else:
+            assert result == expected == clean
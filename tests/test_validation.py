@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import io
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from library.validation import (
+    BloomFilter,
+    NotNull,
+    References,
+    Sorted,
+    Unique,
+    ValidationRunner,
+    ensure_no_duplicates,
+    ensure_not_null,
+    ensure_sorted,
+)
+
+
+def _chunks(frame: pd.DataFrame, size: int) -> list[pd.DataFrame]:
+    return [frame.iloc[start : start + size] for start in range(0, len(frame), size)]
+
+
+def test_runner_matches_whole_frame_checks_across_chunks() -> None:
+    random = np.random.default_rng(1)
+    frame = pd.DataFrame(
+        {
+            "key": random.integers(0, 200, 1000),
+            "part": random.integers(0, 3, 1000),
+            "value": np.where(random.random(1000) < 0.1, np.nan, 1.0),
+        }
+    )
+    checks = [Unique(("key", "part")), NotNull("value"), Sorted(("key", "part"))]
+
+    whole = ValidationRunner(checks).run(frame)
+    streamed = ValidationRunner(checks).run(_chunks(frame, 73))
+
+    expected = [
+        int(frame.duplicated(["key", "part"]).sum()),
+        int(frame["value"].isna().sum()),
+    ]
+    assert [result.failures for result in whole.results[:2]] == expected
+    assert [result.failures for result in streamed.results] == [
+        result.failures for result in whole.results
+    ]
+    assert streamed.rows == 1000
+    assert streamed.chunks == 14
+
+
+def test_unique_matches_keys_across_widened_chunk_dtypes() -> None:
+    # The blank turns the second chunk's integer keys into float64.
+    chunks = pd.read_csv(io.StringIO("k,v\n1,a\n2,b\n1,c\n,d\n"), chunksize=2)
+
+    report = ValidationRunner([Unique(("k",))]).run(chunks)
+
+    (result,) = report.results
+    assert result.failures == 1
+    assert result.samples == [{"k": 1.0, "row": 2}]
+
+
+def test_sorted_check_carries_last_row_between_chunks() -> None:
+    frame = pd.DataFrame({"a": [1, 2, 2, 1, 3, None, None]})
+
+    report = ValidationRunner([Sorted(("a",))]).run(_chunks(frame, 3))
+
+    (result,) = report.results
+    assert result.failures == 1
+    assert result.samples == [{"a": 1.0, "row": 3}]
+    assert ValidationRunner([Sorted(("a",))]).run(frame.iloc[:3]).ok
+
+
+def test_samples_are_bounded_and_ordered() -> None:
+    frame = pd.DataFrame({"key": [7] * 500})
+
+    report = ValidationRunner([Unique(("key",))], sample_size=4).run(_chunks(frame, 50))
+
+    (result,) = report.results
+    assert result.failures == 499
+    assert len(result.samples) == 4
+    rows = [sample["row"] for sample in result.samples]
+    assert rows == sorted(rows)
+    assert all(1 <= row < 500 for row in rows)
+
+
+def test_references_with_index_and_bloom_filter() -> None:
+    frame = pd.DataFrame({"ref": ["a", "b", None, "zz"]})
+    bloom = BloomFilter(capacity=100)
+    bloom.add(["a", "b", "c"])
+
+    for reference in (["a", "b", "c"], bloom):
+        report = ValidationRunner([References("ref", reference)]).run(frame)
+        (result,) = report.results
+        assert result.failures == 1
+        assert result.samples == [{"ref": "zz", "row": 3}]
+
+
+def test_bloom_filter_has_no_false_negatives() -> None:
+    values = [f"CHEMBL{number}" for number in range(5000)]
+    bloom = BloomFilter(capacity=len(values), error_rate=0.01)
+    bloom.add(values)
+
+    assert bloom.contains(values).all()
+    outsiders = bloom.contains([f"OTHER{number}" for number in range(5000)])
+    assert outsiders.mean() < 0.05
+
+
+def test_report_summary_and_raise() -> None:
+    frame = pd.DataFrame({"id": [1, None]})
+    report = ValidationRunner([NotNull("id")]).run(frame)
+
+    assert report.failed[0].name == "not_null(id)"
+    with pytest.raises(ValueError, match="Validation failed for frame: not_null"):
+        report.raise_for_failures("frame")
+
+
+def test_ensure_helpers_report_bounded_messages(caplog) -> None:
+    frame = pd.DataFrame({"id": [1, 1, 1, 2], "name": ["a", None, "b", "c"]})
+
+    with pytest.raises(ValueError, match=r"in docs: 2 rows, e\.g\. \[\{'id': 1"):
+        ensure_no_duplicates(frame, ["id"], "docs", sample_size=1)
+    with pytest.raises(ValueError, match="Null values found in column 'name'"):
+        ensure_not_null(frame, ["missing", "name"], "docs")
+
+    with caplog.at_level(logging.WARNING, logger="library.validation"):
+        ensure_sorted(frame, ["name"], "docs")
+    assert caplog.records[-1].unsorted_rows == 1
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from library.validators import (
+    MergeReport,
+    SchemaPlan,
+    coerce_types,
+    ensure_columns,
+    safe_merge,
+)
+
+
+def test_schema_plan_adds_converts_and_orders_columns() -> None:
+    frame = pd.DataFrame(
+        {
+            "flag": ["true", "False", None],
+            "count": ["1", "x", "3"],
+            "name": pd.Series(["a", None, "c"], dtype="string"),
+        }
+    )
+    plan = SchemaPlan.compile(
+        {"flag": "bool", "count": "int", "name": "text", "extra": "Int64"},
+        ["name", "extra"],
+        order=["extra", "name", "flag", "count"],
+    )
+
+    result = plan.apply(frame, select=True)
+
+    assert list(result.columns) == ["extra", "name", "flag", "count"]
+    assert result["flag"].tolist() == [True, False, pd.NA]
+    assert result["count"].tolist() == [1, pd.NA, 3]
+    assert str(result["extra"].dtype) == "Int64"
+    assert result["extra"].isna().all()
+    pd.testing.assert_series_equal(result["name"], frame["name"])
+
+
+def test_schema_plan_reports_missing_selected_columns() -> None:
+    plan = SchemaPlan.compile({"a": "string"}, order=["a", "b"])
+
+    with pytest.raises(ValueError, match="Missing columns"):
+        plan.apply(pd.DataFrame({"a": ["x"]}), add_missing=False, select=True)
+
+
+def test_coerce_and_ensure_return_new_frames() -> None:
+    frame = pd.DataFrame({"value": ["1", "2"]})
+    frame.attrs["prepared_reference"] = True
+
+    coerced = coerce_types(frame, {"value": "Int64", "absent": "string"})
+    completed = ensure_columns(frame, ["value", "other"], {"other": "boolean"})
+    coerced.loc[0, "value"] = 5
+
+    assert frame["value"].tolist() == ["1", "2"]
+    assert list(coerced.columns) == ["value"]
+    assert coerced.attrs == {"prepared_reference": True}
+    assert list(completed.columns) == ["value", "other"]
+    assert str(completed["other"].dtype) == "boolean"
+
+
+def test_safe_merge_aligns_key_dtypes_and_reports_matches() -> None:
+    left = pd.DataFrame({"pmid": pd.array([1, 2, None], dtype="Int64"), "x": [1, 2, 3]})
+    right = pd.DataFrame({"pmid": ["1", "3"], "label": ["a", "c"]})
+    reports: list[MergeReport] = []
+
+    merged = safe_merge(left, right, on="pmid", reports=reports)
+
+    assert merged.loc[0, "label"] == "a"
+    assert merged["label"].isna().tolist() == [False, True, True]
+    (report,) = reports
+    assert report.strategy == "lookup"
+    assert report.matched_rows == 1
+    assert report.match_rate == pytest.approx(1 / 3)
+
+
+def test_safe_merge_widens_keys_when_right_has_nulls() -> None:
+    left = pd.DataFrame({"k": [1, 2, 3]})
+    right = pd.DataFrame(
+        {"k": pd.Series(["1", "3", None], dtype=object), "v": [10, 30, 99]}
+    )
+    reports: list[MergeReport] = []
+
+    merged = safe_merge(left, right, on="k", reports=reports)
+
+    assert str(merged["k"].dtype) == "Int64"
+    assert merged["k"].tolist() == [1, 2, 3]
+    assert merged["v"].tolist()[::2] == [10, 30]
+    assert pd.isna(merged.loc[1, "v"])
+    (report,) = reports
+    assert report.matched_rows == 2
+
+
+@pytest.mark.parametrize("factorize", [False, True])
+def test_safe_merge_matches_pandas_merge(factorize: bool) -> None:
+    left = pd.DataFrame(
+        {"key": pd.Series(["a", "b", "a", None], dtype="string"), "value": [1, 2, 3, 4]}
+    )
+    right = pd.DataFrame(
+        {"key": pd.Series(["a", "a", "c"], dtype=object), "value": [10, 11, 12]}
+    )
+
+    merged = safe_merge(left, right, on="key", suffixes=("", "_r"), factorize=factorize)
+    expected = left.merge(
+        right.astype({"key": "string"}), on="key", how="left", suffixes=("", "_r")
+    )
+
+    pd.testing.assert_frame_equal(merged, expected)